@@ -5,6 +5,12 @@ from matplotlib import pyplot as plt
 import re
 import numpy as np
 
+from vidur.metrics.metrics_table import read_metrics_table
+
+# the csv, parquet or arrow request metrics are read with only these columns
+REQUEST_METRICS_COLUMNS = [ 'request_e2e_time', 'prefill_e2e_time', 'request_inter_arrival_delay',
+                            'request_num_prefill_tokens', 'request_num_decode_tokens' ]
+
 
 def get_all_data_frames_vidur( path: str, names: list[ str ] ) -> dict[
     str, tuple[ list[ float ], list[ pd.DataFrame ] ] ]:
@@ -21,7 +27,8 @@ def get_all_data_frames_vidur( path: str, names: list[ str ] ) -> dict[
                 qps = float( match.group( 1 ) )
                 if qps >= 12.0:
                     continue
-                df = pd.read_csv( f"{path}/{subdir}/{dirs_in_subdir[ 0 ]}/request_metrics.csv" )
+                df = read_metrics_table( f"{path}/{subdir}/{dirs_in_subdir[ 0 ]}", "request_metrics",
+                                         columns = REQUEST_METRICS_COLUMNS )
                 df[ 'decode_e2e_time' ] = df[ 'request_e2e_time' ] - df[ 'prefill_e2e_time' ]
                 df[ 'arrival_time' ] = df[ 'request_inter_arrival_delay' ].cumsum( )
                 q = round( qps, 1 )
@@ -0,0 +1,107 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from itertools import product
+from typing import List
+
+REPLICA_SCHEDULERS = ["vllm", "sarathi", "orca", "lightllm", "faster_transformer"]
+GLOBAL_SCHEDULERS = ["lor", "llq", "round_robin", "random"]
+NUM_REPLICAS = [1, 8, 64, 512]
+TRACE_FILES = [
+    "data/processed_traces/splitwise_conv.csv",
+    "data/processed_traces/splitwise_code.csv",
+    "data/processed_traces/arxiv_summarization_stats_llama2_tokenizer_filtered_v2.csv",
+]
+
+
+@dataclass
+class BenchmarkCase:
+    replica_scheduler: str
+    global_scheduler: str
+    num_replicas: int
+    trace_file: str
+    requests_per_replica: int
+    qps_per_replica: float
+    max_tokens: int
+
+    @property
+    def num_requests(self) -> int:
+        return self.requests_per_replica * self.num_replicas
+
+    @property
+    def trace_name(self) -> str:
+        return os.path.splitext(os.path.basename(self.trace_file))[0]
+
+    def get_key(self) -> str:
+        return (
+            f"{self.replica_scheduler}_{self.global_scheduler}_r{self.num_replicas}"
+            f"_{self.trace_name}_rq{self.num_requests}_qps{self.qps_per_replica}"
+        )
+
+    def get_predictor_cache_key(self) -> str:
+        # the model, device and parallelism come from the extra args and are
+        # shared by all cases, but the predictor of orca covers whole batches
+        # in its max tokens and the block size is set per replica scheduler
+        return self.replica_scheduler
+
+    def get_hash(self) -> str:
+        return hashlib.sha1(self.get_key().encode("utf-8")).hexdigest()[:8]
+
+    def to_dict(self) -> dict:
+        return {
+            "replica_scheduler": self.replica_scheduler,
+            "global_scheduler": self.global_scheduler,
+            "num_replicas": self.num_replicas,
+            "trace": self.trace_name,
+            "num_requests": self.num_requests,
+            "qps": self.qps_per_replica * self.num_replicas,
+        }
+
+    def to_config_dict(self) -> dict:
+        # the load is scaled with the number of replicas so that every cluster
+        # size runs at the same per replica utilization
+        return {
+            "replica_scheduler_config_type": self.replica_scheduler,
+            "global_scheduler_config_type": self.global_scheduler,
+            "cluster_config_num_replicas": self.num_replicas,
+            "request_generator_config_type": "synthetic",
+            "length_generator_config_type": "trace",
+            "interval_generator_config_type": "poisson",
+            "trace_request_length_generator_config_trace_file": self.trace_file,
+            "trace_request_length_generator_config_max_tokens": self.max_tokens,
+            "synthetic_request_generator_config_num_requests": self.num_requests,
+            "poisson_request_interval_generator_config_qps": self.qps_per_replica
+            * self.num_replicas,
+            "no-metrics_config_save_table_to_wandb": None,
+            "no-metrics_config_store_plots": None,
+            "no-metrics_config_enable_chrome_trace": None,
+            "metrics_config_enable_event_profiling": None,
+        }
+
+
+def generate_benchmark_cases(
+    replica_schedulers: List[str],
+    global_schedulers: List[str],
+    num_replicas: List[int],
+    trace_files: List[str],
+    requests_per_replica: int,
+    qps_per_replica: float,
+    max_tokens: int,
+) -> List[BenchmarkCase]:
+    return [
+        BenchmarkCase(
+            replica_scheduler,
+            global_scheduler,
+            replicas,
+            trace_file,
+            requests_per_replica,
+            qps_per_replica,
+            max_tokens,
+        )
+        for replica_scheduler, global_scheduler, replicas, trace_file in product(
+            replica_schedulers,
+            global_schedulers,
+            num_replicas,
+            trace_files,
+        )
+    ]
@@ -0,0 +1,131 @@
+import glob
+import json
+import os
+import platform
+import shlex
+import sys
+import time
+from subprocess import Popen
+from typing import List, Optional
+
+from vidur.benchmarks.benchmark_config import BenchmarkCase
+from vidur.logger import init_logger
+
+logger = init_logger(__name__)
+
+
+class BenchmarkRunner:
+    def __init__(
+        self,
+        output_dir: str,
+        cache_dir: str,
+        extra_args: Optional[str] = None,
+    ):
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self.extra_args = extra_args or ""
+
+    def _generate_run_command(self, case: BenchmarkCase, run_dir: str) -> str:
+        args = []
+        config_dict = {
+            **case.to_config_dict(),
+            "metrics_config_output_dir": run_dir,
+            "metrics_config_cache_dir": self.cache_dir,
+        }
+        for key, value in config_dict.items():
+            if value is not None:
+                args.append(f"--{key} {value}")
+            else:
+                args.append(f"--{key}")
+
+        return f"{sys.executable} -m vidur.main {' '.join(args)} {self.extra_args}"
+
+    def _get_peak_rss_mb(self, max_rss: int) -> float:
+        # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+        if platform.system() == "Darwin":
+            return max_rss / 2**20
+        return max_rss / 2**10
+
+    def _get_events_per_second(self, run_dir: str) -> Optional[float]:
+        # every run writes to a new timestamped directory, the latest one
+        # belongs to the run that just finished
+        profile_files = sorted(glob.glob(f"{run_dir}/*/event_profile.json"))
+        if not profile_files:
+            return None
+
+        with open(profile_files[-1]) as f:
+            return json.load(f)["events_per_second"]
+
+    def run_case(self, case: BenchmarkCase) -> dict:
+        run_dir = f"{self.output_dir}/runs/{case.get_hash()}"
+        os.makedirs(run_dir, exist_ok=True)
+
+        command = self._generate_run_command(case, run_dir)
+
+        with open(f"{run_dir}/output.log", "w") as output_file:
+            output_file.write(f"Running command: {command}\n")
+            output_file.flush()
+
+            start_time = time.perf_counter()
+            p = Popen(shlex.split(command), stdout=output_file, stderr=output_file)
+            # wait4 gives the resource usage of this child alone
+            _, status, rusage = os.wait4(p.pid, 0)
+            wall_time = time.perf_counter() - start_time
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        # keep the Popen object from trying to reap the child again
+        p.returncode = exit_code
+
+        result = {
+            "key": case.get_key(),
+            **case.to_dict(),
+            "exit_code": exit_code,
+            "wall_time": wall_time,
+            "requests_per_second": case.num_requests / wall_time,
+            "peak_rss_mb": self._get_peak_rss_mb(rusage.ru_maxrss),
+            "events_per_second": (
+                self._get_events_per_second(run_dir) if exit_code == 0 else None
+            ),
+        }
+
+        if exit_code != 0:
+            logger.error(
+                f"Benchmark {case.get_key()} failed with exit code {exit_code}, see {run_dir}/output.log"
+            )
+        else:
+            # the event profile is missing when the extra args disable it
+            events_per_second = (
+                f"{result['events_per_second']:.0f}"
+                if result["events_per_second"] is not None
+                else "n/a"
+            )
+            logger.info(
+                f"Benchmark {case.get_key()}: {wall_time:.2f}s,"
+                f" {result['requests_per_second']:.1f} requests/s,"
+                f" {events_per_second} events/s,"
+                f" {result['peak_rss_mb']:.0f} MB peak RSS"
+            )
+
+        return result
+
+    def warmup_cache(self, cases: List[BenchmarkCase]) -> None:
+        # run the smallest case of every predictor cache key once, this keeps
+        # predictor training out of the timed runs
+        warmup_cases = {}
+        for case in sorted(cases, key=lambda case: case.num_requests):
+            warmup_cases.setdefault(case.get_predictor_cache_key(), case)
+
+        for key, case in warmup_cases.items():
+            logger.info(f"Warming up the predictor cache for {key}")
+            result = self.run_case(case)
+            assert result["exit_code"] == 0, f"Predictor cache warmup failed for {key}"
+
+    def run(self, cases: List[BenchmarkCase], num_repeats: int = 1) -> List[dict]:
+        results = []
+        for case in cases:
+            for repeat in range(num_repeats):
+                result = self.run_case(case)
+                result["repeat"] = repeat
+                results.append(result)
+
+        return results
@@ -0,0 +1,62 @@
+import time
+import tracemalloc
+from typing import Callable
+
+from vidur.entities import Batch, BatchStage, Request
+from vidur.events import RequestArrivalEvent
+
+
+def _get_bytes_per_entity(create_fn: Callable[[int], object], num_entities: int):
+    entities = [None] * num_entities
+
+    tracemalloc.start()
+    start_size, _ = tracemalloc.get_traced_memory()
+    for i in range(num_entities):
+        entities[i] = create_fn(i)
+    end_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (end_size - start_size) / num_entities
+
+
+def _get_accesses_per_second(request: Request, num_accesses: int) -> float:
+    # the same getters the metrics store reads for every completed request
+    start_time = time.perf_counter()
+    for _ in range(num_accesses):
+        request.arrived_at
+        request.scheduled_at
+        request.prefill_completed_at
+        request.completed_at
+        request.scheduling_delay
+    elapsed = time.perf_counter() - start_time
+
+    return 5 * num_accesses / elapsed
+
+
+def run_entity_benchmark(
+    num_entities: int = 100000, num_accesses: int = 1000000
+) -> dict:
+    request = Request(0, 512, 128)
+    request.on_batch_schedule(0)
+    request.on_batch_end(0, 512)
+    request.on_batch_end(0, 127)
+    requests = [request]
+    num_tokens = [1]
+    batch = Batch(0, requests, num_tokens)
+
+    return {
+        "request_bytes": _get_bytes_per_entity(
+            lambda i: Request(i, 512, 128), num_entities
+        ),
+        "batch_bytes": _get_bytes_per_entity(
+            lambda i: Batch(0, requests, num_tokens), num_entities
+        ),
+        "batch_stage_bytes": _get_bytes_per_entity(
+            lambda i: BatchStage(batch.id, 0, 0, 0.1, 0.1, requests, num_tokens),
+            num_entities,
+        ),
+        "event_bytes": _get_bytes_per_entity(
+            lambda i: RequestArrivalEvent(i, request), num_entities
+        ),
+        "request_accesses_per_second": _get_accesses_per_second(request, num_accesses),
+    }
@@ -0,0 +1,166 @@
+"""
+Benchmarks the speed of the simulator itself across replica schedulers,
+global schedulers, cluster sizes and traces. Every case runs in its own
+process and reports the simulated requests per wall-second, events per
+wall-second and peak RSS. The memory footprint of the individual entities is
+measured in process. Results are stored as json so that runs of different commits can be
+compared with --baseline-file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+from vidur.benchmarks.benchmark_config import (
+    GLOBAL_SCHEDULERS,
+    NUM_REPLICAS,
+    REPLICA_SCHEDULERS,
+    TRACE_FILES,
+    generate_benchmark_cases,
+)
+from vidur.benchmarks.benchmark_runner import BenchmarkRunner
+from vidur.benchmarks.entity_benchmark import run_entity_benchmark
+from vidur.logger import init_logger
+
+logger = init_logger(__name__)
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output-dir", type=str, default="benchmark_output")
+    parser.add_argument("--cache-dir", type=str, default="./cache")
+    parser.add_argument(
+        "--replica-schedulers", type=str, nargs="+", default=REPLICA_SCHEDULERS
+    )
+    parser.add_argument(
+        "--global-schedulers", type=str, nargs="+", default=GLOBAL_SCHEDULERS
+    )
+    parser.add_argument("--num-replicas", type=int, nargs="+", default=NUM_REPLICAS)
+    parser.add_argument("--trace-files", type=str, nargs="+", default=TRACE_FILES)
+    parser.add_argument("--requests-per-replica", type=int, default=64)
+    parser.add_argument("--qps-per-replica", type=float, default=1.0)
+    parser.add_argument("--max-tokens", type=int, default=4096)
+    parser.add_argument("--num-repeats", type=int, default=1)
+    parser.add_argument(
+        "--extra-args",
+        type=str,
+        default=None,
+        help="Extra arguments passed through to vidur.main",
+    )
+    parser.add_argument(
+        "--baseline-file",
+        type=str,
+        default=None,
+        help="Results file of a previous run to compare against",
+    )
+    parser.add_argument("--skip-cache-warmup", action="store_true")
+
+    return parser.parse_args()
+
+
+def get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(results: List[dict], baseline_results: List[dict]) -> None:
+    def get_best(results: List[dict]) -> dict:
+        best = {}
+        for result in results:
+            if result["exit_code"] != 0:
+                continue
+            key = result["key"]
+            if (
+                key not in best
+                or result["requests_per_second"] > best[key]["requests_per_second"]
+            ):
+                best[key] = result
+        return best
+
+    best = get_best(results)
+    baseline_best = get_best(baseline_results)
+
+    for key, result in best.items():
+        if key not in baseline_best:
+            continue
+
+        baseline_result = baseline_best[key]
+        speedup = result["requests_per_second"] / baseline_result["requests_per_second"]
+        rss_ratio = result["peak_rss_mb"] / baseline_result["peak_rss_mb"]
+        logger.info(f"{key}: speedup {speedup:.2f}x, peak RSS {rss_ratio:.2f}x")
+
+        if result.get("events_per_second") and baseline_result.get("events_per_second"):
+            events_speedup = (
+                result["events_per_second"] / baseline_result["events_per_second"]
+            )
+            logger.info(f"{key}: events/s speedup {events_speedup:.2f}x")
+
+
+def compare_entity_results(entity_results: dict, baseline_entity_results: dict) -> None:
+    for key, value in entity_results.items():
+        if key not in baseline_entity_results:
+            continue
+        logger.info(f"{key}: {value:.1f} vs {baseline_entity_results[key]:.1f}")
+
+
+if __name__ == "__main__":
+    args = get_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    cases = generate_benchmark_cases(
+        args.replica_schedulers,
+        args.global_schedulers,
+        args.num_replicas,
+        args.trace_files,
+        args.requests_per_replica,
+        args.qps_per_replica,
+        args.max_tokens,
+    )
+    logger.info(f"Running {len(cases)} benchmark cases")
+
+    runner = BenchmarkRunner(args.output_dir, args.cache_dir, args.extra_args)
+
+    if not args.skip_cache_warmup:
+        runner.warmup_cache(cases)
+
+    start_time = time.time()
+    results = runner.run(cases, args.num_repeats)
+    end_time = time.time()
+
+    entity_results = run_entity_benchmark()
+    logger.info(f"Entity benchmark: {entity_results}")
+
+    logger.info(f"Benchmarks took time: {end_time - start_time}")
+
+    benchmark_output = {
+        "git_commit": get_git_commit(),
+        "timestamp": start_time,
+        "python_version": sys.version,
+        "platform": platform.platform(),
+        "args": vars(args),
+        "results": results,
+        "entity_results": entity_results,
+    }
+    results_file = f"{args.output_dir}/results.json"
+    with open(results_file, "w") as f:
+        json.dump(benchmark_output, f, indent=4)
+
+    logger.info(f"Results written to {results_file}")
+
+    if args.baseline_file:
+        with open(args.baseline_file) as f:
+            baseline_output = json.load(f)
+        compare_results(results, baseline_output["results"])
+        compare_entity_results(
+            entity_results, baseline_output.get("entity_results", {})
+        )
@@ -0,0 +1,311 @@
+"""
+Measures how the execution time predictors trade accuracy against startup
+cost. The profiling data of every model, device and tensor parallel size is
+split into training and held-out rows. Every predictor is built from an
+empty cache on the training rows, once per kv cache prediction granularity
+and prediction grid step, and the mean absolute percentage error (MAPE) of
+every operator is measured on the held-out rows, for attention through the
+prediction tables as in the simulation. The training time, grid prediction
+time, prediction table and cache size, and the time to load the predictor
+again from the warm cache are reported along with it. All the cases go to a
+single csv file so that they can be tracked across releases.
+"""
+
+import argparse
+import os
+import shutil
+import time
+from itertools import product
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from vidur.benchmarks.main import get_git_commit
+from vidur.config import (
+    BaseExecutionTimePredictorConfig,
+    MetricsConfig,
+    ReplicaConfig,
+    SarathiSchedulerConfig,
+)
+from vidur.execution_time_predictor import ExecutionTimePredictorRegistry
+from vidur.execution_time_predictor.base_execution_time_predictor import (
+    get_input_files,
+)
+from vidur.types import ExecutionTimePredictorType
+
+DEVICE_NETWORK_DEVICES = {
+    "a40": "a40_pairwise_nvlink",
+    "a100": "a100_pairwise_nvlink",
+    "h100": "h100_pairwise_nvlink",
+}
+SUMMARY_COLUMNS = [
+    "model_name",
+    "device",
+    "tensor_parallel_size",
+    "predictor_type",
+    "kv_cache_prediction_granularity",
+    "prediction_grid_max_relative_step",
+    "training_time",
+    "prediction_time",
+    "warm_load_time",
+    "prediction_table_bytes",
+    "cache_bytes",
+    "mean_mape",
+]
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output-dir", type=str, default="benchmark_output")
+    parser.add_argument("--cache-dir", type=str, default="./predictor_benchmark_cache")
+    parser.add_argument(
+        "--predictor-types",
+        type=str,
+        nargs="+",
+        default=[str(key) for key in ExecutionTimePredictorRegistry.get_keys()],
+    )
+    parser.add_argument(
+        "--model-names", type=str, nargs="+", default=["meta-llama/Llama-2-7b-hf"]
+    )
+    parser.add_argument(
+        "--devices",
+        type=str,
+        nargs="+",
+        default=["a100"],
+        choices=list(DEVICE_NETWORK_DEVICES),
+    )
+    parser.add_argument("--tensor-parallel-sizes", type=int, nargs="+", default=[1])
+    parser.add_argument(
+        "--kv-cache-prediction-granularities", type=int, nargs="+", default=[64]
+    )
+    parser.add_argument(
+        "--prediction-grid-max-relative-steps", type=float, nargs="+", default=[0.0]
+    )
+    parser.add_argument(
+        "--test-fraction",
+        type=float,
+        default=0.2,
+        help="Fraction of the profiled points held out to measure the MAPE",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--attention-input-file",
+        type=str,
+        default=None,
+        help="Attention profiling data, if not at the default location",
+    )
+
+    return parser.parse_args()
+
+
+def get_dir_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(dir_path, file_name))
+        for dir_path, _, file_names in os.walk(path)
+        for file_name in file_names
+    )
+
+
+def split_input_files(
+    input_files: Tuple[str, ...], split_dir: str, test_fraction: float, seed: int
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    os.makedirs(split_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    train_files = []
+    test_files = []
+    for i, input_file in enumerate(input_files):
+        if not os.path.exists(input_file):
+            # only needed by some of the parallelism configurations
+            train_files.append(input_file)
+            test_files.append(input_file)
+            continue
+
+        df = pd.read_csv(input_file)
+        is_test = rng.random(len(df)) < test_fraction
+
+        file_name = os.path.splitext(os.path.basename(input_file))[0]
+        train_file = f"{split_dir}/{i}_{file_name}_train.csv"
+        test_file = f"{split_dir}/{i}_{file_name}_test.csv"
+        df[~is_test].to_csv(train_file, index=False)
+        df[is_test].to_csv(test_file, index=False)
+
+        train_files.append(train_file)
+        test_files.append(test_file)
+
+    return tuple(train_files), tuple(test_files)
+
+
+def get_predictor_config(
+    predictor_type: str,
+    kv_cache_prediction_granularity: int,
+    prediction_grid_max_relative_step: float,
+    input_files: Tuple[str, ...],
+) -> BaseExecutionTimePredictorConfig:
+    predictor_config = BaseExecutionTimePredictorConfig.create_from_type(
+        ExecutionTimePredictorType.from_str(predictor_type)
+    )
+    predictor_config.kv_cache_prediction_granularity = kv_cache_prediction_granularity
+    predictor_config.prediction_grid_max_relative_step = (
+        prediction_grid_max_relative_step
+    )
+    (
+        predictor_config.compute_input_file,
+        predictor_config.attention_input_file,
+        predictor_config.all_reduce_input_file,
+        predictor_config.send_recv_input_file,
+        predictor_config.cpu_overhead_input_file,
+    ) = input_files
+    # the roofline predictor is fitted to the profiling data by calibration
+    if hasattr(predictor_config, "calibrate"):
+        predictor_config.calibrate = True
+
+    return predictor_config
+
+
+def run_predictor_benchmark(
+    predictor_type: str,
+    kv_cache_prediction_granularity: int,
+    prediction_grid_max_relative_step: float,
+    replica_config: ReplicaConfig,
+    train_files: Tuple[str, ...],
+    test_files: Tuple[str, ...],
+    output_dir: str,
+    cache_dir: str,
+) -> dict:
+    predictor_config = get_predictor_config(
+        predictor_type,
+        kv_cache_prediction_granularity,
+        prediction_grid_max_relative_step,
+        train_files,
+    )
+
+    # start from an empty cache to measure the training
+    predictor_cache_dir = f"{cache_dir}/predictors/{predictor_type}"
+    shutil.rmtree(predictor_cache_dir, ignore_errors=True)
+
+    def build_predictor():
+        return ExecutionTimePredictorRegistry.get(
+            predictor_config.get_type(),
+            predictor_config=predictor_config,
+            replica_config=replica_config,
+            replica_scheduler_config=SarathiSchedulerConfig(),
+            metrics_config=MetricsConfig(
+                output_dir=f"{output_dir}/simulator_output",
+                cache_dir=predictor_cache_dir,
+            ),
+        )
+
+    predictor = build_predictor()
+    startup_stats = predictor.get_startup_stats()
+
+    start_time = time.perf_counter()
+    build_predictor()
+    warm_load_time = time.perf_counter() - start_time
+
+    model_errors = predictor.get_model_errors(test_files)
+
+    return {
+        **startup_stats,
+        "warm_load_time": warm_load_time,
+        "cache_bytes": get_dir_size(predictor_cache_dir),
+        "mean_mape": sum(model_errors.values()) / len(model_errors),
+        **{f"mape.{model_name}": error for model_name, error in model_errors.items()},
+    }
+
+
+def run_predictor_benchmarks(args) -> List[dict]:
+    results = []
+
+    for model_name, device, tensor_parallel_size in product(
+        args.model_names, args.devices, args.tensor_parallel_sizes
+    ):
+        case = {
+            "model_name": model_name,
+            "device": device,
+            "tensor_parallel_size": tensor_parallel_size,
+        }
+
+        replica_config = ReplicaConfig(
+            model_name=model_name,
+            tensor_parallel_size=tensor_parallel_size,
+            device=device,
+            network_device=DEVICE_NETWORK_DEVICES[device],
+        )
+        predictor_config = BaseExecutionTimePredictorConfig.create_from_type(
+            ExecutionTimePredictorType.RANDOM_FORREST
+        )
+        if args.attention_input_file:
+            predictor_config.attention_input_file = args.attention_input_file
+        input_files = get_input_files(predictor_config, replica_config)
+
+        if not os.path.exists(input_files[0]):
+            print(f"Skipping {case}, no profiling data in {input_files[0]}")
+            continue
+
+        train_files, test_files = split_input_files(
+            input_files,
+            f"{args.cache_dir}/splits/{model_name}/{device}/tp{tensor_parallel_size}",
+            args.test_fraction,
+            args.seed,
+        )
+
+        for (
+            predictor_type,
+            kv_cache_prediction_granularity,
+            prediction_grid_max_relative_step,
+        ) in product(
+            args.predictor_types,
+            args.kv_cache_prediction_granularities,
+            args.prediction_grid_max_relative_steps,
+        ):
+            result = {
+                **case,
+                "predictor_type": predictor_type,
+                "kv_cache_prediction_granularity": kv_cache_prediction_granularity,
+                "prediction_grid_max_relative_step": prediction_grid_max_relative_step,
+            }
+            print(f"Benchmarking {result}")
+
+            try:
+                result.update(
+                    run_predictor_benchmark(
+                        predictor_type,
+                        kv_cache_prediction_granularity,
+                        prediction_grid_max_relative_step,
+                        replica_config,
+                        train_files,
+                        test_files,
+                        args.output_dir,
+                        args.cache_dir,
+                    )
+                )
+            except Exception as e:
+                # keep the case in the table, e.g. when some profiling data is missing
+                print(f"Failed to benchmark {result}: {e}")
+                result["error"] = str(e)
+
+            results.append(result)
+
+    return results
+
+
+def main():
+    args = get_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    results = run_predictor_benchmarks(args)
+
+    df = pd.DataFrame(results)
+    df["git_commit"] = get_git_commit()
+
+    print(df[[column for column in SUMMARY_COLUMNS if column in df]].to_string())
+
+    results_file = f"{args.output_dir}/predictor_results.csv"
+    df.to_csv(results_file, index=False)
+    print(f"Results written to {results_file}")
+
+
+if __name__ == "__main__":
+    main()
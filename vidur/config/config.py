@@ -3,6 +3,7 @@ import os
 from abc import ABC
 from dataclasses import dataclass, field
 from datetime import datetime
+from types import SimpleNamespace
 from typing import List, Optional
 
 from vidur.config.base_poly_config import BasePolyConfig
@@ -364,6 +365,28 @@ class MetricsConfig:
         default=True,
         metadata={"help": "Enable Chrome tracing."},
     )
+    trace_buffer_size: int = field(
+        default=1000,
+        metadata={
+            "help": "Number of trace events buffered in memory before they are flushed to disk."
+        },
+    )
+    compress_traces: bool = field(
+        default=False,
+        metadata={"help": "Whether to gzip the json and Chrome traces."},
+    )
+    enable_event_profiling: bool = field(
+        default=False,
+        metadata={
+            "help": "Whether to profile the wall time of the simulator event loop per event type and metrics hook."
+        },
+    )
+    event_profiling_heap_sample_interval: int = field(
+        default=1000,
+        metadata={
+            "help": "Number of events between samples of the event heap size when event profiling is enabled."
+        },
+    )
     save_table_to_wandb: bool = field(
         default=False,
         metadata={"help": "Whether to save table to wandb."},
@@ -408,6 +431,12 @@ class MetricsConfig:
         default=None,
         metadata={"help": "Maximum batch index."},
     )
+    output_format: str = field(
+        default="csv",
+        metadata={
+            "help": "Format of the request, batch and operation metrics tables, csv, parquet or arrow (the Arrow IPC file format). parquet and arrow need pyarrow."
+        },
+    )
     output_dir: str = field(
         default="simulator_output",
         metadata={"help": "Output directory."},
@@ -416,6 +445,12 @@ class MetricsConfig:
         default="cache",
         metadata={"help": "Cache directory."},
     )
+    cache_max_bytes: Optional[int] = field(
+        default=None,
+        metadata={
+            "help": "Size budget of the cache directory in bytes, the least recently used models and prediction tables other than the ones in use are evicted beyond it."
+        },
+    )
 
     def __post_init__(self):
         self.output_dir = (
@@ -466,7 +501,18 @@ class ReplicaConfig:
 
 @dataclass
 class BaseGlobalSchedulerConfig(BasePolyConfig):
-    pass
+    coalesce_schedule_events: bool = field(
+        default=False,
+        metadata={
+            "help": "Keep at most one pending global schedule event per timestamp (or quantum)."
+        },
+    )
+    schedule_quantum: float = field(
+        default=0.0,
+        metadata={
+            "help": "Quantum in seconds to which coalesced global schedule events are rounded up. 0 means schedule at the arrival time."
+        },
+    )
 
 
 @dataclass
@@ -531,6 +577,12 @@ class BaseExecutionTimePredictorConfig(BasePolyConfig):
         default=64,
         metadata={"help": "KV cache prediction granularity."},
     )
+    prediction_grid_max_relative_step: float = field(
+        default=0.0,
+        metadata={
+            "help": "Maximum step of the kv cache size and prefill chunk size prediction grids relative to the size. The steps start at the kv cache prediction granularity and 1 and grow geometrically up to this fraction of the size, 0 keeps them uniform."
+        },
+    )
     prediction_max_prefill_chunk_size: int = field(
         default=4096,
         metadata={"help": "Max prefill chunk size for prediction."},
@@ -561,12 +613,32 @@ class BaseExecutionTimePredictorConfig(BasePolyConfig):
     )
     num_training_job_threads: int = field(
         default=-1,
-        metadata={"help": "Number of training job threads."},
+        metadata={
+            "help": "Total number of cores used to train the models concurrently, -1 uses all the cores."
+        },
     )
     skip_cpu_overhead_modeling: bool = field(
         default=True,
         metadata={"help": "Whether to skip CPU overhead modeling."},
     )
+    execution_time_cache_size: int = field(
+        default=65536,
+        metadata={
+            "help": "Maximum number of batch shapes whose execution time is memoized, 0 disables the cache."
+        },
+    )
+    lazy_prediction: bool = field(
+        default=False,
+        metadata={
+            "help": "Predict the attention execution times on first access instead of over the full prediction grid up front. The predictions are the same up to floating-point rounding, the linear regression models can differ in the last bits."
+        },
+    )
+    lazy_prediction_cache_size: int = field(
+        default=1048576,
+        metadata={
+            "help": "Maximum number of lazily predicted attention execution times to keep."
+        },
+    )
 
 
 @dataclass
@@ -613,6 +685,152 @@ class RandomForrestExecutionTimePredictorConfig(BaseExecutionTimePredictorConfig
         return ExecutionTimePredictorType.RANDOM_FORREST
 
 
+@dataclass
+class HistGradientBoostingExecutionTimePredictorConfig(
+    BaseExecutionTimePredictorConfig
+):
+    max_iter: List[int] = field(
+        default_factory=lambda: [300],
+        metadata={"help": "Number of boosting iterations for gradient boosting."},
+    )
+    learning_rate: List[float] = field(
+        default_factory=lambda: [0.1],
+        metadata={"help": "Learning rate for gradient boosting."},
+    )
+    max_leaf_nodes: List[int] = field(
+        default_factory=lambda: [31, 63],
+        metadata={"help": "Maximum number of leaves per tree for gradient boosting."},
+    )
+    min_samples_leaf: List[int] = field(
+        default_factory=lambda: [1, 5],
+        metadata={"help": "Minimum samples per leaf for gradient boosting."},
+    )
+
+    @staticmethod
+    def get_type():
+        return ExecutionTimePredictorType.HIST_GRADIENT_BOOSTING
+
+
+@dataclass
+class InterpolationExecutionTimePredictorConfig(BaseExecutionTimePredictorConfig):
+    interpolation_method: str = field(
+        default="linear",
+        metadata={
+            "help": "Interpolation between the profiled points, linear or pchip (monotone cubic). Attention points which do not form a full grid are always interpolated linearly."
+        },
+    )
+
+    @staticmethod
+    def get_type():
+        return ExecutionTimePredictorType.INTERPOLATION
+
+
+@dataclass
+class RooflineExecutionTimePredictorConfig(BaseExecutionTimePredictorConfig):
+    compute_efficiency: float = field(
+        default=0.7,
+        metadata={"help": "Fraction of the peak device FLOPs achieved by kernels."},
+    )
+    memory_bandwidth_efficiency: float = field(
+        default=0.8,
+        metadata={
+            "help": "Fraction of the peak device memory bandwidth achieved by kernels."
+        },
+    )
+    kernel_launch_overhead_ms: float = field(
+        default=0.005,
+        metadata={"help": "Fixed overhead of every operator in ms."},
+    )
+    network_bandwidth_gb_per_s: float = field(
+        default=150,
+        metadata={
+            "help": "Bandwidth of the link between devices used for the tensor and pipeline parallel communication."
+        },
+    )
+    network_latency_ms: float = field(
+        default=0.01,
+        metadata={"help": "Latency of every collective or send/recv in ms."},
+    )
+    calibrate: bool = field(
+        default=False,
+        metadata={
+            "help": "Scale the time of every operator to fit the profiling data, for the operators whose profiling data exists."
+        },
+    )
+
+    @staticmethod
+    def get_type():
+        return ExecutionTimePredictorType.ROOFLINE
+
+
+@dataclass
+class EarlyTerminationConfig:
+    enable_convergence_check: bool = field(
+        default=False,
+        metadata={
+            "help": "Stop the simulation once the TTFT, TBT and scheduling delay percentiles over a rolling set of the most recent windows of completed requests are stable, and the number of outstanding requests is not growing."
+        },
+    )
+    convergence_window_size: int = field(
+        default=256,
+        metadata={
+            "help": "Number of completed requests per window, after each of which the percentiles are compared."
+        },
+    )
+    convergence_num_rolling_windows: int = field(
+        default=4,
+        metadata={
+            "help": "Number of most recent windows over which the percentiles are computed."
+        },
+    )
+    convergence_quantile: float = field(
+        default=0.9,
+        metadata={"help": "Quantile of the metrics compared across windows."},
+    )
+    convergence_tolerance: float = field(
+        default=0.05,
+        metadata={
+            "help": "Maximum relative change of the percentiles between consecutive windows to consider them stable."
+        },
+    )
+    convergence_absolute_tolerance: float = field(
+        default=0.001,
+        metadata={
+            "help": "Changes of the percentiles below this many seconds are always considered stable."
+        },
+    )
+    convergence_num_stable_windows: int = field(
+        default=3,
+        metadata={
+            "help": "Number of consecutive stable windows after which the simulation is stopped."
+        },
+    )
+    enable_overload_check: bool = field(
+        default=False,
+        metadata={
+            "help": "Stop the simulation once the number of outstanding requests keeps growing."
+        },
+    )
+    overload_check_interval: float = field(
+        default=10.0,
+        metadata={
+            "help": "Simulated time in seconds between samples of the number of outstanding requests."
+        },
+    )
+    overload_num_growing_intervals: int = field(
+        default=6,
+        metadata={
+            "help": "Number of consecutive intervals with a growing number of outstanding requests after which the system is considered overloaded."
+        },
+    )
+    overload_min_outstanding_requests: int = field(
+        default=128,
+        metadata={
+            "help": "Minimum number of outstanding requests for the system to be considered overloaded."
+        },
+    )
+
+
 @dataclass
 class ClusterConfig:
     num_replicas: int = field(
@@ -644,6 +862,12 @@ class SimulationConfig(ABC):
         default=0,  # in seconds, 0 is no limit
         metadata={"help": "Time limit for simulation in seconds. 0 means no limit."},
     )
+    stream_request_arrivals: bool = field(
+        default=False,
+        metadata={
+            "help": "Generate requests lazily and keep only the next arrival in the event queue."
+        },
+    )
     cluster_config: ClusterConfig = field(
         default_factory=ClusterConfig,
         metadata={"help": "Cluster config."},
@@ -660,6 +884,10 @@ class SimulationConfig(ABC):
         default_factory=MetricsConfig,
         metadata={"help": "Metrics config."},
     )
+    early_termination_config: EarlyTerminationConfig = field(
+        default_factory=EarlyTerminationConfig,
+        metadata={"help": "Early termination config."},
+    )
 
     def __post_init__(self):
         self.write_config_to_file()
@@ -678,6 +906,16 @@ class SimulationConfig(ABC):
 
         return self.__flat_config__.__dict__
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the flat config is an instance of a dynamically created class which
+        # cannot be pickled, only its values are needed by to_dict
+        if "__flat_config__" in state:
+            state["__flat_config__"] = SimpleNamespace(
+                **state["__flat_config__"].__dict__
+            )
+        return state
+
     def write_config_to_file(self):
         config_dict = dataclass_to_dict(self)
         with open(f"{self.metrics_config.output_dir}/config.json", "w") as f:
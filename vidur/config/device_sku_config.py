@@ -11,12 +11,14 @@ logger = init_logger(__name__)
 class BaseDeviceSKUConfig(BaseFixedConfig):
     fp16_tflops: int
     total_memory_gb: int
+    memory_bandwidth_gb_per_s: int
 
 
 @dataclass
 class A10DeviceSKUConfig(BaseDeviceSKUConfig):
     fp16_tflops: int = 125
     total_memory_gb: int = 23
+    memory_bandwidth_gb_per_s: int = 600
 
     @staticmethod
     def get_type():
@@ -27,6 +29,7 @@ class A10DeviceSKUConfig(BaseDeviceSKUConfig):
 class A40DeviceSKUConfig(BaseDeviceSKUConfig):
     fp16_tflops: int = 150
     total_memory_gb: int = 45
+    memory_bandwidth_gb_per_s: int = 696
 
     @staticmethod
     def get_type():
@@ -37,6 +40,7 @@ class A40DeviceSKUConfig(BaseDeviceSKUConfig):
 class A100DeviceSKUConfig(BaseDeviceSKUConfig):
     fp16_tflops: int = 312
     total_memory_gb: int = 80
+    memory_bandwidth_gb_per_s: int = 2039
 
     @staticmethod
     def get_type():
@@ -47,6 +51,7 @@ class A100DeviceSKUConfig(BaseDeviceSKUConfig):
 class H100DeviceSKUConfig(BaseDeviceSKUConfig):
     fp16_tflops: int = 1000
     total_memory_gb: int = 80
+    memory_bandwidth_gb_per_s: int = 3352
 
     @staticmethod
     def get_type():
@@ -10,6 +10,7 @@ import yaml
 
 from vidur.config_optimizer.analyzer.constants import CPU_MACHINE_COST, GPU_COSTS
 from vidur.logger import init_logger
+from vidur.metrics.metrics_table import read_metrics_table
 
 logger = init_logger(__name__)
 
@@ -81,7 +82,6 @@ def extract_utilization_stats(run_dir: str, stat_name: str):
 
 def process_run(run_dir: str):
     config_file = f"{run_dir}/config.yml"
-    request_metrics_file = f"{run_dir}/request_metrics.csv"
     tbt_file = f"{run_dir}/plots/batch_execution_time.csv"
     ttft_file = f"{run_dir}/plots/prefill_e2e_time.csv"
     batch_size_file = f"{run_dir}/plots/batch_size.csv"
@@ -94,13 +94,23 @@ def process_run(run_dir: str):
         with open(config_file, "r") as f:
             config = yaml.safe_load(f)
 
-        request_metrics_df = pd.read_csv(request_metrics_file)
-        tbt_df = pd.read_csv(tbt_file)
-        ttft_df = pd.read_csv(ttft_file)
-        batch_size_df = pd.read_csv(batch_size_file)
-        batch_num_tokens_df = pd.read_csv(batch_num_tokens_file)
+        request_metrics_df = read_metrics_table(
+            run_dir,
+            "request_metrics",
+            columns=[
+                "request_scheduling_delay",
+                "request_e2e_time_normalized",
+                "prefill_e2e_time",
+            ],
+        )
+        tbt_df = pd.read_csv(tbt_file, usecols=["batch_execution_time", "cdf"])
+        ttft_df = pd.read_csv(ttft_file, usecols=["prefill_e2e_time", "cdf"])
+        batch_size_df = pd.read_csv(batch_size_file, usecols=["batch_size", "cdf"])
+        batch_num_tokens_df = pd.read_csv(
+            batch_num_tokens_file, usecols=["batch_num_tokens", "cdf"]
+        )
         request_completion_time_series_df = pd.read_csv(
-            request_completion_time_series_file
+            request_completion_time_series_file, usecols=["Time (sec)"]
         )
     except FileNotFoundError as e:
         # TODO(amey): Add a better error handling approach
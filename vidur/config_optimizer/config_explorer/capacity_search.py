@@ -1,11 +1,11 @@
 import argparse
 import glob
+import json
 import os
 import platform
 import shlex
 from subprocess import Popen
 
-import pandas as pd
 import ray
 
 from vidur.config_optimizer.config_explorer.config import JobConfig, SimulationConfig
@@ -14,6 +14,10 @@ from vidur.config_optimizer.config_explorer.ray_utils import (
     get_ip,
 )
 from vidur.logger import init_logger
+from vidur.metrics.metrics_table import (
+    find_metrics_table_file,
+    read_metrics_table_file,
+)
 
 logger = init_logger(__name__)
 
@@ -58,20 +62,38 @@ class CapacitySearch:
         return command
 
     def _get_result_file(self, run_dir: str) -> str:
-        scheduling_delay_file = glob.glob(
-            f"{run_dir}/*/plots/request_scheduling_delay.csv"
-        )
-        if len(scheduling_delay_file) == 0:
-            return
+        # the request metrics, in whichever format the run wrote them
+        for output_dir in glob.glob(f"{run_dir}/*"):
+            request_metrics_file = find_metrics_table_file(
+                output_dir, "request_metrics"
+            )
+            if request_metrics_file:
+                return request_metrics_file
 
-        return scheduling_delay_file[0]
+    def _is_overloaded(self, result_file: str) -> bool:
+        # runs stopped early on overload only have the metrics of the requests
+        # completed so far, which understate the scheduling delay
+        termination_file = f"{os.path.dirname(result_file)}/termination.json"
+        if not os.path.exists(termination_file):
+            return False
+
+        with open(termination_file) as f:
+            return json.load(f)["termination_reason"] == "overloaded"
 
     def _is_under_sla(
         self,
         result_file: str,
         simulator_config: SimulationConfig,
     ) -> tuple[bool, float]:
-        scheduling_delay_df = pd.read_csv(result_file)
+        if self._is_overloaded(result_file):
+            logger.info(
+                f"{simulator_config.to_human_readable_name()} - Overloaded",
+            )
+            return False, float("inf")
+
+        scheduling_delay_df = read_metrics_table_file(
+            result_file, columns=["request_scheduling_delay"]
+        )
         scheduling_delay = scheduling_delay_df["request_scheduling_delay"].quantile(
             self.args.scheduling_delay_slo_quantile
         )
@@ -91,6 +113,7 @@ class CapacitySearch:
             qps=qps,
             time_limit=self.args.time_limit,
             job_config=self.job_config,
+            metrics_output_format=self.args.metrics_output_format,
         )
         run_dir = simulator_config.get_run_dir()
         os.makedirs(run_dir, exist_ok=True)
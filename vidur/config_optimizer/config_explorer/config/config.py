@@ -235,12 +235,14 @@ class SimulationConfig:
     qps: float
     time_limit: int
     job_config: JobConfig
+    metrics_output_format: str = "csv"
 
     def to_config_dict(self):
         return {
             **self.job_config.to_config_dict(),
             "metrics_config_output_dir": self.get_run_dir(),
             "metrics_config_cache_dir": self.cache_dir,
+            "metrics_config_output_format": self.metrics_output_format,
             "poisson_request_interval_generator_config_qps": self.qps,
             "gamma_request_interval_generator_config_qps": self.qps,
             "time_limit": self.time_limit * 60,  # to seconds
@@ -249,6 +251,7 @@ class SimulationConfig:
             "no-metrics_config_store_operation_metrics": None,
             "no-metrics_config_store_token_completion_metrics": None,
             "no-metrics_config_enable_chrome_trace": None,
+            "early_termination_config_enable_overload_check": None,
             "linear_regression_execution_time_predictor_config_skip_cpu_overhead_modeling": None,
             "random_forrest_execution_time_predictor_config_skip_cpu_overhead_modeling": None,
         }
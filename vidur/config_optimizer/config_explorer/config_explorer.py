@@ -1,8 +1,13 @@
 import argparse
-import copy
+import os
 
 import ray
 
+from vidur.config import (
+    BaseReplicaSchedulerConfig,
+    RandomForrestExecutionTimePredictorConfig,
+    ReplicaConfig,
+)
 from vidur.config_optimizer.config_explorer.capacity_search import CapacitySearch
 from vidur.config_optimizer.config_explorer.config import JobConfig
 from vidur.config_optimizer.config_explorer.ray_utils import (
@@ -10,6 +15,11 @@ from vidur.config_optimizer.config_explorer.ray_utils import (
     RayParallelRunner,
     run_on_each_node,
 )
+from vidur.execution_time_predictor.build_cache import (
+    PredictorCacheEntry,
+    build_predictor_caches,
+)
+from vidur.types import ReplicaSchedulerType
 
 
 def run_search(
@@ -27,6 +37,28 @@ def run_search(
     return capacity_search.search()
 
 
+def get_predictor_cache_entry(
+    job_config: JobConfig, num_training_job_threads: int
+) -> PredictorCacheEntry:
+    # the predictor the simulations of the job are run with, the number of
+    # training threads is not part of the cached models
+    return PredictorCacheEntry(
+        RandomForrestExecutionTimePredictorConfig(
+            skip_cpu_overhead_modeling=True,
+            num_training_job_threads=num_training_job_threads,
+        ),
+        ReplicaConfig(
+            model_name=job_config.model_config.identifier,
+            num_pipeline_stages=job_config.num_pipeline_stages,
+            tensor_parallel_size=job_config.num_tensor_parallel_workers,
+            device=job_config.cluster_config.device,
+        ),
+        BaseReplicaSchedulerConfig.create_from_type(
+            ReplicaSchedulerType.from_str(job_config.scheduler_config.scheduler)
+        ),
+    )
+
+
 class ConfigExplorer:
     def __init__(
         self,
@@ -41,18 +73,23 @@ class ConfigExplorer:
     def _warmup_cache(self):
         job_configs = JobConfig.generate_unique_model_job_configs(self.config)
 
-        args_for_warmup = copy.deepcopy(self.args)
-        args_for_warmup.max_iterations = 1
+        # the cores are split between the predictors built concurrently
+        num_workers = max(1, self.args.num_threads)
+        num_training_job_threads = max(1, (os.cpu_count() or 1) // num_workers)
 
-        for job_config in job_configs:
-            all_node_results = run_on_each_node(
-                run_search,
-                job_config,
-                args_for_warmup,
-            )
-            assert all(all_node_results) or not any(
-                all_node_results
-            ), "All nodes should have the same result"
+        # the caches are local to every node
+        all_node_failed_entries = run_on_each_node(
+            build_predictor_caches,
+            [
+                get_predictor_cache_entry(job_config, num_training_job_threads)
+                for job_config in job_configs
+            ],
+            self.args.cache_dir,
+            num_workers,
+        )
+        assert not any(
+            all_node_failed_entries
+        ), "Failed to build the predictor caches on some of the nodes"
 
     def run(self):
         if not self.args.skip_cache_warmup:
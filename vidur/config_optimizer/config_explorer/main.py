@@ -16,6 +16,7 @@ import yaml
 
 from vidur.config_optimizer.config_explorer.config_explorer import ConfigExplorer
 from vidur.logger import init_logger
+from vidur.metrics.metrics_table import METRICS_TABLE_FORMATS
 
 logger = init_logger(__name__)
 
@@ -38,6 +39,13 @@ def get_args():
     parser.add_argument(
         "--time-limit", type=int, default=30, help="Time limit in minutes"
     )
+    parser.add_argument(
+        "--metrics-output-format",
+        type=str,
+        default="csv",
+        choices=METRICS_TABLE_FORMATS,
+        help="Format of the metrics tables of the simulations",
+    )
     parser.add_argument("--debug", action="store_true")
     parser.add_argument("--skip-cache-warmup", action="store_true")
 
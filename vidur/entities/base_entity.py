@@ -1,10 +1,12 @@
 class BaseEntity:
-    _id = -1
+    __slots__ = ("_id",)
+
+    _id_counter = -1
 
     @classmethod
     def generate_id(cls):
-        cls._id += 1
-        return cls._id
+        cls._id_counter += 1
+        return cls._id_counter
 
     @property
     def id(self) -> int:
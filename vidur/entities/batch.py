@@ -7,8 +7,12 @@ from vidur.logger import init_logger
 logger = init_logger(__name__)
 
 
-# a decorator which checks if the request has been scheduled
+# a decorator which checks if the request has been scheduled,
+# the check is compiled out when running with python -O
 def check_scheduled(func):
+    if not __debug__:
+        return func
+
     def wrapper(self, *args, **kwargs):
         if not self._scheduled:
             raise ValueError("Batch has not been scheduled yet")
@@ -18,6 +22,9 @@ def check_scheduled(func):
 
 
 def check_completed(func):
+    if not __debug__:
+        return func
+
     def wrapper(self, *args, **kwargs):
         if not self._completed:
             raise ValueError("Batch has not been scheduled yet")
@@ -27,6 +34,21 @@ def check_completed(func):
 
 
 class Batch(BaseEntity):
+    __slots__ = (
+        "_replica_id",
+        "_requests",
+        "_num_tokens",
+        "_total_num_tokens",
+        "_num_prefill_tokens",
+        "_total_num_tokens_rounded",
+        "_scheduled_at",
+        "_completed_at",
+        "_scheduled",
+        "_completed",
+        "_decode_params",
+        "_prefill_params",
+    )
+
     def __init__(
         self,
         replica_id: int,
@@ -7,8 +7,12 @@ from vidur.logger import init_logger
 logger = init_logger(__name__)
 
 
-# a decorator which checks if the request has been scheduled
+# a decorator which checks if the request has been scheduled,
+# the check is compiled out when running with python -O
 def check_scheduled(func):
+    if not __debug__:
+        return func
+
     def wrapper(self, *args, **kwargs):
         if not self._scheduled:
             raise ValueError("Batch has not been scheduled yet")
@@ -18,6 +22,19 @@ def check_scheduled(func):
 
 
 class BatchStage(BaseEntity):
+    __slots__ = (
+        "_requests",
+        "_num_tokens",
+        "_batch_id",
+        "_replica_id",
+        "_pipeline_stage",
+        "_execution_time",
+        "_model_execution_time",
+        "_scheduled_at",
+        "_completed_at",
+        "_scheduled",
+    )
+
     def __init__(
         self,
         batch_id: int,
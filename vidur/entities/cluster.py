@@ -14,6 +14,7 @@ class Cluster(BaseEntity):
         cluster_config: ClusterConfig,
         metrics_config: MetricsConfig,
         generator_config: BaseRequestGeneratorConfig,
+        write_cluster_info: bool = True,
     ) -> None:
         self._id = Cluster.generate_id()
         self._config = cluster_config
@@ -28,7 +29,7 @@ class Cluster(BaseEntity):
             replica = Replica(self._config.replica_config, generator_config)
             self._replicas[replica.id] = replica
 
-        if metrics_config.write_json_trace:
+        if write_cluster_info and metrics_config.write_json_trace:
             self._write_cluster_info_to_file()
 
     @property
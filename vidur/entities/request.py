@@ -6,8 +6,12 @@ from vidur.logger import init_logger
 logger = init_logger(__name__)
 
 
-# a decorator which checks if the request has been scheduled
+# a decorator which checks if the request has been scheduled,
+# the check is compiled out when running with python -O
 def check_scheduled(func):
+    if not __debug__:
+        return func
+
     def wrapper(self, *args, **kwargs):
         if not self._scheduled:
             raise ValueError("Request has not been scheduled yet")
@@ -17,6 +21,9 @@ def check_scheduled(func):
 
 
 def check_completed(func):
+    if not __debug__:
+        return func
+
     def wrapper(self, *args, **kwargs):
         if not self._completed:
             raise ValueError("Request has not been completed yet")
@@ -26,6 +33,30 @@ def check_completed(func):
 
 
 class Request(BaseEntity):
+    __slots__ = (
+        "_arrived_at",
+        "_num_prefill_tokens",
+        "_num_decode_tokens",
+        "_num_processed_tokens",
+        "_scheduled_at",
+        "_execution_time",
+        "_model_execution_time",
+        "_scheduling_delay",
+        "_preempted_time",
+        "_completed_at",
+        "_prefill_completed_at",
+        "_latest_stage_scheduled_at",
+        "_latest_stage_completed_at",
+        "_latest_iteration_scheduled_at",
+        "_latest_iteration_completed_at",
+        "_latest_iteration_scheduling_delay",
+        "_scheduled",
+        "_preempted",
+        "_completed",
+        "_is_prefill_complete",
+        "_num_restarts",
+    )
+
     def __init__(
         self,
         arrived_at: float,
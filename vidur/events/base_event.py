@@ -7,7 +7,9 @@ from vidur.types import EventType
 
 
 class BaseEvent(ABC):
-    _id = 0
+    __slots__ = ("_time", "_id", "_event_type", "_priority_number")
+
+    _id_counter = 0
 
     def __init__(self, time: float, event_type: EventType):
         self._time = time
@@ -17,8 +19,8 @@ class BaseEvent(ABC):
 
     @classmethod
     def generate_id(cls):
-        cls._id += 1
-        return cls._id
+        cls._id_counter += 1
+        return cls._id_counter
 
     @property
     def id(self) -> int:
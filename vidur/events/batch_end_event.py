@@ -11,6 +11,8 @@ logger = init_logger(__name__)
 
 
 class BatchEndEvent(BaseEvent):
+    __slots__ = ("_replica_id", "_batch")
+
     def __init__(self, time: float, replica_id: int, batch: Batch):
         super().__init__(time, EventType.BATCH_END)
 
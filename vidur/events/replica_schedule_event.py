@@ -10,6 +10,8 @@ logger = init_logger(__name__)
 
 
 class ReplicaScheduleEvent(BaseEvent):
+    __slots__ = ("_replica_id", "_batches")
+
     def __init__(self, time: float, replica_id: int):
         super().__init__(time, EventType.REPLICA_SCHEDULE)
 
@@ -28,6 +30,8 @@ class ReplicaScheduleEvent(BaseEvent):
         if not self._batches:
             return []
 
+        scheduler.execution_time_predictor.prefetch_execution_times(self._batches)
+
         memory_usage_percent = replica_scheduler.memory_usage_percent
         metrics_store.on_replica_schedule(
             self.time, self._replica_id, memory_usage_percent
@@ -10,6 +10,14 @@ logger = init_logger(__name__)
 
 
 class ReplicaStageScheduleEvent(BaseEvent):
+    __slots__ = (
+        "_replica_id",
+        "_stage_id",
+        "_batch",
+        "_batch_stage",
+        "_is_last_stage",
+    )
+
     def __init__(self, time: float, replica_id: int, stage_id: int):
         super().__init__(time, EventType.REPLICA_STAGE_SCHEDULE)
 
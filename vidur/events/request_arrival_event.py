@@ -11,11 +11,19 @@ logger = init_logger(__name__)
 
 
 class RequestArrivalEvent(BaseEvent):
+    __slots__ = ("_request",)
+
     def __init__(self, time: float, request: Request) -> None:
         super().__init__(time, EventType.REQUEST_ARRIVAL)
 
         self._request = request
 
+    def _get_priority_number(self):
+        # arrivals go ahead of every other event at the same timestamp, this is
+        # the order we get when all arrivals are created upfront (and hence have
+        # the smallest ids), and keeps it when arrivals are streamed in lazily
+        return (self._time, 0, self._event_type)
+
     def handle_event(
         self, scheduler: BaseGlobalScheduler, metrics_store: MetricsStore
     ) -> List[BaseEvent]:
@@ -24,7 +32,14 @@ class RequestArrivalEvent(BaseEvent):
         logger.debug(f"Request: {self._request.id} arrived at {self.time}")
         scheduler.add_request(self._request)
         metrics_store.on_request_arrival(self.time, self._request)
-        return [GlobalScheduleEvent(self.time)]
+
+        # arrivals are handled before schedule events at the same timestamp, so a
+        # pending schedule event will pick up this request along with the others
+        schedule_time = scheduler.get_schedule_time(self.time)
+        if schedule_time is None:
+            return []
+
+        return [GlobalScheduleEvent(schedule_time)]
 
     def to_dict(self) -> dict:
         return {
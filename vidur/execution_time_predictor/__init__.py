@@ -4,5 +4,6 @@ from vidur.execution_time_predictor.base_execution_time_predictor import (
 from vidur.execution_time_predictor.execution_time_predictor_registry import (
     ExecutionTimePredictorRegistry,
 )
+from vidur.execution_time_predictor.execution_times import ExecutionTimes
 
-__all__ = [ExecutionTimePredictorRegistry, BaseExecutionTimePredictor]
+__all__ = [ExecutionTimePredictorRegistry, BaseExecutionTimePredictor, ExecutionTimes]
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
 
 from vidur.config import (
     BaseExecutionTimePredictorConfig,
@@ -7,6 +9,26 @@ from vidur.config import (
     ReplicaConfig,
 )
 from vidur.entities import Batch, ExecutionTime
+from vidur.execution_time_predictor.execution_times import ExecutionTimes
+
+
+def get_input_files(
+    predictor_config: BaseExecutionTimePredictorConfig, replica_config: ReplicaConfig
+) -> Tuple[str, str, str, str, str]:
+    # the compute, attention, all reduce, send recv and cpu overhead profiling
+    # data of the replica
+    return tuple(
+        input_file.replace("{DEVICE}", replica_config.device)
+        .replace("{MODEL}", replica_config.model_config.get_name())
+        .replace("{NETWORK_DEVICE}", replica_config.network_device)
+        for input_file in [
+            predictor_config.compute_input_file,
+            predictor_config.attention_input_file,
+            predictor_config.all_reduce_input_file,
+            predictor_config.send_recv_input_file,
+            predictor_config.cpu_overhead_input_file,
+        ]
+    )
 
 
 class BaseExecutionTimePredictor(ABC):
@@ -29,7 +51,80 @@ class BaseExecutionTimePredictor(ABC):
             self._model_config.num_layers // self._replica_config.num_pipeline_stages
         )
 
+        # the predictor is shared by all the replicas, batches of the same shape
+        # get the same execution time irrespective of the replica or stage
+        self._execution_time_cache_size = predictor_config.execution_time_cache_size
+        self._execution_time_cache: OrderedDict[Hashable, ExecutionTime] = OrderedDict()
+        self._execution_time_cache_hits = 0
+        self._execution_time_cache_misses = 0
+
     def get_execution_time(self, batch: Batch, pipeline_stage: int) -> ExecutionTime:
+        if self._execution_time_cache_size <= 0:
+            return self._get_execution_time(batch, pipeline_stage)
+
+        signature = self._get_batch_signature(batch, pipeline_stage)
+        if signature is None:
+            return self._get_execution_time(batch, pipeline_stage)
+
+        execution_time = self._execution_time_cache.get(signature)
+        if execution_time is not None:
+            self._execution_time_cache_hits += 1
+            self._execution_time_cache.move_to_end(signature)
+            return execution_time
+
+        self._execution_time_cache_misses += 1
+        execution_time = self._get_execution_time(batch, pipeline_stage)
+        self._execution_time_cache[signature] = execution_time
+        if len(self._execution_time_cache) > self._execution_time_cache_size:
+            self._execution_time_cache.popitem(last=False)
+
+        return execution_time
+
+    def get_execution_times(
+        self, batches: List[Batch], pipeline_stages: List[int]
+    ) -> ExecutionTimes:
+        assert len(batches) == len(pipeline_stages)
+
+        return ExecutionTimes.from_execution_times(
+            self._num_layers_per_pipeline_stage,
+            [
+                self.get_execution_time(batch, pipeline_stage)
+                for batch, pipeline_stage in zip(batches, pipeline_stages)
+            ],
+        )
+
+    def get_execution_time_cache_stats(self) -> dict:
+        num_lookups = (
+            self._execution_time_cache_hits + self._execution_time_cache_misses
+        )
+        return {
+            "hits": self._execution_time_cache_hits,
+            "misses": self._execution_time_cache_misses,
+            "hit_rate": (
+                self._execution_time_cache_hits / num_lookups if num_lookups else 0.0
+            ),
+            "size": len(self._execution_time_cache),
+            "max_size": self._execution_time_cache_size,
+        }
+
+    def prefetch_execution_times(self, batches: List[Batch]) -> None:
+        # called with all the batches of a scheduling step before their
+        # execution times are requested, so that predictors which compute
+        # predictions on demand can batch them
+        pass
+
+    def get_cache_files(self) -> List[str]:
+        # the files in the cache directory the predictor was built from
+        return []
+
+    def _get_batch_signature(
+        self, batch: Batch, pipeline_stage: int
+    ) -> Optional[Hashable]:
+        # predictors that can derive a key which fully determines the execution
+        # time of a batch override this to enable the execution time cache
+        return None
+
+    def _get_execution_time(self, batch: Batch, pipeline_stage: int) -> ExecutionTime:
         if pipeline_stage == self._replica_config.num_pipeline_stages - 1:
             pipeline_parallel_communication_time = 0
         else:
@@ -0,0 +1,316 @@
+"""
+Builds the execution time predictor caches ahead of time. The models and
+prediction tables of every combination of model, device, parallelism,
+predictor and replica scheduler are trained and predicted in parallel, so
+that the cache directory can be copied to the nodes which run the
+simulations. Combinations whose configuration and profiling data are
+unchanged since they were last built are skipped.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import product
+from typing import List, Tuple
+
+import yaml
+
+from vidur.config import (
+    BaseExecutionTimePredictorConfig,
+    BaseReplicaSchedulerConfig,
+    MetricsConfig,
+    ReplicaConfig,
+)
+from vidur.config.utils import dataclass_to_dict
+from vidur.execution_time_predictor.base_execution_time_predictor import (
+    get_input_files,
+)
+from vidur.execution_time_predictor.execution_time_predictor_registry import (
+    ExecutionTimePredictorRegistry,
+)
+from vidur.execution_time_predictor.model_cache_manifest import ModelCacheManifest
+from vidur.logger import init_logger
+from vidur.types import ExecutionTimePredictorType, ReplicaSchedulerType
+
+logger = init_logger(__name__)
+
+
+@dataclass
+class PredictorCacheEntry:
+    predictor_config: BaseExecutionTimePredictorConfig
+    replica_config: ReplicaConfig
+    replica_scheduler_config: BaseReplicaSchedulerConfig
+
+    def get_name(self) -> str:
+        return (
+            f"{self.replica_config.model_name} {self.replica_config.device}"
+            f" {self.replica_config.network_device}"
+            f" tp{self.replica_config.tensor_parallel_size}"
+            f" pp{self.replica_config.num_pipeline_stages}"
+            f" {self.predictor_config.get_type()}"
+            f" {self.replica_scheduler_config.get_type()}"
+        )
+
+    def get_fingerprint(self, model_cache_manifest: ModelCacheManifest) -> str:
+        predictor_config = dataclass_to_dict(self.predictor_config)
+        # only decides how fast the models are trained
+        del predictor_config["num_training_job_threads"]
+
+        input_file_hashes = [
+            model_cache_manifest.get_file_hash(input_file)
+            for input_file in get_input_files(
+                self.predictor_config, self.replica_config
+            )
+            if os.path.exists(input_file)
+        ]
+
+        fingerprint_str = json.dumps(
+            [
+                predictor_config,
+                dataclass_to_dict(self.replica_config),
+                dataclass_to_dict(self.replica_scheduler_config),
+                input_file_hashes,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.md5(fingerprint_str.encode("utf-8")).hexdigest()
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cache-dir", type=str, default="cache")
+    parser.add_argument(
+        "--model-names", type=str, nargs="+", default=["meta-llama/Llama-2-7b-hf"]
+    )
+    parser.add_argument("--devices", type=str, nargs="+", default=["a100"])
+    parser.add_argument(
+        "--network-devices",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Network device of every device, {device}_pairwise_nvlink by default",
+    )
+    parser.add_argument("--tensor-parallel-sizes", type=int, nargs="+", default=[1])
+    parser.add_argument("--num-pipeline-stages", type=int, nargs="+", default=[1])
+    parser.add_argument(
+        "--predictor-types",
+        type=str,
+        nargs="+",
+        default=[str(ExecutionTimePredictorType.RANDOM_FORREST)],
+    )
+    parser.add_argument(
+        "--predictor-config-overrides",
+        type=str,
+        nargs="+",
+        default=[],
+        help="Predictor config fields to set, e.g. prediction_max_tokens_per_request=16384",
+    )
+    parser.add_argument(
+        "--replica-scheduler-types",
+        type=str,
+        nargs="+",
+        default=[str(ReplicaSchedulerType.SARATHI)],
+        help="Only the block size and the orca scheduler change the caches",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of predictors built concurrently, the cores are split between them",
+    )
+
+    args = parser.parse_args()
+
+    if args.network_devices is None:
+        args.network_devices = [f"{device}_pairwise_nvlink" for device in args.devices]
+    if len(args.network_devices) != len(args.devices):
+        parser.error("--network-devices needs one network device per device")
+
+    return args
+
+
+def parse_predictor_config_overrides(overrides: List[str]) -> dict:
+    predictor_config_overrides = {}
+    for override in overrides:
+        key, separator, value = override.partition("=")
+        assert separator, f"Predictor config override {override} is not key=value"
+        # yaml parses the numbers, booleans and lists
+        predictor_config_overrides[key] = yaml.safe_load(value)
+
+    return predictor_config_overrides
+
+
+def get_predictor_cache_entries(
+    args: argparse.Namespace, num_training_job_threads: int
+) -> List[PredictorCacheEntry]:
+    predictor_config_overrides = parse_predictor_config_overrides(
+        args.predictor_config_overrides
+    )
+    predictor_configs = [
+        BaseExecutionTimePredictorConfig.create_from_type(
+            ExecutionTimePredictorType.from_str(predictor_type)
+        )
+        for predictor_type in args.predictor_types
+    ]
+    for key in predictor_config_overrides:
+        assert any(
+            hasattr(predictor_config, key) for predictor_config in predictor_configs
+        ), f"Unknown predictor config field {key}"
+
+    entries = []
+    for (
+        model_name,
+        (device, network_device),
+        tensor_parallel_size,
+        num_pipeline_stages,
+        predictor_type,
+        replica_scheduler_type,
+    ) in product(
+        args.model_names,
+        zip(args.devices, args.network_devices),
+        args.tensor_parallel_sizes,
+        args.num_pipeline_stages,
+        args.predictor_types,
+        args.replica_scheduler_types,
+    ):
+        predictor_config = BaseExecutionTimePredictorConfig.create_from_type(
+            ExecutionTimePredictorType.from_str(predictor_type)
+        )
+        # some of the fields only exist for some of the predictors
+        for key, value in predictor_config_overrides.items():
+            if hasattr(predictor_config, key):
+                setattr(predictor_config, key, value)
+        predictor_config.num_training_job_threads = num_training_job_threads
+
+        entries.append(
+            PredictorCacheEntry(
+                predictor_config,
+                ReplicaConfig(
+                    model_name=model_name,
+                    num_pipeline_stages=num_pipeline_stages,
+                    tensor_parallel_size=tensor_parallel_size,
+                    device=device,
+                    network_device=network_device,
+                ),
+                BaseReplicaSchedulerConfig.create_from_type(
+                    ReplicaSchedulerType.from_str(replica_scheduler_type)
+                ),
+            )
+        )
+
+    return entries
+
+
+def build_predictor_cache(
+    entry: PredictorCacheEntry, cache_dir: str
+) -> Tuple[List[str], float]:
+    start_time = time.perf_counter()
+
+    # the predictors don't write to the output directory
+    with tempfile.TemporaryDirectory() as output_dir:
+        predictor = ExecutionTimePredictorRegistry.get(
+            entry.predictor_config.get_type(),
+            predictor_config=entry.predictor_config,
+            replica_config=entry.replica_config,
+            replica_scheduler_config=entry.replica_scheduler_config,
+            metrics_config=MetricsConfig(output_dir=output_dir, cache_dir=cache_dir),
+        )
+
+    cache_files = [
+        os.path.relpath(cache_file, cache_dir)
+        for cache_file in predictor.get_cache_files()
+    ]
+    return cache_files, time.perf_counter() - start_time
+
+
+def is_predictor_cache_built(
+    model_cache_manifest: ModelCacheManifest, cache_dir: str, fingerprint: str
+) -> bool:
+    cache_files = model_cache_manifest.get_predictor_cache_files(fingerprint)
+    return cache_files is not None and all(
+        os.path.exists(f"{cache_dir}/{cache_file}") for cache_file in cache_files
+    )
+
+
+def build_predictor_caches(
+    entries: List[PredictorCacheEntry], cache_dir: str, num_workers: int
+) -> List[PredictorCacheEntry]:
+    # returns the entries which failed to build
+    os.makedirs(cache_dir, exist_ok=True)
+    model_cache_manifest = ModelCacheManifest(cache_dir)
+
+    pending_entries = {}
+    for entry in entries:
+        fingerprint = entry.get_fingerprint(model_cache_manifest)
+        if is_predictor_cache_built(model_cache_manifest, cache_dir, fingerprint):
+            logger.info(f"Skipping {entry.get_name()}, already built")
+        else:
+            pending_entries[fingerprint] = entry
+
+    logger.info(f"Building {len(pending_entries)} of {len(entries)} predictor caches")
+
+    failed_entries = []
+
+    def on_build(fingerprint: str, build_result) -> None:
+        cache_files, build_time = build_result
+        model_cache_manifest.set_predictor_cache_files(fingerprint, cache_files)
+        logger.info(
+            f"Built {pending_entries[fingerprint].get_name()} in {build_time:.1f}s"
+        )
+
+    def on_failure(fingerprint: str, e: Exception) -> None:
+        # called from the except blocks, so that the traceback is logged
+        logger.exception(
+            f"Failed to build {pending_entries[fingerprint].get_name()}: {e}"
+        )
+        failed_entries.append(pending_entries[fingerprint])
+
+    if min(num_workers, len(pending_entries)) <= 1:
+        for fingerprint, entry in pending_entries.items():
+            try:
+                on_build(fingerprint, build_predictor_cache(entry, cache_dir))
+            except Exception as e:
+                on_failure(fingerprint, e)
+        return failed_entries
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {
+            executor.submit(build_predictor_cache, entry, cache_dir): fingerprint
+            for fingerprint, entry in pending_entries.items()
+        }
+        for future in as_completed(futures):
+            try:
+                on_build(futures[future], future.result())
+            except Exception as e:
+                on_failure(futures[future], e)
+
+    return failed_entries
+
+
+def main():
+    args = get_args()
+
+    num_workers = max(1, args.num_workers)
+    num_training_job_threads = max(1, (os.cpu_count() or 1) // num_workers)
+    entries = get_predictor_cache_entries(args, num_training_job_threads)
+
+    start_time = time.perf_counter()
+    failed_entries = build_predictor_caches(entries, args.cache_dir, num_workers)
+    logger.info(
+        f"Built the predictor caches in {args.cache_dir}"
+        f" in {time.perf_counter() - start_time:.1f}s"
+    )
+
+    if failed_entries:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
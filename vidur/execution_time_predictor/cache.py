@@ -0,0 +1,136 @@
+"""
+Lists and prunes the execution time predictor cache directory.
+
+    python -m vidur.execution_time_predictor.cache ls --cache-dir cache
+    python -m vidur.execution_time_predictor.cache prune --cache-dir cache --max-bytes 1000000000
+"""
+
+import argparse
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from vidur.execution_time_predictor.model_cache_manifest import (
+    MANIFEST_FILE_NAME,
+    MANIFEST_LOCK_FILE_NAME,
+    ModelCacheManifest,
+)
+
+PROVENANCE_COLUMNS = [
+    "predictor",
+    "model",
+    "device",
+    "network_device",
+    "tensor_parallel_size",
+    "num_pipeline_stages",
+    "operation",
+]
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ls_parser = subparsers.add_parser("ls", help="List the cached entries")
+    ls_parser.add_argument("--cache-dir", type=str, default="cache")
+
+    prune_parser = subparsers.add_parser(
+        "prune", help="Evict the least recently used entries"
+    )
+    prune_parser.add_argument("--cache-dir", type=str, default="cache")
+    prune_parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=None,
+        help="Evict the least recently used entries until the rest fit in this many bytes",
+    )
+    prune_parser.add_argument(
+        "--max-age-days",
+        type=float,
+        default=None,
+        help="Evict the entries which were not used for this many days",
+    )
+    prune_parser.add_argument(
+        "--untracked",
+        action="store_true",
+        help="Also remove the files which are not part of any entry, e.g. from older"
+        " versions or interrupted writes. Only safe while no simulation uses the cache.",
+    )
+
+    return parser.parse_args()
+
+
+def get_untracked_files(
+    cache_dir: str, model_cache_manifest: ModelCacheManifest
+) -> list:
+    tracked_files = {MANIFEST_FILE_NAME, MANIFEST_LOCK_FILE_NAME}
+    for entry in model_cache_manifest.get_entries().values():
+        tracked_files.update(entry["files"])
+
+    return sorted(
+        file_name
+        for file_name in os.listdir(cache_dir)
+        if file_name not in tracked_files and os.path.isfile(f"{cache_dir}/{file_name}")
+    )
+
+
+def list_cache(cache_dir: str, model_cache_manifest: ModelCacheManifest) -> None:
+    entries = model_cache_manifest.get_entries()
+
+    df = pd.DataFrame(
+        [
+            {
+                "entry": name,
+                **{
+                    column: entry["provenance"].get(column)
+                    for column in PROVENANCE_COLUMNS
+                },
+                "size": entry["size"],
+                "last_access": datetime.fromtimestamp(entry["last_access"]),
+            }
+            for name, entry in entries.items()
+        ],
+        columns=["entry", *PROVENANCE_COLUMNS, "size", "last_access"],
+    )
+    if len(df) > 0:
+        print(df.sort_values("last_access").to_string(index=False))
+
+    untracked_files = get_untracked_files(cache_dir, model_cache_manifest)
+    untracked_size = sum(
+        os.path.getsize(f"{cache_dir}/{file_name}") for file_name in untracked_files
+    )
+    print(f"{len(df)} entries, {df['size'].sum()} bytes")
+    print(f"{len(untracked_files)} untracked files, {untracked_size} bytes")
+
+
+def prune_cache(
+    cache_dir: str, model_cache_manifest: ModelCacheManifest, args: argparse.Namespace
+) -> None:
+    max_age = (
+        args.max_age_days * 24 * 60 * 60 if args.max_age_days is not None else None
+    )
+    evicted_entries = model_cache_manifest.evict(args.max_bytes, max_age)
+    print(f"Evicted {len(evicted_entries)} entries")
+
+    if args.untracked:
+        untracked_files = get_untracked_files(cache_dir, model_cache_manifest)
+        for file_name in untracked_files:
+            os.remove(f"{cache_dir}/{file_name}")
+        print(f"Removed {len(untracked_files)} untracked files")
+
+
+def main():
+    args = get_args()
+
+    assert os.path.isdir(args.cache_dir), f"No cache directory {args.cache_dir}"
+    model_cache_manifest = ModelCacheManifest(args.cache_dir)
+
+    if args.command == "ls":
+        list_cache(args.cache_dir, model_cache_manifest)
+    else:
+        prune_cache(args.cache_dir, model_cache_manifest, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,18 @@
+from vidur.execution_time_predictor.hist_gradient_boosting_execution_time_predictor import (
+    HistGradientBoostingExecutionTimePredictor,
+)
+from vidur.execution_time_predictor.interpolation_execution_time_predictor import (
+    InterpolationExecutionTimePredictor,
+)
 from vidur.execution_time_predictor.linear_regression_execution_time_predictor import (
     LinearRegressionExecutionTimePredictor,
 )
 from vidur.execution_time_predictor.random_forrest_execution_time_predictor import (
     RandomForrestExecutionTimePredictor,
 )
+from vidur.execution_time_predictor.roofline_execution_time_predictor import (
+    RooflineExecutionTimePredictor,
+)
 from vidur.types import ExecutionTimePredictorType
 from vidur.utils.base_registry import BaseRegistry
 
@@ -20,3 +29,13 @@ ExecutionTimePredictorRegistry.register(
 ExecutionTimePredictorRegistry.register(
     ExecutionTimePredictorType.LINEAR_REGRESSION, LinearRegressionExecutionTimePredictor
 )
+ExecutionTimePredictorRegistry.register(
+    ExecutionTimePredictorType.INTERPOLATION, InterpolationExecutionTimePredictor
+)
+ExecutionTimePredictorRegistry.register(
+    ExecutionTimePredictorType.ROOFLINE, RooflineExecutionTimePredictor
+)
+ExecutionTimePredictorRegistry.register(
+    ExecutionTimePredictorType.HIST_GRADIENT_BOOSTING,
+    HistGradientBoostingExecutionTimePredictor,
+)
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, fields
+from typing import List
+
+import numpy as np
+
+from vidur.entities import ExecutionTime
+
+
+@dataclass
+class ExecutionTimes:
+    """Struct of arrays counterpart of ExecutionTime for a list of batches.
+
+    Every field holds one value per batch, in the order of the arguments of
+    ExecutionTime, and the derived times are computed the same way.
+    """
+
+    num_layers_per_pipeline_stage: int
+    attention_rope_execution_time: np.ndarray
+    attention_kv_cache_save_execution_time: np.ndarray
+    attention_decode_execution_time: np.ndarray
+    attention_prefill_execution_time: np.ndarray
+    attention_layer_pre_proj_execution_time: np.ndarray
+    attention_layer_post_proj_execution_time: np.ndarray
+    mlp_layer_up_proj_execution_time: np.ndarray
+    mlp_layer_down_proj_execution_time: np.ndarray
+    mlp_layer_act_execution_time: np.ndarray
+    attn_norm_time: np.ndarray
+    mlp_norm_time: np.ndarray
+    add_time: np.ndarray
+    tensor_parallel_communication_time: np.ndarray
+    pipeline_parallel_communication_time: np.ndarray
+    schedule_time: np.ndarray
+    sampler_e2e_time: np.ndarray
+    prepare_inputs_e2e_time: np.ndarray
+    process_model_outputs_time: np.ndarray
+    ray_comm_time: np.ndarray
+
+    @classmethod
+    def from_execution_times(
+        cls, num_layers_per_pipeline_stage: int, execution_times: List[ExecutionTime]
+    ) -> "ExecutionTimes":
+        return cls(
+            num_layers_per_pipeline_stage,
+            *[
+                np.array(
+                    [
+                        getattr(execution_time, f"_{field.name}")
+                        for execution_time in execution_times
+                    ],
+                    dtype=np.float64,
+                )
+                for field in fields(cls)[1:]
+            ],
+        )
+
+    def __len__(self) -> int:
+        return len(self.add_time)
+
+    def get_execution_time(self, index: int) -> ExecutionTime:
+        return ExecutionTime(
+            self.num_layers_per_pipeline_stage,
+            *[getattr(self, field.name)[index] for field in fields(self)[1:]],
+        )
+
+    @property
+    def model_time(self) -> np.ndarray:
+        mlp_layer_execution_time = (
+            self.mlp_layer_up_proj_execution_time
+            + self.mlp_layer_down_proj_execution_time
+            + self.mlp_layer_act_execution_time
+            + self.tensor_parallel_communication_time
+            + self.mlp_norm_time
+        )
+        attention_layer_execution_time = (
+            self.attention_layer_pre_proj_execution_time
+            + self.attention_layer_post_proj_execution_time
+            + self.attention_rope_execution_time
+            + self.attention_kv_cache_save_execution_time
+            + self.attention_decode_execution_time
+            + self.attention_prefill_execution_time
+            + self.tensor_parallel_communication_time
+            + self.attn_norm_time
+        )
+        block_execution_time = (
+            attention_layer_execution_time + mlp_layer_execution_time + self.add_time
+        )
+        # return in seconds
+        return (
+            block_execution_time * self.num_layers_per_pipeline_stage
+            + self.pipeline_parallel_communication_time
+        ) * 1e-3
+
+    @property
+    def total_time(self) -> np.ndarray:
+        cpu_overhead = (
+            self.schedule_time
+            + self.sampler_e2e_time
+            + self.prepare_inputs_e2e_time
+            + self.process_model_outputs_time
+            + self.ray_comm_time
+        )
+        # return in seconds
+        return self.model_time + cpu_overhead * 1e-3
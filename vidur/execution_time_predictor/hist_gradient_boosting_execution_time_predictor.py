@@ -0,0 +1,39 @@
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from vidur.config import (
+    BaseReplicaSchedulerConfig,
+    HistGradientBoostingExecutionTimePredictorConfig,
+    MetricsConfig,
+    ReplicaConfig,
+)
+from vidur.execution_time_predictor.sklearn_execution_time_predictor import (
+    SklearnExecutionTimePredictor,
+)
+
+
+class HistGradientBoostingExecutionTimePredictor(SklearnExecutionTimePredictor):
+    def __init__(
+        self,
+        predictor_config: HistGradientBoostingExecutionTimePredictorConfig,
+        replica_config: ReplicaConfig,
+        replica_scheduler_config: BaseReplicaSchedulerConfig,
+        metrics_config: MetricsConfig,
+    ) -> None:
+        # will trigger model training
+        super().__init__(
+            predictor_config=predictor_config,
+            replica_config=replica_config,
+            replica_scheduler_config=replica_scheduler_config,
+            metrics_config=metrics_config,
+        )
+
+    def _get_grid_search_params(self):
+        return {
+            "max_iter": self._config.max_iter,
+            "learning_rate": self._config.learning_rate,
+            "max_leaf_nodes": self._config.max_leaf_nodes,
+            "min_samples_leaf": self._config.min_samples_leaf,
+        }
+
+    def _get_estimator(self):
+        return HistGradientBoostingRegressor()
@@ -0,0 +1,76 @@
+import time
+from typing import Dict, List
+
+from sklearn.base import BaseEstimator
+
+from vidur.config import (
+    BaseReplicaSchedulerConfig,
+    InterpolationExecutionTimePredictorConfig,
+    MetricsConfig,
+    ReplicaConfig,
+)
+from vidur.execution_time_predictor.interpolation_regressor import (
+    InterpolationRegressor,
+)
+from vidur.execution_time_predictor.sklearn_execution_time_predictor import (
+    ModelTrainingJob,
+    SklearnExecutionTimePredictor,
+)
+
+
+class InterpolationExecutionTimePredictor(SklearnExecutionTimePredictor):
+    def __init__(
+        self,
+        predictor_config: InterpolationExecutionTimePredictorConfig,
+        replica_config: ReplicaConfig,
+        replica_scheduler_config: BaseReplicaSchedulerConfig,
+        metrics_config: MetricsConfig,
+    ) -> None:
+        # will build the interpolators
+        super().__init__(
+            predictor_config=predictor_config,
+            replica_config=replica_config,
+            replica_scheduler_config=replica_scheduler_config,
+            metrics_config=metrics_config,
+        )
+
+    def _get_grid_search_params(self):
+        return {"method": [self._config.interpolation_method]}
+
+    def _get_estimator(self):
+        return InterpolationRegressor(method=self._config.interpolation_method)
+
+    def _fit_models(
+        self, training_jobs: List[ModelTrainingJob]
+    ) -> Dict[str, BaseEstimator]:
+        # there are no hyperparameters to search over, the interpolators are
+        # built directly from the profiled points
+        models = {}
+
+        for training_job in training_jobs:
+            start_time = time.perf_counter()
+
+            X = training_job.df[training_job.feature_cols]
+            y = training_job.df[training_job.target_col]
+            model = self._get_estimator().fit(X, y)
+            score = -self.mean_absolute_percentage_error(y, model.predict(X))
+
+            models[training_job.model_name] = self._on_model_fit(
+                training_job,
+                (
+                    model,
+                    {"method": self._config.interpolation_method},
+                    score,
+                    time.perf_counter() - start_time,
+                ),
+                len(models) + 1,
+                len(training_jobs),
+            )
+
+        return models
+
+    def to_dict(self) -> dict:
+        return {
+            **super().to_dict(),
+            "interpolation_method": self._config.interpolation_method,
+        }
@@ -0,0 +1,133 @@
+import numpy as np
+from scipy.interpolate import (
+    LinearNDInterpolator,
+    NearestNDInterpolator,
+    PchipInterpolator,
+    RegularGridInterpolator,
+)
+from sklearn.base import BaseEstimator, RegressorMixin
+
+INTERPOLATION_METHODS = ["linear", "pchip"]
+# the monotone cubic interpolation needs at least this many points per feature
+MIN_PCHIP_POINTS = 4
+
+
+class InterpolationRegressor(RegressorMixin, BaseEstimator):
+    """Interpolates between the profiled points instead of fitting a model.
+
+    Repeated measurements of a point are averaged and features which take a
+    single value are ignored. One feature is interpolated with a piecewise
+    linear or a monotone cubic (pchip) curve and extrapolated linearly from
+    its first and last segments. Two features profiled over a full grid are
+    interpolated over that grid, otherwise piecewise linearly over a
+    triangulation of the points, with the nearest point used outside of it.
+    """
+
+    def __init__(self, method: str = "linear") -> None:
+        self.method = method
+
+    def fit(self, X, y) -> "InterpolationRegressor":
+        assert self.method in INTERPOLATION_METHODS
+
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.n_features_in_ = X.shape[1]
+
+        self.active_features_ = [
+            i for i in range(X.shape[1]) if len(np.unique(X[:, i])) > 1
+        ]
+        assert len(self.active_features_) <= 2
+
+        points, inverse = np.unique(
+            X[:, self.active_features_], axis=0, return_inverse=True
+        )
+        inverse = inverse.reshape(-1)
+        values = np.bincount(inverse, weights=y) / np.bincount(inverse)
+
+        self.points_ = points
+        self.values_ = values
+        self.interpolator_ = None
+        self.fallback_interpolator_ = None
+
+        if len(self.active_features_) == 1:
+            self._fit_1d()
+        elif len(self.active_features_) == 2:
+            self._fit_2d()
+
+        return self
+
+    def _fit_1d(self) -> None:
+        x = self.points_[:, 0]
+        if self.method == "pchip" and len(x) >= MIN_PCHIP_POINTS:
+            self.interpolator_ = PchipInterpolator(x, self.values_)
+
+        self.slopes_ = (
+            (self.values_[1] - self.values_[0]) / (x[1] - x[0]),
+            (self.values_[-1] - self.values_[-2]) / (x[-1] - x[-2]),
+        )
+
+    def _fit_2d(self) -> None:
+        x = np.unique(self.points_[:, 0])
+        y = np.unique(self.points_[:, 1])
+
+        if len(self.points_) == len(x) * len(y):
+            # the unique points are sorted, so they fill the grid row by row
+            if self.method == "pchip" and min(len(x), len(y)) >= MIN_PCHIP_POINTS:
+                method = "pchip"
+            else:
+                method = "linear"
+
+            self.interpolator_ = RegularGridInterpolator(
+                (x, y),
+                self.values_.reshape(len(x), len(y)),
+                method=method,
+                bounds_error=False,
+                fill_value=None,
+            )
+            return
+
+        self.interpolator_ = LinearNDInterpolator(
+            self.points_, self.values_, rescale=True
+        )
+        self.fallback_interpolator_ = NearestNDInterpolator(
+            self.points_, self.values_, rescale=True
+        )
+
+    def _predict_1d(self, x: np.ndarray) -> np.ndarray:
+        x_min = self.points_[0, 0]
+        x_max = self.points_[-1, 0]
+        x_clipped = np.clip(x, x_min, x_max)
+
+        if self.interpolator_ is None:
+            predictions = np.interp(x_clipped, self.points_[:, 0], self.values_)
+        else:
+            predictions = self.interpolator_(x_clipped)
+
+        return (
+            predictions
+            + np.minimum(x - x_min, 0) * self.slopes_[0]
+            + np.maximum(x - x_max, 0) * self.slopes_[1]
+        )
+
+    def _predict_2d(self, X: np.ndarray) -> np.ndarray:
+        predictions = self.interpolator_(X)
+
+        if self.fallback_interpolator_ is not None:
+            outside = np.isnan(predictions)
+            if outside.any():
+                predictions[outside] = self.fallback_interpolator_(X[outside])
+
+        return predictions
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)[:, self.active_features_]
+
+        if len(self.active_features_) == 0:
+            predictions = np.full(len(X), self.values_[0])
+        elif len(self.active_features_) == 1:
+            predictions = self._predict_1d(X[:, 0])
+        else:
+            predictions = self._predict_2d(X)
+
+        # the linear extrapolation can go below zero close to the origin
+        return np.maximum(predictions, 0)
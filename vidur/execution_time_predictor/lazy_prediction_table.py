@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from typing import Callable, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+
+
+class LazyPredictionTable:
+    """A prediction grid whose cells are predicted on first access.
+
+    It is indexed like the dense tables of the sklearn predictor. Cells
+    requested together through prefetch are predicted with a single
+    model.predict call, and at most max_size cells are kept, the least
+    recently used ones are evicted first.
+
+    The cells are predicted in other batches than the dense tables, so for
+    models like linear regression, whose predictions go through BLAS, they
+    only match the dense tables up to floating-point rounding.
+    """
+
+    def __init__(
+        self,
+        model: BaseEstimator,
+        get_features: Callable[[np.ndarray], pd.DataFrame],
+        shape: Tuple[int, ...],
+        max_size: int,
+    ) -> None:
+        self._model = model
+        self._get_features = get_features
+        self._shape = shape
+        self._max_size = max_size
+
+        self._cache: OrderedDict[Tuple[int, ...], float] = OrderedDict()
+
+    def __getitem__(self, index: Tuple[int, ...]) -> float:
+        prediction = self._cache.get(index)
+        if prediction is not None:
+            self._cache.move_to_end(index)
+            return prediction
+
+        return self._predict([index])[0]
+
+    def prefetch(self, indices: Iterable[Tuple[int, ...]]) -> None:
+        missing_indices = []
+        for index in indices:
+            if index in self._cache:
+                self._cache.move_to_end(index)
+            else:
+                missing_indices.append(index)
+
+        if missing_indices:
+            # the same cell can be requested by several batches
+            self._predict(list(dict.fromkeys(missing_indices)))
+
+    def _predict(self, indices: list) -> np.ndarray:
+        for index in indices:
+            if any(i < 0 or i >= size for i, size in zip(index, self._shape)):
+                raise IndexError(
+                    f"Index {index} is out of bounds for prediction grid of shape {self._shape}"
+                )
+
+        predictions = self._model.predict(self._get_features(np.array(indices)))
+
+        for index, prediction in zip(indices, predictions):
+            self._cache[index] = prediction
+
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+        return predictions
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fasteners import InterProcessLock
+
+from vidur.logger import init_logger
+
+logger = init_logger(__name__)
+
+MANIFEST_FILE_NAME = "model_cache_manifest.json"
+MANIFEST_LOCK_FILE_NAME = "model_cache_manifest_lock.file"
+HASH_CHUNK_SIZE = 1 << 20
+
+
+@contextmanager
+def atomic_open(file_path: str, mode: str = "w"):
+    # writes to a temporary file which is renamed over the file once complete,
+    # so that readers never need a lock, they get either the old or the new file
+    tmp_file_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file_path, mode) as f:
+            yield f
+        os.replace(tmp_file_path, file_path)
+    finally:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+
+
+class ModelCacheManifest:
+    """Index of the predictor cache directory.
+
+    The content hash of every input file is stored along with its size and
+    mtime, so it is only recomputed when the file changes. Fingerprints built
+    from these hashes map to the model hashes that were derived from the
+    training data, so warm starts never have to hash the training data. The
+    cache files of every predictor built ahead of time are recorded by the
+    fingerprint of its configuration and inputs.
+
+    Every cached model and prediction table is an entry with its files, size,
+    last access time and the configuration it was built for, so that the
+    least recently used entries can be evicted to keep the directory within a
+    size budget. The manifest is only locked to serialize its updates.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self._cache_dir = cache_dir
+        self._manifest_file = f"{cache_dir}/{MANIFEST_FILE_NAME}"
+        self._lock = InterProcessLock(f"{cache_dir}/{MANIFEST_LOCK_FILE_NAME}")
+        self._manifest = self._read()
+
+    def _read(self) -> dict:
+        manifest = {"files": {}, "models": {}, "predictors": {}, "entries": {}}
+        if not os.path.exists(self._manifest_file):
+            return manifest
+
+        try:
+            with open(self._manifest_file) as f:
+                manifest.update(json.load(f))
+        except json.JSONDecodeError:
+            logger.warning(
+                f"Ignoring corrupt model cache manifest {self._manifest_file}"
+            )
+
+        return manifest
+
+    def _modify(self, modify: Callable[[dict], None]) -> None:
+        with self._lock:
+            # merge with the changes of other processes in the meantime
+            self._manifest = self._read()
+            modify(self._manifest)
+
+            with atomic_open(self._manifest_file) as f:
+                json.dump(self._manifest, f, indent=4)
+
+    def _update(self, section: str, key: str, value) -> None:
+        def modify(manifest: dict) -> None:
+            manifest[section][key] = value
+
+        self._modify(modify)
+
+    def get_file_hash(self, file_path: str) -> str:
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+
+        entry = self._manifest["files"].get(file_path)
+        if (
+            entry
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return entry["hash"]
+
+        file_hash = hashlib.md5()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                file_hash.update(chunk)
+
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash.hexdigest(),
+        }
+        self._update("files", file_path, entry)
+
+        return entry["hash"]
+
+    def get_model_hash(self, fingerprint: str) -> Optional[str]:
+        return self._manifest["models"].get(fingerprint)
+
+    def set_model_hash(self, fingerprint: str, model_hash: str) -> None:
+        self._update("models", fingerprint, model_hash)
+
+    def get_predictor_cache_files(self, fingerprint: str) -> Optional[List[str]]:
+        return self._manifest["predictors"].get(fingerprint)
+
+    def set_predictor_cache_files(
+        self, fingerprint: str, cache_files: List[str]
+    ) -> None:
+        # relative to the cache directory, so that it can be moved
+        self._update("predictors", fingerprint, cache_files)
+
+    def get_entries(self) -> Dict[str, dict]:
+        return self._manifest["entries"]
+
+    def touch_entries(self, entries: Dict[str, Tuple[List[str], dict]]) -> None:
+        # records the files and provenance of the given entries, which were
+        # just stored or loaded, along with their current size
+        access_time = time.time()
+
+        def modify(manifest: dict) -> None:
+            for name, (cache_files, provenance) in entries.items():
+                cache_files = [
+                    cache_file
+                    for cache_file in cache_files
+                    if os.path.exists(cache_file)
+                ]
+                # evicted by another process since it was loaded
+                if not cache_files:
+                    manifest["entries"].pop(name, None)
+                    continue
+
+                manifest["entries"][name] = {
+                    "files": [
+                        os.path.relpath(cache_file, self._cache_dir)
+                        for cache_file in cache_files
+                    ],
+                    "size": sum(
+                        os.path.getsize(cache_file) for cache_file in cache_files
+                    ),
+                    "last_access": access_time,
+                    "provenance": provenance,
+                }
+
+        self._modify(modify)
+
+    def evict(
+        self,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        keep: Iterable[str] = (),
+    ) -> List[str]:
+        # removes the entries which were not accessed for max_age seconds and
+        # then the least recently used ones until the entries fit in max_bytes
+        keep = set(keep)
+        evicted_entries = []
+
+        def modify(manifest: dict) -> None:
+            entries = manifest["entries"]
+            total_size = sum(entry["size"] for entry in entries.values())
+            min_access_time = time.time() - max_age if max_age is not None else None
+
+            for name in sorted(entries, key=lambda name: entries[name]["last_access"]):
+                is_expired = (
+                    min_access_time is not None
+                    and entries[name]["last_access"] < min_access_time
+                )
+                is_over_budget = max_bytes is not None and total_size > max_bytes
+                if name in keep or not (is_expired or is_over_budget):
+                    continue
+
+                for cache_file in entries[name]["files"]:
+                    # processes which have the file open keep their copy
+                    try:
+                        os.remove(f"{self._cache_dir}/{cache_file}")
+                    except FileNotFoundError:
+                        pass
+
+                total_size -= entries[name]["size"]
+                evicted_entries.append(name)
+
+            for name in evicted_entries:
+                del entries[name]
+
+        self._modify(modify)
+
+        if evicted_entries:
+            logger.info(
+                f"Evicted {len(evicted_entries)} entries from the model cache"
+                f" {self._cache_dir}"
+            )
+
+        return evicted_entries
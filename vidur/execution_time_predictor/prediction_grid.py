@@ -0,0 +1,58 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+class PredictionGrid:
+    """The sizes an axis of a prediction table is predicted at.
+
+    Sizes are rounded up to the next point of the grid. Uniform grids map a
+    size to its index arithmetically, others by a binary search.
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.values = np.asarray(values, dtype=np.int64)
+        assert len(self.values) > 0 and (np.diff(self.values) > 0).all()
+
+        self._values_list = self.values.tolist()
+        self._start = self._values_list[0]
+
+        steps = np.unique(np.diff(self.values))
+        self._step = int(steps[0]) if len(steps) == 1 else None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get_index(self, size: int) -> int:
+        # sizes beyond the last point get an index out of the table bounds
+        if self._step is not None:
+            return -(-(size - self._start) // self._step)
+
+        return bisect_left(self._values_list, size)
+
+    def get_indices(self, sizes: np.ndarray) -> np.ndarray:
+        if self._step is not None:
+            return -(-(sizes - self._start) // self._step)
+
+        return np.searchsorted(self.values, sizes, side="left")
+
+
+def get_prediction_grid(
+    min_size: int, max_size: int, step: int, max_relative_step: float
+) -> PredictionGrid:
+    # without a relative step this is a uniform grid, otherwise the step grows
+    # with the size, in multiples of the minimum step, up to the given fraction
+    # of it, so that the points are spaced geometrically beyond step /
+    # max_relative_step while the rounding error stays within that fraction
+    if max_relative_step == 0:
+        return PredictionGrid(np.arange(min_size, max_size + 1, step))
+
+    assert 0 < max_relative_step < 1
+
+    values = [min_size]
+    while values[-1] < max_size:
+        values.append(
+            values[-1] + max(step, int(values[-1] * max_relative_step) // step * step)
+        )
+
+    return PredictionGrid(np.array(values))
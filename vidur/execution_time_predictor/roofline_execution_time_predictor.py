@@ -0,0 +1,437 @@
+import os
+import time
+from math import ceil
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from vidur.config import (
+    BaseReplicaSchedulerConfig,
+    MetricsConfig,
+    ReplicaConfig,
+    RooflineExecutionTimePredictorConfig,
+)
+from vidur.entities import Batch
+from vidur.execution_time_predictor.base_execution_time_predictor import (
+    BaseExecutionTimePredictor,
+    get_input_files,
+)
+from vidur.execution_time_predictor.sklearn_execution_time_predictor import (
+    SklearnExecutionTimePredictor,
+)
+from vidur.logger import init_logger
+from vidur.utils.mfu_calculator import MFUCalculator
+from vidur.utils.param_counter import ParamCounter
+
+logger = init_logger(__name__)
+
+# weights, activations and the kv cache are in fp16
+BYTES_PER_ELEMENT = 2
+
+
+class RooflineExecutionTimePredictor(BaseExecutionTimePredictor):
+    """Predicts the execution times in closed form from the device specs.
+
+    Every operator takes the longer of its compute time at the device FLOPs
+    and its memory time at the device memory bandwidth, plus a fixed launch
+    overhead. It needs no profiling data, which is only read to scale the
+    operator times when calibration is enabled.
+    """
+
+    def __init__(
+        self,
+        predictor_config: RooflineExecutionTimePredictorConfig,
+        replica_config: ReplicaConfig,
+        replica_scheduler_config: BaseReplicaSchedulerConfig,
+        metrics_config: MetricsConfig,
+    ) -> None:
+        super().__init__(
+            predictor_config=predictor_config,
+            replica_config=replica_config,
+            replica_scheduler_config=replica_scheduler_config,
+            metrics_config=metrics_config,
+        )
+
+        self._mfu_calculator = MFUCalculator(replica_config)
+        param_counter = ParamCounter(replica_config)
+
+        tensor_parallel_size = replica_config.tensor_parallel_size
+        head_dim = self._model_config.embedding_dim // self._model_config.num_q_heads
+        embedding_dim = self._model_config.embedding_dim
+        mlp_hidden_dim = self._model_config.mlp_hidden_dim // tensor_parallel_size
+        num_up_projs = 2 if self._model_config.use_gated_mlp else 1
+        self._q_dim = head_dim * self._model_config.num_q_heads // tensor_parallel_size
+        self._kv_dim = head_dim * ceil(
+            self._model_config.num_kv_heads / tensor_parallel_size
+        )
+
+        # number of parameters, input and output dimensions
+        self._linear_ops = {
+            "attn_pre_proj": (
+                param_counter.get_num_attention_pre_proj_parameters(),
+                embedding_dim,
+                self._q_dim + 2 * self._kv_dim,
+            ),
+            "attn_post_proj": (
+                param_counter.get_num_attention_post_proj_parameters(),
+                self._q_dim,
+                embedding_dim,
+            ),
+            "mlp_up_proj": (
+                param_counter.get_num_mlp_up_proj_parameters(),
+                embedding_dim,
+                num_up_projs * mlp_hidden_dim,
+            ),
+            "mlp_down_proj": (
+                param_counter.get_num_mlp_down_proj_parameters(),
+                mlp_hidden_dim,
+                embedding_dim,
+            ),
+        }
+        # number of elements read and written per token
+        self._elementwise_ops = {
+            "mlp_act": (num_up_projs + 1) * mlp_hidden_dim,
+            "input_layernorm": 2 * embedding_dim,
+            "post_attention_layernorm": 2 * embedding_dim,
+            "add": 3 * embedding_dim,
+            "attn_rope": 2 * (self._q_dim + self._kv_dim),
+            "attn_kv_cache_save": 4 * self._kv_dim,
+        }
+
+        device_config = replica_config.device_config
+        # in flops and bytes per ms
+        self._flops_per_ms = (
+            device_config.fp16_tflops * 1e9 * self._config.compute_efficiency
+        )
+        self._memory_bytes_per_ms = (
+            device_config.memory_bandwidth_gb_per_s
+            * 1e6
+            * self._config.memory_bandwidth_efficiency
+        )
+        self._network_bytes_per_ms = self._config.network_bandwidth_gb_per_s * 1e6
+
+        self._input_files = get_input_files(self._config, self._replica_config)
+        self._calibration_factors: Dict[str, float] = {}
+
+        start_time = time.perf_counter()
+        if self._config.calibrate:
+            self._calibrate()
+        self._calibration_time = time.perf_counter() - start_time
+
+    def _get_roofline_time(self, flops, num_bytes):
+        return (
+            np.maximum(
+                flops / self._flops_per_ms, num_bytes / self._memory_bytes_per_ms
+            )
+            + self._config.kernel_launch_overhead_ms
+        )
+
+    def _get_op_time(self, op_name: str, num_tokens):
+        if op_name in self._linear_ops:
+            num_parameters, input_dim, output_dim = self._linear_ops[op_name]
+            op_time = self._get_roofline_time(
+                self._mfu_calculator.get_linear_flops(num_tokens, num_parameters),
+                BYTES_PER_ELEMENT
+                * (num_parameters + num_tokens * (input_dim + output_dim)),
+            )
+        else:
+            op_time = self._get_roofline_time(
+                0, BYTES_PER_ELEMENT * num_tokens * self._elementwise_ops[op_name]
+            )
+
+        return op_time * self._calibration_factors.get(op_name, 1.0)
+
+    def _get_attention_flops_and_bytes(self, num_q_tokens, num_kv_tokens) -> Tuple:
+        # reads q and the kv cache, writes the output
+        return (
+            self._mfu_calculator.get_attention_flops_per_layer(
+                num_q_tokens, num_kv_tokens
+            ),
+            BYTES_PER_ELEMENT
+            * (num_kv_tokens * 2 * self._kv_dim + num_q_tokens * 2 * self._q_dim),
+        )
+
+    def _get_attention_time(self, op_name: str, flops, num_bytes):
+        return self._get_roofline_time(
+            flops, num_bytes
+        ) * self._calibration_factors.get(op_name, 1.0)
+
+    def _get_batch_attention_time(self, op_name: str, batch: Batch) -> float:
+        is_decode = op_name == "attn_decode"
+        flops = 0
+        num_bytes = 0
+
+        for request, num_tokens in zip(batch.requests, batch.num_tokens):
+            if request._is_prefill_complete != is_decode:
+                continue
+
+            request_flops, request_bytes = self._get_attention_flops_and_bytes(
+                num_tokens, request.num_processed_tokens + num_tokens
+            )
+            flops += request_flops
+            num_bytes += request_bytes
+
+        if num_bytes == 0:
+            return 0
+
+        return self._get_attention_time(op_name, flops, num_bytes)
+
+    def _get_all_reduce_time(self, num_tokens):
+        # a ring all reduce sends and receives 2 * (n - 1) / n of the data
+        tensor_parallel_size = self._replica_config.tensor_parallel_size
+        num_bytes = (
+            2
+            * (tensor_parallel_size - 1)
+            / tensor_parallel_size
+            * num_tokens
+            * self._model_config.embedding_dim
+            * BYTES_PER_ELEMENT
+        )
+        return (
+            num_bytes / self._network_bytes_per_ms + self._config.network_latency_ms
+        ) * self._calibration_factors.get("all_reduce", 1.0)
+
+    def _get_send_recv_time(self, num_tokens):
+        num_bytes = num_tokens * self._model_config.embedding_dim * BYTES_PER_ELEMENT
+        return (
+            num_bytes / self._network_bytes_per_ms + self._config.network_latency_ms
+        ) * self._calibration_factors.get("send_recv", 1.0)
+
+    def _read_profiling_data(self, input_file: str) -> Optional[pd.DataFrame]:
+        if not os.path.exists(input_file):
+            logger.warning(f"No profiling data to compare against in {input_file}")
+            return
+
+        return pd.read_csv(input_file).drop_duplicates()
+
+    def _get_profiled_and_roofline_times(
+        self, input_files: Tuple[str, str, str, str, str]
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        # the profiled times of every operator with profiling data, along with
+        # the roofline times of the same points
+        (
+            compute_input_file,
+            attention_input_file,
+            all_reduce_input_file,
+            send_recv_input_file,
+            _,
+        ) = input_files
+        tensor_parallel_size = self._replica_config.tensor_parallel_size
+        times = {}
+
+        compute_df = self._read_profiling_data(compute_input_file)
+        if compute_df is not None:
+            compute_df = compute_df[
+                (compute_df["n_head"] == self._model_config.num_q_heads)
+                & (compute_df["n_kv_head"] == self._model_config.num_kv_heads)
+                & (compute_df["n_embd"] == self._model_config.embedding_dim)
+                & (compute_df["n_expanded_embd"] == self._model_config.mlp_hidden_dim)
+                & (compute_df["use_gated_mlp"] == self._model_config.use_gated_mlp)
+                & (compute_df["vocab_size"] == self._model_config.vocab_size)
+                & (compute_df["num_tensor_parallel_workers"] == tensor_parallel_size)
+            ]
+            for op_name in list(self._linear_ops) + list(self._elementwise_ops):
+                column = f"time_stats.{op_name}.median"
+                if column not in compute_df.columns:
+                    continue
+                times[op_name] = (
+                    compute_df[column].to_numpy(),
+                    self._get_op_time(op_name, compute_df["num_tokens"].to_numpy()),
+                )
+
+        attention_df = self._read_profiling_data(attention_input_file)
+        if attention_df is not None:
+            attention_df = attention_df[
+                (attention_df["n_embd"] == self._model_config.embedding_dim)
+                & (attention_df["n_q_head"] == self._model_config.num_q_heads)
+                & (attention_df["n_kv_head"] == self._model_config.num_kv_heads)
+                & (attention_df["block_size"] == self._block_size)
+                & (attention_df["num_tensor_parallel_workers"] == tensor_parallel_size)
+            ]
+            decode_df = attention_df[attention_df["prefill_chunk_size"] == 0]
+            prefill_df = attention_df[attention_df["prefill_chunk_size"] > 0]
+
+            batch_size = decode_df["batch_size"].to_numpy()
+            flops, num_bytes = self._get_attention_flops_and_bytes(
+                1, decode_df["kv_cache_size"].to_numpy() + 1
+            )
+            times["attn_decode"] = (
+                decode_df["time_stats.attn_decode.median"].to_numpy(),
+                self._get_attention_time(
+                    "attn_decode", batch_size * flops, batch_size * num_bytes
+                ),
+            )
+
+            prefill_chunk_size = prefill_df["prefill_chunk_size"].to_numpy()
+            times["attn_prefill"] = (
+                prefill_df["time_stats.attn_prefill.median"].to_numpy(),
+                self._get_attention_time(
+                    "attn_prefill",
+                    *self._get_attention_flops_and_bytes(
+                        prefill_chunk_size,
+                        prefill_df["kv_cache_size"].to_numpy() + prefill_chunk_size,
+                    ),
+                ),
+            )
+
+            if "time_stats.attn_kv_cache_save.median" in attention_df.columns:
+                times["attn_kv_cache_save"] = (
+                    attention_df["time_stats.attn_kv_cache_save.median"].to_numpy(),
+                    self._get_op_time(
+                        "attn_kv_cache_save",
+                        attention_df[["prefill_chunk_size", "batch_size"]]
+                        .max(axis=1)
+                        .to_numpy(),
+                    ),
+                )
+
+        if tensor_parallel_size > 1:
+            all_reduce_df = self._read_profiling_data(all_reduce_input_file)
+            if all_reduce_df is not None:
+                all_reduce_df = all_reduce_df[
+                    (all_reduce_df["num_workers"] == tensor_parallel_size)
+                    & (all_reduce_df["devices_per_node"] == tensor_parallel_size)
+                    & (all_reduce_df["collective"] == "all_reduce")
+                ]
+                times["all_reduce"] = (
+                    all_reduce_df["time_stats.all_reduce.median"].to_numpy(),
+                    self._get_all_reduce_time(
+                        all_reduce_df["size"].to_numpy()
+                        / self._model_config.embedding_dim
+                        / BYTES_PER_ELEMENT
+                    ),
+                )
+
+        if self._replica_config.num_pipeline_stages > 1:
+            send_recv_df = self._read_profiling_data(send_recv_input_file)
+            if send_recv_df is not None:
+                num_workers = (
+                    self._replica_config.num_pipeline_stages * tensor_parallel_size
+                )
+                is_multi_node = (
+                    num_workers > self._replica_config.node_config.num_devices_per_node
+                )
+                send_recv_df = send_recv_df[
+                    (send_recv_df["collective"] == "send_recv")
+                    & (send_recv_df["devices_per_node"] == (1 if is_multi_node else 2))
+                ]
+                times["send_recv"] = (
+                    send_recv_df["time_stats.send_recv.median"].to_numpy(),
+                    self._get_send_recv_time(
+                        send_recv_df["size"].to_numpy()
+                        / self._model_config.embedding_dim
+                        / BYTES_PER_ELEMENT
+                    ),
+                )
+
+        return times
+
+    def _calibrate(self) -> None:
+        # every operator is scaled by the median ratio of its profiled time to
+        # its roofline time, operators without profiling data are left as is
+        for op_name, (
+            profiled_time,
+            roofline_time,
+        ) in self._get_profiled_and_roofline_times(self._input_files).items():
+            is_valid = profiled_time > 0
+            if not is_valid.any():
+                continue
+
+            factor = float(np.median(profiled_time[is_valid] / roofline_time[is_valid]))
+            self._calibration_factors[op_name] = factor
+
+            logger.info(
+                f"Calibrated {op_name} by a factor of {factor:.3f}"
+                f" over {is_valid.sum()} profiled points"
+            )
+
+    def get_startup_stats(self) -> dict:
+        return {
+            "training_time": self._calibration_time,
+            "prediction_time": 0,
+            "prediction_table_bytes": 0,
+        }
+
+    def get_model_errors(
+        self, input_files: Optional[Tuple[str, str, str, str, str]] = None
+    ) -> Dict[str, float]:
+        # mean absolute percentage error of every operator against the
+        # profiling data of the predictor, or of the given input files
+        return {
+            op_name: SklearnExecutionTimePredictor.mean_absolute_percentage_error(
+                profiled_time, roofline_time
+            )
+            for op_name, (
+                profiled_time,
+                roofline_time,
+            ) in self._get_profiled_and_roofline_times(
+                input_files or self._input_files
+            ).items()
+        }
+
+    def _get_attention_layer_pre_proj_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("attn_pre_proj", batch.total_num_tokens)
+
+    def _get_attention_layer_post_proj_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("attn_post_proj", batch.total_num_tokens)
+
+    def _get_attention_rope_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("attn_rope", batch.total_num_tokens)
+
+    def _get_attention_kv_cache_save_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("attn_kv_cache_save", batch.total_num_tokens)
+
+    def _get_attention_decode_execution_time(self, batch: Batch) -> float:
+        return self._get_batch_attention_time("attn_decode", batch)
+
+    def _get_attention_prefill_execution_time(self, batch: Batch) -> float:
+        return self._get_batch_attention_time("attn_prefill", batch)
+
+    def _get_mlp_layer_up_proj_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("mlp_up_proj", batch.total_num_tokens)
+
+    def _get_mlp_layer_down_proj_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("mlp_down_proj", batch.total_num_tokens)
+
+    def _get_mlp_layer_act_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("mlp_act", batch.total_num_tokens)
+
+    def _get_attn_norm_layer_act_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("input_layernorm", batch.total_num_tokens)
+
+    def _get_mlp_norm_layer_act_execution_time(self, batch: Batch) -> float:
+        if not self._model_config.post_attn_norm:
+            return 0
+
+        return self._get_op_time("post_attention_layernorm", batch.total_num_tokens)
+
+    def _get_add_layer_act_execution_time(self, batch: Batch) -> float:
+        return self._get_op_time("add", batch.total_num_tokens)
+
+    def _get_tensor_parallel_communication_time(self, batch: Batch) -> float:
+        return (
+            self._get_all_reduce_time(batch.total_num_tokens)
+            + self._config.nccl_cpu_launch_overhead_ms
+            + self._config.nccl_cpu_skew_overhead_per_device_ms
+            * self._replica_config.tensor_parallel_size**1.25
+        )
+
+    def _get_pipeline_parallel_communication_time(self, batch: Batch) -> float:
+        return self._get_send_recv_time(batch.total_num_tokens)
+
+    # the cpu overheads depend on the serving framework and are not modeled
+    def _get_schedule_time(self, batch: Batch) -> float:
+        return 0
+
+    def _get_sampler_e2e_time(self, batch: Batch) -> float:
+        return 0
+
+    def _get_prepare_inputs_e2e_time(self, batch: Batch) -> float:
+        return 0
+
+    def _get_process_model_outputs_time(self, batch: Batch) -> float:
+        return 0
+
+    def _get_ray_comm_time(self, batch: Batch) -> float:
+        return 0
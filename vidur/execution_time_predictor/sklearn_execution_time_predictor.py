@@ -1,13 +1,16 @@
 import hashlib
+import json
 import os
 import pickle
+import time
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from itertools import product
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from fasteners import InterProcessReaderWriterLock
 from sklearn.base import BaseEstimator
 from sklearn.metrics import make_scorer
 from sklearn.model_selection import GridSearchCV
@@ -21,12 +24,61 @@ from vidur.config import (
 from vidur.entities import Batch
 from vidur.execution_time_predictor.base_execution_time_predictor import (
     BaseExecutionTimePredictor,
+    get_input_files,
 )
+from vidur.execution_time_predictor.execution_times import ExecutionTimes
+from vidur.execution_time_predictor.lazy_prediction_table import LazyPredictionTable
+from vidur.execution_time_predictor.model_cache_manifest import (
+    ModelCacheManifest,
+    atomic_open,
+)
+from vidur.execution_time_predictor.prediction_grid import get_prediction_grid
 from vidur.logger import init_logger
 
 logger = init_logger(__name__)
 
 
+@dataclass
+class ModelTrainingJob:
+    model_name: str
+    model_hash: str
+    df: pd.DataFrame
+    feature_cols: List[str]
+    target_col: str
+
+
+def _fit_model(
+    estimator: BaseEstimator,
+    param_grid: Dict[str, Any],
+    scorer: Any,
+    cv: int,
+    n_jobs: int,
+    X: pd.DataFrame,
+    y: pd.Series,
+) -> Tuple[BaseEstimator, Dict[str, Any], float, float]:
+    start_time = time.perf_counter()
+
+    grid_search = GridSearchCV(
+        estimator=estimator,
+        param_grid=param_grid,
+        scoring=scorer,
+        cv=cv,
+        n_jobs=n_jobs,
+    )
+
+    # we don't create a train/test split, because we want to use all data for training
+    # and we don't care about overfitting, because we only want to predict execution time within the same domain
+    grid_search.fit(X, y)
+    score = grid_search.score(X, y)
+
+    return (
+        grid_search.best_estimator_,
+        grid_search.best_params_,
+        score,
+        time.perf_counter() - start_time,
+    )
+
+
 class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
     def __init__(
         self,
@@ -62,6 +114,20 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         else:
             self._max_tokens = self._config.prediction_max_tokens_per_request
 
+        # the attention tables are indexed by the points of these grids
+        self._kv_cache_grid = get_prediction_grid(
+            0,
+            self._config.prediction_max_tokens_per_request,
+            self._config.kv_cache_prediction_granularity,
+            self._config.prediction_grid_max_relative_step,
+        )
+        self._prefill_chunk_size_grid = get_prediction_grid(
+            1,
+            self._config.prediction_max_prefill_chunk_size,
+            1,
+            self._config.prediction_grid_max_relative_step,
+        )
+
         num_workers = (
             self._replica_config.num_pipeline_stages
             * self._replica_config.tensor_parallel_size
@@ -79,29 +145,27 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             self._all_reduce_input_file,
             self._send_recv_input_file,
             self._cpu_overhead_input_file,
-        ) = self._get_input_files()
+        ) = get_input_files(self._config, self._replica_config)
+
+        self._model_cache_manifest = ModelCacheManifest(self._cache_dir)
+        self._cache_max_bytes = metrics_config.cache_max_bytes
+        # the files and provenance of the cached models and prediction tables
+        self._cache_entries: Dict[str, Tuple[List[str], dict]] = {}
 
+        start_time = time.perf_counter()
         self._models = self._train_models()
+        self._training_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
         self._predictions = self._predict_from_models()
+        self._prediction_time = time.perf_counter() - start_time
 
-    def _get_input_files(self) -> Tuple[str, str, str, str, str]:
-        input_files = [
-            self._config.compute_input_file,
-            self._config.attention_input_file,
-            self._config.all_reduce_input_file,
-            self._config.send_recv_input_file,
-            self._config.cpu_overhead_input_file,
-        ]
-        for i in range(len(input_files)):
-            input_files[i] = (
-                input_files[i]
-                .replace("{DEVICE}", self._replica_config.device)
-                .replace("{MODEL}", self._model_config.get_name())
-                .replace("{NETWORK_DEVICE}", self._replica_config.network_device)
+        self._model_cache_manifest.touch_entries(self._cache_entries)
+        if self._cache_max_bytes is not None:
+            self._model_cache_manifest.evict(
+                self._cache_max_bytes, keep=self._cache_entries
             )
 
-        return tuple(input_files)
-
     def _load_compute_df(self, file_path: str) -> pd.DataFrame:
         df = self._read_input_file(file_path)
         df = df.drop_duplicates()
@@ -289,30 +353,73 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
 
         return hashlib.md5(combined_str.encode("utf-8")).hexdigest()[0:8]
 
+    def _get_training_model_hash(
+        self,
+        model_name: str,
+        df: pd.DataFrame,
+        input_file: str,
+        feature_cols: List[str],
+        target_col: str,
+    ) -> str:
+        # hashing the training data is slow, the model hash derived from it is
+        # looked up by a fingerprint of the input file and the config instead
+        fingerprint_str = (
+            f"{self.to_dict()}_{model_name}_{feature_cols}_{target_col}"
+            f"_{self._model_config.get_name()}_{self._is_multi_node}"
+            f"_{self._model_cache_manifest.get_file_hash(input_file)}"
+        )
+        fingerprint = hashlib.md5(fingerprint_str.encode("utf-8")).hexdigest()
+
+        model_hash = self._model_cache_manifest.get_model_hash(fingerprint)
+        if model_hash is None:
+            model_hash = self._get_model_hash(model_name, df)
+            self._model_cache_manifest.set_model_hash(fingerprint, model_hash)
+
+        return model_hash
+
+    def _get_model_cache_files(
+        self, model_name: str, model_hash: str
+    ) -> Tuple[str, str]:
+        prefix = f"{self._cache_dir}/{model_name}_{model_hash}"
+        return f"{prefix}.pkl", f"{prefix}_training_predictions.csv"
+
+    def _add_cache_entry(
+        self, name: str, model_name: str, cache_files: Tuple[str, ...]
+    ) -> None:
+        self._cache_entries[name] = (
+            list(cache_files),
+            {
+                "predictor": str(self._config.get_type()),
+                "model": self._replica_config.model_name,
+                "device": self._replica_config.device,
+                "network_device": self._replica_config.network_device,
+                "tensor_parallel_size": self._replica_config.tensor_parallel_size,
+                "num_pipeline_stages": self._replica_config.num_pipeline_stages,
+                "operation": model_name,
+            },
+        )
+
     def _load_model_from_cache(self, model_name: str, model_hash: str) -> BaseEstimator:
-        with InterProcessReaderWriterLock(
-            f"{self._cache_dir}/{model_hash}_model_lock.file"
-        ).read_lock():
-            if self._config.no_cache:
-                return
-            # check if model is in cache
-            cache_file = f"{self._cache_dir}/{model_name}_{model_hash}.pkl"
-            if not os.path.exists(cache_file):
-                return
+        if self._config.no_cache:
+            return
 
-            logger.debug(f"Found model {model_name} in cache")
-            model = pickle.load(open(cache_file, "rb"))
-            return model
+        cache_file, _ = self._get_model_cache_files(model_name, model_hash)
+        # the files are replaced atomically, but can be evicted at any time
+        try:
+            with open(cache_file, "rb") as f:
+                model = pickle.load(f)
+        except FileNotFoundError:
+            return
+
+        logger.debug(f"Found model {model_name} in cache")
+        return model
 
     def _store_model_in_cache(
         self, model_name: str, model_hash: str, model: BaseEstimator
     ) -> None:
-        with InterProcessReaderWriterLock(
-            f"{self._cache_dir}/{model_hash}_model_lock.file"
-        ).write_lock():
-            # store model in cache
-            cache_file = f"{self._cache_dir}/{model_name}_{model_hash}.pkl"
-            pickle.dump(model, open(cache_file, "wb"), protocol=pickle.HIGHEST_PROTOCOL)
+        cache_file, _ = self._get_model_cache_files(model_name, model_hash)
+        with atomic_open(cache_file, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     def _store_training_prediction_data(
         self,
@@ -329,130 +436,252 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         df["prediction"] = model.predict(df[feature_cols])
 
         # store the prediction data
-        df[feature_cols + [target_col, "prediction"]].to_csv(
-            f"{self._cache_dir}/{model_name}_{model_hash}_training_predictions.csv",
-            index=False,
+        _, training_predictions_file = self._get_model_cache_files(
+            model_name, model_hash
         )
+        with atomic_open(training_predictions_file) as f:
+            df[feature_cols + [target_col, "prediction"]].to_csv(f, index=False)
 
-    def _train_model(
+    def _get_training_job(
         self,
         model_name: str,
         df: pd.DataFrame,
+        input_file: str,
         feature_cols: List[str],
         target_col: str,
-    ) -> BaseEstimator:
+    ) -> ModelTrainingJob:
         if len(df) == 0:
             raise Exception(f"Training data for model {model_name} is empty")
 
-        model_hash = self._get_model_hash(model_name, df)
+        logger.debug(f"Size of training data for model {model_name}: {len(df)}")
 
-        cached_model = self._load_model_from_cache(model_name, model_hash)
-        if cached_model:
-            return cached_model
+        model_hash = self._get_training_model_hash(
+            model_name, df, input_file, feature_cols, target_col
+        )
+
+        return ModelTrainingJob(model_name, model_hash, df, feature_cols, target_col)
 
-        model = self._get_estimator()
-        grid_search_params = self._get_grid_search_params()
+    def _get_num_training_cores(self) -> int:
+        # negative values count back from the number of cores, as in joblib
+        num_cores = os.cpu_count() or 1
+        if self._config.num_training_job_threads < 0:
+            return max(1, num_cores + 1 + self._config.num_training_job_threads)
+        return max(1, self._config.num_training_job_threads)
 
-        if len(df) < self._config.k_fold_cv_splits:
+    def _get_fit_args(self, training_job: ModelTrainingJob, n_jobs: int) -> tuple:
+        if len(training_job.df) < self._config.k_fold_cv_splits:
             cv = 2
         else:
             cv = self._config.k_fold_cv_splits
 
-        grid_search = GridSearchCV(
-            estimator=model,
-            param_grid=grid_search_params,
-            scoring=self._get_scorer(),
-            cv=cv,
-            n_jobs=self._config.num_training_job_threads,
+        return (
+            self._get_estimator(),
+            self._get_grid_search_params(),
+            self._get_scorer(),
+            cv,
+            n_jobs,
+            training_job.df[training_job.feature_cols],
+            training_job.df[training_job.target_col],
         )
 
-        # we don't create a train/test split, because we want to use all data for training
-        # and we don't care about overfitting, because we only want to predict execution time within the same domain
-        X, y = df[feature_cols], df[target_col]
+    def _fit_models(
+        self, training_jobs: List[ModelTrainingJob]
+    ) -> Dict[str, BaseEstimator]:
+        # the models are trained concurrently, the cores are split evenly
+        # between them and each model uses its share for its grid search
+        num_cores = self._get_num_training_cores()
+        num_workers = min(len(training_jobs), num_cores)
+        n_jobs = max(1, num_cores // num_workers)
 
-        grid_search.fit(X, y)
-        score = grid_search.score(X, y)
+        logger.info(
+            f"Training {len(training_jobs)} models with {num_workers} workers"
+            f" and {n_jobs} cores per model"
+        )
+
+        models = {}
+
+        if num_workers == 1:
+            for training_job in training_jobs:
+                models[training_job.model_name] = self._on_model_fit(
+                    training_job,
+                    _fit_model(*self._get_fit_args(training_job, n_jobs)),
+                    len(models) + 1,
+                    len(training_jobs),
+                )
+            return models
+
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {
+                executor.submit(
+                    _fit_model, *self._get_fit_args(training_job, n_jobs)
+                ): training_job
+                for training_job in training_jobs
+            }
+            for future in as_completed(futures):
+                training_job = futures[future]
+                models[training_job.model_name] = self._on_model_fit(
+                    training_job,
+                    future.result(),
+                    len(models) + 1,
+                    len(training_jobs),
+                )
+
+        return models
+
+    def _on_model_fit(
+        self,
+        training_job: ModelTrainingJob,
+        fit_result: Tuple[BaseEstimator, Dict[str, Any], float, float],
+        num_trained_models: int,
+        num_models: int,
+    ) -> BaseEstimator:
+        model, best_params, score, fit_time = fit_result
 
         logger.info(
-            f"Trained model {model_name} and found best parameters: {grid_search.best_params_} "
+            f"Trained model {training_job.model_name} ({num_trained_models}/{num_models})"
+            f" in {fit_time:.1f}s and found best parameters: {best_params} "
             f"with mean absolute percentage error (MEAP) {-score}%"
         )
 
-        self._store_model_in_cache(model_name, model_hash, grid_search.best_estimator_)
+        self._store_model_in_cache(
+            training_job.model_name, training_job.model_hash, model
+        )
 
         self._store_training_prediction_data(
-            model_name=model_name,
-            model_hash=model_hash,
-            df=df,
-            feature_cols=feature_cols,
-            target_col=target_col,
-            model=grid_search.best_estimator_,
+            model_name=training_job.model_name,
+            model_hash=training_job.model_hash,
+            df=training_job.df,
+            feature_cols=training_job.feature_cols,
+            target_col=training_job.target_col,
+            model=model,
         )
-        return grid_search.best_estimator_
+        return model
+
+    def _get_prediction_cache_files(
+        self, model_name: str, model_hash: str
+    ) -> Tuple[str, str, str]:
+        prefix = f"{self._cache_dir}/{model_name}_{model_hash}_predictions"
+        return f"{prefix}.npy", f"{prefix}.json", f"{prefix}.csv"
 
     def _store_model_predication_cache(
-        self, model_name: str, model_hash: str, predictions: Dict[Tuple, float]
+        self,
+        model_name: str,
+        model_hash: str,
+        predictions: np.ndarray,
+        X: pd.DataFrame,
     ) -> None:
-        with InterProcessReaderWriterLock(
-            f"{self._cache_dir}/{model_hash}_prediction_lock.file"
-        ).write_lock():
-            cache_file = f"{self._cache_dir}/{model_name}_{model_hash}_predictions.pkl"
-            pickle.dump(
-                predictions, open(cache_file, "wb"), protocol=pickle.HIGHEST_PROTOCOL
+        cache_file, manifest_file, csv_file = self._get_prediction_cache_files(
+            model_name, model_hash
+        )
+        # processes which have the previous file mapped keep reading their copy
+        with atomic_open(cache_file, "wb") as f:
+            np.save(f, predictions)
+
+        with atomic_open(manifest_file) as f:
+            json.dump(
+                {
+                    "model_name": model_name,
+                    "model_hash": model_hash,
+                    "shape": list(predictions.shape),
+                    "dtype": str(predictions.dtype),
+                    "prediction_grid_max_relative_step": self._config.prediction_grid_max_relative_step,
+                },
+                f,
             )
 
+        with atomic_open(csv_file) as f:
+            X.to_csv(f, index=False)
+
     def _load_model_predication_cache(
-        self, model_name: str, model_hash: str
-    ) -> Dict[Tuple, float]:
-        with InterProcessReaderWriterLock(
-            f"{self._cache_dir}/{model_hash}_prediction_lock.file"
-        ).read_lock():
-            if self._config.no_cache:
-                return
-            cache_file = f"{self._cache_dir}/{model_name}_{model_hash}_predictions.pkl"
+        self, model_name: str, model_hash: str, shape: Tuple[int, ...]
+    ) -> Optional[np.ndarray]:
+        if self._config.no_cache:
+            return
+        cache_file, manifest_file, _ = self._get_prediction_cache_files(
+            model_name, model_hash
+        )
+
+        # the files are replaced atomically, but can be evicted at any time
+        try:
+            with open(manifest_file) as f:
+                manifest = json.load(f)
 
-            if not os.path.exists(cache_file):
+            # not every setting of the prediction grid is part of the hash
+            if tuple(manifest["shape"]) != shape:
+                return
+            max_relative_step = manifest.get("prediction_grid_max_relative_step", 0.0)
+            if max_relative_step != self._config.prediction_grid_max_relative_step:
                 return
 
-            logger.debug(f"Found model {model_name} predictions in cache")
+            # the tables are only read, mapping them lets all the simulations
+            # on a node share the page cache copy instead of a private one, the
+            # plain ndarray view keeps the mapping without the slower memmap
+            # indexing on every lookup
+            predictions = np.load(cache_file, mmap_mode="r").view(np.ndarray)
+        except FileNotFoundError:
+            return
 
-            predictions = pickle.load(open(cache_file, "rb"))
-            return predictions
+        # the table may have been replaced since the manifest was read
+        if predictions.shape != shape:
+            return
+
+        logger.debug(f"Found model {model_name} predictions in cache")
+        return predictions
 
     def _get_model_prediction(
-        self, model_name: str, model: BaseEstimator, X: pd.DataFrame
-    ) -> Dict[Tuple, float]:
+        self,
+        model_name: str,
+        model: BaseEstimator,
+        X: pd.DataFrame,
+        shape: Tuple[int, ...],
+        padding: Tuple[int, ...],
+    ) -> np.ndarray:
+        # the predictions are made over a dense grid of the given shape, some of
+        # its axes start at 1 and are padded with nan so that the table is
+        # indexed by the raw value
         X = X.copy()
 
         model_hash = self._get_model_hash(model, df=None)
+        table_shape = tuple(
+            size + num_padding for size, num_padding in zip(shape, padding)
+        )
+        self._add_cache_entry(
+            f"{model_name}_{model_hash}_predictions",
+            model_name,
+            self._get_prediction_cache_files(model_name, model_hash),
+        )
 
-        cached_predictions = self._load_model_predication_cache(model_name, model_hash)
-        if cached_predictions:
+        cached_predictions = self._load_model_predication_cache(
+            model_name, model_hash, table_shape
+        )
+        if cached_predictions is not None:
             return cached_predictions
 
         logger.info(f"Predicting execution time for model {model_name}")
 
         predictions_array = model.predict(X)
-
-        # turn this into a dict, so we can store use it as a cache
-        # the key is tuple for each row of X
-        predictions = dict(zip([tuple(x) for x in X.values], predictions_array))
-
-        self._store_model_predication_cache(model_name, model_hash, predictions)
+        predictions = np.pad(
+            predictions_array.reshape(shape),
+            [(num_padding, 0) for num_padding in padding],
+            constant_values=np.nan,
+        )
 
         X["prediction"] = predictions_array
-        X.to_csv(
-            f"{self._cache_dir}/{model_name}_{model_hash}_predictions.csv",
-            index=False,
-        )
+        self._store_model_predication_cache(model_name, model_hash, predictions, X)
 
         return predictions
 
-    def _train_compute_models(self) -> Dict[str, BaseEstimator]:
-        compute_df = self._load_compute_df(self._compute_input_file)
+    def _get_compute_training_jobs(
+        self,
+        compute_input_file: str,
+        attention_input_file: str,
+        all_reduce_input_file: str,
+        send_recv_input_file: str,
+    ) -> Dict[str, ModelTrainingJob]:
+        compute_df = self._load_compute_df(compute_input_file)
         compute_df = self._get_compute_df_with_derived_features(compute_df)
 
-        models = {}
+        training_jobs = {}
         model_names = [
             "attn_pre_proj",
             "attn_post_proj",
@@ -466,17 +695,15 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         ]
 
         for model_name in model_names:
-            logger.debug(
-                f"Training model {model_name}, size of training data: {len(compute_df)}"
-            )
-            models[model_name] = self._train_model(
+            training_jobs[model_name] = self._get_training_job(
                 model_name=model_name,
                 df=compute_df,
+                input_file=compute_input_file,
                 feature_cols=["num_tokens"],
                 target_col=f"time_stats.{model_name}.median",
             )
 
-        attention_df = self._load_attention_df(self._attention_input_file)
+        attention_df = self._load_attention_df(attention_input_file)
         attention_df = self._get_attention_df_with_derived_features(attention_df)
 
         model_names = [
@@ -484,42 +711,47 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         ]
 
         for model_name in model_names:
-            models[model_name] = self._train_model(
+            training_jobs[model_name] = self._get_training_job(
                 model_name=model_name,
                 df=attention_df,
+                input_file=attention_input_file,
                 feature_cols=["num_tokens"],
                 target_col=f"time_stats.{model_name}.median",
             )
 
         if self._replica_config.num_pipeline_stages > 1:
-            send_recv_df = self._load_send_recv_df(self._send_recv_input_file)
+            send_recv_df = self._load_send_recv_df(send_recv_input_file)
             send_recv_df = self._get_send_recv_df_with_derived_features(send_recv_df)
 
-            models["send_recv"] = self._train_model(
+            training_jobs["send_recv"] = self._get_training_job(
                 model_name="send_recv",
                 df=send_recv_df,
+                input_file=send_recv_input_file,
                 feature_cols=["num_tokens"],
                 target_col="time_stats.send_recv.median",
             )
 
         if self._replica_config.tensor_parallel_size > 1:
-            all_reduce_df = self._load_all_reduce_df(self._all_reduce_input_file)
+            all_reduce_df = self._load_all_reduce_df(all_reduce_input_file)
             all_reduce_df = self._get_all_reduce_df_with_derived_features(all_reduce_df)
 
-            models["all_reduce"] = self._train_model(
+            training_jobs["all_reduce"] = self._get_training_job(
                 model_name="all_reduce",
                 df=all_reduce_df,
+                input_file=all_reduce_input_file,
                 feature_cols=["num_tokens"],
                 target_col="time_stats.all_reduce.median",
             )
 
-        return models
+        return training_jobs
 
-    def _train_cpu_overhead_models(self) -> Dict[str, BaseEstimator]:
+    def _get_cpu_overhead_training_jobs(
+        self, cpu_overhead_input_file: str
+    ) -> Dict[str, ModelTrainingJob]:
         if self._config.skip_cpu_overhead_modeling:
             return {}
 
-        models = {}
+        training_jobs = {}
         model_names = [
             "schedule",
             "sampler_e2e",
@@ -528,7 +760,7 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             "ray_comm_time",
         ]
 
-        cpu_overhead_df = self._load_cpu_overhead_df(self._cpu_overhead_input_file)
+        cpu_overhead_df = self._load_cpu_overhead_df(cpu_overhead_input_file)
         cpu_overhead_df = self._get_cpu_overhead_df_with_derived_features(
             cpu_overhead_df
         )
@@ -539,22 +771,25 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             else:
                 target_col = f"{model_name}_median"
 
-            models[model_name] = self._train_model(
+            training_jobs[model_name] = self._get_training_job(
                 model_name=model_name,
                 df=cpu_overhead_df,
+                input_file=cpu_overhead_input_file,
                 feature_cols=["batch_size"],
                 target_col=target_col,
             )
 
-        return models
+        return training_jobs
 
-    def _train_attention_layer_models(self) -> Dict[str, BaseEstimator]:
-        attention_df = self._load_attention_df(self._attention_input_file)
+    def _get_attention_layer_training_jobs(
+        self, attention_input_file: str
+    ) -> Dict[str, ModelTrainingJob]:
+        attention_df = self._load_attention_df(attention_input_file)
         attention_df = self._get_attention_df_with_derived_features(attention_df)
         prefill_df = attention_df[~attention_df["is_decode"]]
         decode_df = attention_df[attention_df["is_decode"]]
 
-        models = {}
+        training_jobs = {}
 
         chunked_prefill_df = prefill_df[prefill_df["kv_cache_size"] > 0].copy()
         chunked_prefill_df["total_prefill_tokens"] = (
@@ -562,26 +797,83 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             + chunked_prefill_df["prefill_chunk_size"]
         )
 
-        models["attn_prefill"] = self._train_model(
+        training_jobs["attn_prefill"] = self._get_training_job(
             model_name="attn_prefill",
             df=prefill_df,
+            input_file=attention_input_file,
             feature_cols=["kv_cache_size", "prefill_chunk_size_squared"],
             target_col="time_stats.attn_prefill.median",
         )
 
-        models["attn_decode"] = self._train_model(
+        training_jobs["attn_decode"] = self._get_training_job(
             model_name="attn_decode",
             df=decode_df,
+            input_file=attention_input_file,
             feature_cols=["batch_size", "kv_cache_size"],
             target_col="time_stats.attn_decode.median",
         )
 
-        return models
+        return training_jobs
+
+    def _get_training_jobs(
+        self, input_files: Optional[Tuple[str, str, str, str, str]] = None
+    ) -> Dict[str, ModelTrainingJob]:
+        # the compute, attention, all reduce, send recv and cpu overhead input
+        # files, the profiling data of the replica by default
+        if input_files is None:
+            input_files = (
+                self._compute_input_file,
+                self._attention_input_file,
+                self._all_reduce_input_file,
+                self._send_recv_input_file,
+                self._cpu_overhead_input_file,
+            )
+
+        (
+            compute_input_file,
+            attention_input_file,
+            all_reduce_input_file,
+            send_recv_input_file,
+            cpu_overhead_input_file,
+        ) = input_files
+
+        training_jobs = self._get_compute_training_jobs(
+            compute_input_file,
+            attention_input_file,
+            all_reduce_input_file,
+            send_recv_input_file,
+        )
+        training_jobs.update(
+            self._get_cpu_overhead_training_jobs(cpu_overhead_input_file)
+        )
+        training_jobs.update(
+            self._get_attention_layer_training_jobs(attention_input_file)
+        )
+        return training_jobs
 
     def _train_models(self) -> Dict[str, BaseEstimator]:
-        models = self._train_compute_models()
-        models.update(self._train_cpu_overhead_models())
-        models.update(self._train_attention_layer_models())
+        training_jobs = self._get_training_jobs()
+
+        models = {}
+        pending_training_jobs = []
+        for model_name, training_job in training_jobs.items():
+            cached_model = self._load_model_from_cache(
+                model_name, training_job.model_hash
+            )
+            if cached_model:
+                models[model_name] = cached_model
+            else:
+                pending_training_jobs.append(training_job)
+
+        if pending_training_jobs:
+            models.update(self._fit_models(pending_training_jobs))
+
+        for model_name, training_job in training_jobs.items():
+            self._add_cache_entry(
+                f"{model_name}_{training_job.model_hash}",
+                model_name,
+                self._get_model_cache_files(model_name, training_job.model_hash),
+            )
 
         return models
 
@@ -610,9 +902,12 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         num_token_range = np.arange(1, self._max_tokens + 1)
         X = pd.DataFrame({"num_tokens": num_token_range})
 
+        # indexed by the number of tokens
         for model_name in model_names:
             model = self._models[model_name]
-            predictions[model_name] = self._get_model_prediction(model_name, model, X)
+            predictions[model_name] = self._get_model_prediction(
+                model_name, model, X, (len(num_token_range),), (1,)
+            )
 
         return predictions
 
@@ -633,23 +928,63 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         batch_size_range = np.arange(1, self._config.prediction_max_batch_size + 1)
         X = pd.DataFrame({"batch_size": batch_size_range})
 
+        # indexed by the batch size
         for model_name in model_names:
             model = self._models[model_name]
-            predictions[model_name] = self._get_model_prediction(model_name, model, X)
+            predictions[model_name] = self._get_model_prediction(
+                model_name, model, X, (len(batch_size_range),), (1,)
+            )
 
         return predictions
 
+    def _get_attention_decode_features(self, indices: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "batch_size": indices[:, 0],
+                "kv_cache_size": self._kv_cache_grid.values[indices[:, 1]],
+            }
+        )
+
+    def _get_attention_prefill_features(self, indices: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "kv_cache_size": self._kv_cache_grid.values[indices[:, 0]],
+                "prefill_chunk_size_squared": self._prefill_chunk_size_grid.values[
+                    indices[:, 1]
+                ]
+                ** 2,
+            }
+        )
+
+    def _get_lazy_attention_layer_predictions(self) -> Dict[str, Any]:
+        return {
+            "attn_prefill": LazyPredictionTable(
+                self._models["attn_prefill"],
+                self._get_attention_prefill_features,
+                (len(self._kv_cache_grid), len(self._prefill_chunk_size_grid)),
+                self._config.lazy_prediction_cache_size,
+            ),
+            "attn_decode": LazyPredictionTable(
+                self._models["attn_decode"],
+                self._get_attention_decode_features,
+                (
+                    self._config.prediction_max_batch_size + 1,
+                    len(self._kv_cache_grid),
+                ),
+                self._config.lazy_prediction_cache_size,
+            ),
+        }
+
     def _predict_for_attention_layer_models(self) -> Dict[str, Any]:
+        if self._config.lazy_prediction:
+            return self._get_lazy_attention_layer_predictions()
+
         predictions = {}
 
         decode_batch_size_range = np.arange(
             1, self._config.prediction_max_batch_size + 1
         )
-        decode_kv_cache_size_range = np.arange(
-            0,
-            self._config.prediction_max_tokens_per_request + 1,
-            self._config.kv_cache_prediction_granularity,
-        )
+        decode_kv_cache_size_range = self._kv_cache_grid.values
         decode_prefill_chunk_size_range = [0]
         decode_batch_size, decode_kv_cache_size, decode_prefill_chunk_size = zip(
             *product(
@@ -660,14 +995,8 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
         )
 
         prefill_batch_size_range = [1]
-        prefill_kv_cache_size_range = np.arange(
-            0,
-            self._config.prediction_max_tokens_per_request + 1,
-            self._config.kv_cache_prediction_granularity,
-        )
-        prefill_prefill_chunk_size_range = np.arange(
-            1, self._config.prediction_max_prefill_chunk_size + 1
-        )
+        prefill_kv_cache_size_range = self._kv_cache_grid.values
+        prefill_prefill_chunk_size_range = self._prefill_chunk_size_grid.values
         prefill_batch_size, prefill_kv_cache_size, prefill_prefill_chunk_size = zip(
             *product(
                 prefill_batch_size_range,
@@ -701,16 +1030,22 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             + chunked_prefill_df["prefill_chunk_size"]
         )
 
+        # indexed by the kv cache size and prefill chunk size grid points
         predictions["attn_prefill"] = self._get_model_prediction(
             "attn_prefill",
             self._models["attn_prefill"],
             prefill_df[["kv_cache_size", "prefill_chunk_size_squared"]],
+            (len(prefill_kv_cache_size_range), len(prefill_prefill_chunk_size_range)),
+            (0, 0),
         )
 
+        # indexed by the batch size and the kv cache size grid point
         predictions["attn_decode"] = self._get_model_prediction(
             "attn_decode",
             self._models["attn_decode"],
             decode_df[["batch_size", "kv_cache_size"]],
+            (len(decode_batch_size_range), len(decode_kv_cache_size_range)),
+            (1, 0),
         )
 
         return predictions
@@ -779,38 +1114,216 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
 
         return prefill_params
 
+    def _get_batch_signature(
+        self, batch: Batch, pipeline_stage: int
+    ) -> Tuple[Any, ...]:
+        # every prediction is looked up with a subset of these keys, the rounded
+        # token count used by most of the layers is derived from the exact one
+        decode_batch_size, decode_avg_kv_cache_size = (
+            self._get_batch_decode_attention_params(batch)
+        )
+        (
+            agg_kv_cache_size,
+            agg_prefill_chunk_size,
+            num_prefills,
+        ) = self._get_batch_prefill_attention_agg_params(batch)
+
+        return (
+            batch._total_num_tokens,
+            decode_batch_size,
+            decode_avg_kv_cache_size,
+            agg_kv_cache_size,
+            agg_prefill_chunk_size,
+            min(num_prefills, 2),
+            0 if self._config.skip_cpu_overhead_modeling else batch.size,
+            pipeline_stage == self._replica_config.num_pipeline_stages - 1,
+        )
+
+    def _get_batch_attention_indices(
+        self, batches: List[Batch]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # the attention table indices of every batch, rows of batches without
+        # decodes or prefills have a batch size or number of prefills of 0
+        decode_params = np.array(
+            [self._get_batch_decode_attention_params(batch) for batch in batches],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        prefill_params = np.array(
+            [self._get_batch_prefill_attention_agg_params(batch) for batch in batches],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+
+        return (
+            decode_params[:, 0],
+            self._kv_cache_grid.get_indices(decode_params[:, 1]),
+            self._kv_cache_grid.get_indices(prefill_params[:, 0]),
+            self._prefill_chunk_size_grid.get_indices(prefill_params[:, 1]),
+            prefill_params[:, 2],
+        )
+
+    def prefetch_execution_times(self, batches: List[Batch]) -> None:
+        if not self._config.lazy_prediction:
+            return
+
+        (
+            decode_batch_size,
+            decode_kv_cache_index,
+            prefill_kv_cache_index,
+            prefill_chunk_size,
+            num_prefills,
+        ) = self._get_batch_attention_indices(batches)
+
+        is_decode = decode_batch_size > 0
+        self._predictions["attn_decode"].prefetch(
+            zip(
+                decode_batch_size[is_decode].tolist(),
+                decode_kv_cache_index[is_decode].tolist(),
+            )
+        )
+
+        is_prefill = num_prefills > 0
+        self._predictions["attn_prefill"].prefetch(
+            zip(
+                prefill_kv_cache_index[is_prefill].tolist(),
+                prefill_chunk_size[is_prefill].tolist(),
+            )
+        )
+
+    def get_execution_times(
+        self, batches: List[Batch], pipeline_stages: List[int]
+    ) -> ExecutionTimes:
+        if self._config.lazy_prediction:
+            self.prefetch_execution_times(batches)
+            return super().get_execution_times(batches, pipeline_stages)
+
+        assert len(batches) == len(pipeline_stages)
+
+        num_batches = len(batches)
+        num_tokens = np.array([batch._total_num_tokens for batch in batches])
+        num_tokens_rounded = np.array(
+            [batch._total_num_tokens_rounded for batch in batches]
+        )
+        is_last_stage = (
+            np.array(pipeline_stages) == self._replica_config.num_pipeline_stages - 1
+        )
+
+        (
+            decode_batch_size,
+            decode_kv_cache_index,
+            prefill_kv_cache_index,
+            prefill_chunk_size,
+            num_prefills,
+        ) = self._get_batch_attention_indices(batches)
+
+        attention_decode_execution_time = np.zeros(num_batches)
+        is_decode = decode_batch_size > 0
+        attention_decode_execution_time[is_decode] = self._predictions["attn_decode"][
+            decode_batch_size[is_decode], decode_kv_cache_index[is_decode]
+        ] * (
+            1
+            + self._attention_decode_batching_overhead_fraction
+            * (decode_batch_size[is_decode] > 1)
+        )
+
+        attention_prefill_execution_time = np.zeros(num_batches)
+        is_prefill = num_prefills > 0
+        attention_prefill_execution_time[is_prefill] = self._predictions[
+            "attn_prefill"
+        ][prefill_kv_cache_index[is_prefill], prefill_chunk_size[is_prefill]] * (
+            1
+            + self._attention_prefill_batching_overhead_fraction
+            * (num_prefills[is_prefill] > 1)
+        )
+
+        if self._replica_config.tensor_parallel_size == 1:
+            tensor_parallel_communication_time = np.zeros(num_batches)
+        else:
+            tensor_parallel_communication_time = (
+                self._predictions["all_reduce"][num_tokens_rounded]
+                + self._config.nccl_cpu_launch_overhead_ms
+                + self._config.nccl_cpu_skew_overhead_per_device_ms
+                * self._replica_config.tensor_parallel_size**1.25
+            )
+
+        pipeline_parallel_communication_time = np.zeros(num_batches)
+        if not is_last_stage.all():
+            pipeline_parallel_communication_time[~is_last_stage] = self._predictions[
+                "send_recv"
+            ][num_tokens_rounded[~is_last_stage]]
+
+        if self._model_config.post_attn_norm:
+            mlp_norm_time = self._predictions["post_attention_layernorm"][
+                num_tokens_rounded
+            ]
+        else:
+            mlp_norm_time = np.zeros(num_batches)
+
+        if self._config.skip_cpu_overhead_modeling:
+            cpu_overhead_times = [np.zeros(num_batches)] * 5
+        else:
+            batch_sizes = np.array([batch.size for batch in batches])
+            cpu_overhead_times = [
+                self._predictions[model_name][batch_sizes]
+                for model_name in [
+                    "schedule",
+                    "sampler_e2e",
+                    "prepare_inputs_e2e",
+                    "process_model_outputs",
+                    "ray_comm_time",
+                ]
+            ]
+
+        return ExecutionTimes(
+            self._num_layers_per_pipeline_stage,
+            self._predictions["attn_rope"][num_tokens_rounded],
+            self._predictions["attn_kv_cache_save"][num_tokens],
+            attention_decode_execution_time,
+            attention_prefill_execution_time,
+            self._predictions["attn_pre_proj"][num_tokens_rounded],
+            self._predictions["attn_post_proj"][num_tokens_rounded],
+            self._predictions["mlp_up_proj"][num_tokens_rounded],
+            self._predictions["mlp_down_proj"][num_tokens_rounded],
+            self._predictions["mlp_act"][num_tokens_rounded],
+            self._predictions["input_layernorm"][num_tokens_rounded],
+            mlp_norm_time,
+            self._predictions["add"][num_tokens_rounded],
+            tensor_parallel_communication_time,
+            pipeline_parallel_communication_time,
+            *cpu_overhead_times,
+        )
+
     def _get_attention_layer_pre_proj_execution_time(self, batch: Batch) -> float:
-        return self._predictions["attn_pre_proj"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["attn_pre_proj"][batch._total_num_tokens_rounded]
 
     def _get_attention_layer_post_proj_execution_time(self, batch: Batch) -> float:
-        return self._predictions["attn_post_proj"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["attn_post_proj"][batch._total_num_tokens_rounded]
 
     def _get_mlp_layer_up_proj_execution_time(self, batch: Batch) -> float:
-        return self._predictions["mlp_up_proj"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["mlp_up_proj"][batch._total_num_tokens_rounded]
 
     def _get_mlp_layer_down_proj_execution_time(self, batch: Batch) -> float:
-        return self._predictions["mlp_down_proj"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["mlp_down_proj"][batch._total_num_tokens_rounded]
 
     def _get_mlp_layer_act_execution_time(self, batch: Batch) -> float:
-        return self._predictions["mlp_act"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["mlp_act"][batch._total_num_tokens_rounded]
 
     def _get_attn_norm_layer_act_execution_time(self, batch: Batch) -> float:
-        return self._predictions["input_layernorm"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["input_layernorm"][batch._total_num_tokens_rounded]
 
     def _get_mlp_norm_layer_act_execution_time(self, batch: Batch) -> float:
         if not self._model_config.post_attn_norm:
             return 0
 
         return self._predictions["post_attention_layernorm"][
-            (batch._total_num_tokens_rounded,)
+            batch._total_num_tokens_rounded
         ]
 
     def _get_add_layer_act_execution_time(self, batch: Batch) -> float:
-        return self._predictions["add"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["add"][batch._total_num_tokens_rounded]
 
     def _get_tensor_parallel_communication_time(self, batch: Batch) -> float:
         return (
-            self._predictions["all_reduce"][(batch._total_num_tokens_rounded,)]
+            self._predictions["all_reduce"][batch._total_num_tokens_rounded]
             + self._config.nccl_cpu_launch_overhead_ms
             + self._config.nccl_cpu_skew_overhead_per_device_ms
             * self._replica_config.tensor_parallel_size**1.25
@@ -818,20 +1331,20 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
 
     def _get_pipeline_parallel_communication_time(self, batch: Batch) -> float:
         try:
-            return self._predictions["send_recv"][(batch._total_num_tokens_rounded,)]
-        except KeyError as e:
+            return self._predictions["send_recv"][batch._total_num_tokens_rounded]
+        except IndexError as e:
             logger.error(f"Failed to get send_recv prediction for batch {batch}")
             raise e
 
     def _get_attention_rope_execution_time(self, batch: Batch) -> float:
-        return self._predictions["attn_rope"][(batch._total_num_tokens_rounded,)]
+        return self._predictions["attn_rope"][batch._total_num_tokens_rounded]
 
     def _get_attention_kv_cache_save_execution_time(self, batch: Batch) -> float:
         # don't use round up to the nearest multiple of 8 here, because we want to
         # predict the execution time for the exact number of tokens
         num_tokens = sum(batch.num_tokens)
 
-        return self._predictions["attn_kv_cache_save"][(num_tokens,)]
+        return self._predictions["attn_kv_cache_save"][num_tokens]
 
     def _get_attention_decode_execution_time(self, batch: Batch) -> float:
         (
@@ -842,61 +1355,153 @@ class SklearnExecutionTimePredictor(BaseExecutionTimePredictor):
             return 0
 
         return self._predictions["attn_decode"][
-            (decode_batch_size, decode_avg_kv_cache_size)
+            decode_batch_size,
+            self._kv_cache_grid.get_index(decode_avg_kv_cache_size),
         ] * (
             1
             + self._attention_decode_batching_overhead_fraction
             * int(decode_batch_size > 1)
         )
 
-    def _get_attention_prefill_execution_time(self, batch: Batch) -> float:
+    def _get_batch_prefill_attention_agg_params(
+        self, batch: Batch
+    ) -> Tuple[int, int, int]:
         prefill_params = self._get_batch_prefill_attention_params(batch)
 
         if len(prefill_params) == 0:
-            return 0
+            return (0, 0, 0)
 
         kv_cache_sizes, prefill_chunk_sizes = zip(*prefill_params)
 
         agg_kv_cache_size = sum(kv_cache_sizes)
         agg_prefill_chunk_size = sum([x**2 for x in prefill_chunk_sizes]) ** 0.5
 
+        return (
+            agg_kv_cache_size,
+            round(agg_prefill_chunk_size),
+            len(prefill_params),
+        )
+
+    def _get_attention_prefill_execution_time(self, batch: Batch) -> float:
+        (
+            agg_kv_cache_size,
+            agg_prefill_chunk_size,
+            num_prefills,
+        ) = self._get_batch_prefill_attention_agg_params(batch)
+
+        if num_prefills == 0:
+            return 0
+
         return self._predictions["attn_prefill"][
-            (agg_kv_cache_size, round(agg_prefill_chunk_size) ** 2)
+            self._kv_cache_grid.get_index(agg_kv_cache_size),
+            self._prefill_chunk_size_grid.get_index(agg_prefill_chunk_size),
         ] * (
             1
-            + self._attention_prefill_batching_overhead_fraction
-            * int(len(prefill_params) > 1)
+            + self._attention_prefill_batching_overhead_fraction * int(num_prefills > 1)
         )
 
     def _get_schedule_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["schedule"][(batch.size,)]
+        return self._predictions["schedule"][batch.size]
 
     def _get_sampler_e2e_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["sampler_e2e"][(batch.size,)]
+        return self._predictions["sampler_e2e"][batch.size]
 
     def _get_prepare_inputs_e2e_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["prepare_inputs_e2e"][(batch.size,)]
+        return self._predictions["prepare_inputs_e2e"][batch.size]
 
     def _get_process_model_outputs_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["process_model_outputs"][(batch.size,)]
+        return self._predictions["process_model_outputs"][batch.size]
 
     def _get_ray_comm_time(self, batch: Batch) -> float:
         if self._config.skip_cpu_overhead_modeling:
             return 0
 
-        return self._predictions["ray_comm_time"][(batch.size,)]
+        return self._predictions["ray_comm_time"][batch.size]
+
+    def get_startup_stats(self) -> dict:
+        # the training time includes loading the cached models and the
+        # prediction time loading the cached prediction tables
+        return {
+            "training_time": self._training_time,
+            "prediction_time": self._prediction_time,
+            "prediction_table_bytes": sum(
+                predictions.nbytes
+                for predictions in self._predictions.values()
+                if isinstance(predictions, np.ndarray)
+            ),
+        }
+
+    def get_cache_files(self) -> List[str]:
+        return [
+            cache_file
+            for cache_files, _ in self._cache_entries.values()
+            for cache_file in cache_files
+        ]
+
+    def get_model_errors(
+        self, input_files: Optional[Tuple[str, str, str, str, str]] = None
+    ) -> Dict[str, float]:
+        # mean absolute percentage error of every model on its training data,
+        # or on the data read from the given compute, attention, all reduce,
+        # send recv and cpu overhead input files instead
+        training_jobs = self._get_training_jobs(input_files)
+
+        model_errors = {}
+        for model_name, training_job in training_jobs.items():
+            predictions = self._models[model_name].predict(
+                training_job.df[training_job.feature_cols]
+            )
+            if model_name in ["attn_decode", "attn_prefill"]:
+                predictions = self._get_attention_table_predictions(
+                    model_name, training_job.df, predictions
+                )
+
+            model_errors[model_name] = self.mean_absolute_percentage_error(
+                training_job.df[training_job.target_col], predictions
+            )
+
+        return model_errors
+
+    def _get_attention_table_predictions(
+        self, model_name: str, df: pd.DataFrame, predictions: np.ndarray
+    ) -> np.ndarray:
+        # the simulator reads the attention times from the prediction tables,
+        # with the sizes rounded up to the points of the prediction grids
+        table = self._predictions[model_name]
+        if not isinstance(table, np.ndarray):
+            return predictions
+
+        kv_cache_index = self._kv_cache_grid.get_indices(df["kv_cache_size"].to_numpy())
+        if model_name == "attn_decode":
+            indices = (df["batch_size"].to_numpy(), kv_cache_index)
+        else:
+            indices = (
+                kv_cache_index,
+                self._prefill_chunk_size_grid.get_indices(
+                    df["prefill_chunk_size"].to_numpy()
+                ),
+            )
+
+        # points outside of the tables keep the model predictions
+        is_in_table = np.logical_and.reduce(
+            [index < size for index, size in zip(indices, table.shape)]
+        )
+        predictions = predictions.copy()
+        predictions[is_in_table] = table[tuple(index[is_in_table] for index in indices)]
+
+        return predictions
 
     def to_dict(self) -> dict:
         return {
@@ -1,3 +1,12 @@
+from vidur.metrics.event_profiler import EventProfiler
 from vidur.metrics.metrics_store import MetricsStore
+from vidur.metrics.steady_state_detector import SteadyStateDetector
+from vidur.metrics.trace_writer import ChromeTraceWriter, JsonlTraceWriter
 
-__all__ = [MetricsStore]
+__all__ = [
+    MetricsStore,
+    ChromeTraceWriter,
+    JsonlTraceWriter,
+    EventProfiler,
+    SteadyStateDetector,
+]
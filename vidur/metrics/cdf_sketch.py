@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 import numpy as np
 import pandas as pd
 import plotly_express as px
@@ -102,6 +104,18 @@ class CDFSketch:
     def sum(self) -> float:
         return self._sketch.sum
 
+    def get_stats(self, quantiles: List[float]) -> Dict[str, float]:
+        if self._sketch._count == 0:
+            return {}
+
+        stats = {f"{self._metric_name}_mean": self._sketch.avg}
+        for quantile in quantiles:
+            stats[f"{self._metric_name}_p{quantile * 100:g}"] = (
+                self._sketch.get_quantile_value(quantile)
+            )
+
+        return stats
+
     def _save_df(self, df: pd.DataFrame, path: str, plot_name: str) -> None:
         df.to_csv(f"{path}/{plot_name}.csv")
 
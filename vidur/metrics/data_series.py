@@ -1,4 +1,3 @@
-from collections import defaultdict
 from typing import Optional
 
 import numpy as np
@@ -10,6 +9,35 @@ from vidur.logger import init_logger
 
 logger = init_logger(__name__)
 
+INITIAL_CAPACITY = 1024
+PENDING_SIZE = 1024
+
+
+def _to_array(values: list) -> np.ndarray:
+    array = np.asarray(values)
+    # missing datapoints
+    if array.dtype == object:
+        array = np.asarray(values, dtype=np.float64)
+    return array
+
+
+def _append(buffer: np.ndarray, size: int, values: np.ndarray) -> np.ndarray:
+    # returns the buffer with the values written after the first size entries,
+    # reallocated if they don't fit or need a wider dtype
+    new_size = size + len(values)
+    dtype = np.result_type(buffer, values)
+
+    if new_size > len(buffer) or dtype != buffer.dtype:
+        capacity = len(buffer)
+        if new_size > capacity:
+            capacity = max(INITIAL_CAPACITY, 2 * capacity, new_size)
+        new_buffer = np.empty(capacity, dtype=dtype)
+        new_buffer[:size] = buffer[:size]
+        buffer = new_buffer
+
+    buffer[size:new_size] = values
+    return buffer
+
 
 class DataSeries:
     def __init__(
@@ -20,8 +48,14 @@ class DataSeries:
         save_table_to_wandb: bool = True,
         save_plots: bool = True,
     ) -> None:
-        # metrics are a data series of two-dimensional (x, y) datapoints
-        self._data_series = []
+        # metrics are a data series of two-dimensional (x, y) datapoints, stored in
+        # buffers which double when full. they hold ints until the first float
+        self._data_x = np.empty(0, dtype=np.int64)
+        self._data_y = np.empty(0, dtype=np.int64)
+        self._size = 0
+        # most recent datapoints, appended to the buffers in chunks
+        self._pending_x = []
+        self._pending_y = []
         # column names of x, y datatpoints for data collection
         self._x_name = x_name
         self._y_name = y_name
@@ -37,17 +71,26 @@ class DataSeries:
     def consolidate(
         self,
     ):
-        res = defaultdict(list)
-        for x, y in self._data_series:
-            res[x].append(y)
-        self._data_series = [(x, sum(y) / len(y)) for x, y in res.items()]
+        self._flush()
+
+        # average the y datapoints of every x, sorted by x
+        data_x, inverse, counts = np.unique(
+            self._data_x[: self._size], return_inverse=True, return_counts=True
+        )
+        data_y = (
+            np.bincount(
+                inverse, weights=self._data_y[: self._size], minlength=len(counts)
+            )
+            / counts
+        )
 
-        # sort by x
-        self._data_series = sorted(self._data_series, key=lambda x: x[0])
-        self._last_data_y = self._data_series[-1][1] if len(self._data_series) else 0
+        self._data_x = data_x
+        self._data_y = data_y
+        self._size = len(data_x)
+        self._last_data_y = data_y[-1] if self._size else 0
 
     def __len__(self):
-        return len(self._data_series)
+        return self._size + len(self._pending_x)
 
     @property
     def _metric_name(self) -> str:
@@ -56,15 +99,38 @@ class DataSeries:
     # add a new x, y datapoint
     def put(self, data_x: float, data_y: float) -> None:
         self._last_data_y = data_y
-        self._data_series.append((data_x, data_y))
+        self._pending_x.append(data_x)
+        self._pending_y.append(data_y)
+
+        if len(self._pending_x) == PENDING_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending_x:
+            return
+
+        self._data_x = _append(self._data_x, self._size, _to_array(self._pending_x))
+        self._data_y = _append(self._data_y, self._size, _to_array(self._pending_y))
+        self._size += len(self._pending_x)
+        self._pending_x = []
+        self._pending_y = []
 
     # get most recently collected y datapoint
     def _peek_y(self):
         return self._last_data_y
 
-    # convert list of x, y datapoints to a pandas dataframe
+    # convert the x, y datapoints to a pandas dataframe, without copying them.
+    # the columns are views of the buffers, callers replace columns instead of
+    # changing them in place or copy the dataframe first
     def _to_df(self):
-        return pd.DataFrame(self._data_series, columns=[self._x_name, self._y_name])
+        self._flush()
+        return pd.DataFrame(
+            {
+                self._x_name: self._data_x[: self._size],
+                self._y_name: self._data_y[: self._size],
+            },
+            copy=False,
+        )
 
     # add a new x, y datapoint as an incremental (delta) update to
     # recently collected y datapoint
@@ -76,7 +142,7 @@ class DataSeries:
     def print_series_stats(
         self, df: pd.DataFrame, plot_name: str, x_name: str = None, y_name: str = None
     ) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
         if x_name is None:
             x_name = self._x_name
@@ -103,7 +169,7 @@ class DataSeries:
     def print_distribution_stats(
         self, df: pd.DataFrame, plot_name: str, y_name: str = None
     ) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         if y_name is None:
@@ -155,14 +221,14 @@ class DataSeries:
         y_cumsum: bool = True,
     ) -> None:
 
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         if y_axis_label is None:
             y_axis_label = self._y_name
 
         df = self._to_df()
-        df[self._x_name] -= start_time
+        df[self._x_name] = df[self._x_name] - start_time
 
         if y_cumsum:
             df[self._y_name] = df[self._y_name].cumsum()
@@ -212,7 +278,7 @@ class DataSeries:
         self._save_df(df, path, plot_name)
 
     def plot_cdf(self, path: str, plot_name: str, y_axis_label: str = None) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         if y_axis_label is None:
@@ -256,7 +322,7 @@ class DataSeries:
         self._save_df(df, path, plot_name)
 
     def plot_histogram(self, path: str, plot_name: str) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         df = self._to_df()
@@ -295,7 +361,7 @@ class DataSeries:
             fig.write_image(f"{path}/{plot_name}.png")
 
     def plot_differential(self, path: str, plot_name: str) -> None:
-        if len(self._data_series) == 0:
+        if len(self) == 0:
             return
 
         df = self._to_df()
@@ -0,0 +1,130 @@
+import json
+from collections import defaultdict
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from vidur.logger import init_logger
+
+logger = init_logger(__name__)
+
+
+class _TimingStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.count if self.count else 0.0,
+            "max_time": self.max_time,
+        }
+
+
+class EventProfiler:
+    """Collects wall time statistics of the simulator event loop.
+
+    Tracks the count and cumulative wall time of `handle_event` per event
+    type and of the `MetricsStore` hooks, and samples the event heap size
+    every `heap_sample_interval` events. Metrics store hooks run inside the
+    event handlers, so their time is also included in the event times.
+    """
+
+    def __init__(self, heap_sample_interval: int) -> None:
+        self._heap_sample_interval = max(heap_sample_interval, 1)
+
+        self._event_stats: Dict[str, _TimingStats] = defaultdict(_TimingStats)
+        self._metrics_hook_stats: Dict[str, _TimingStats] = defaultdict(_TimingStats)
+        # (wall time, simulated time, number of events processed, heap size)
+        self._heap_size_samples: List[Tuple[float, float, int, int]] = []
+
+        self._num_events = 0
+        self._max_heap_size = 0
+        self._loop_time = 0.0
+        self._loop_started_at = None
+
+    def on_loop_start(self) -> None:
+        self._loop_started_at = perf_counter()
+
+    def on_loop_end(self) -> None:
+        self._loop_time += perf_counter() - self._loop_started_at
+        self._loop_started_at = None
+
+    def on_event(
+        self, event_type: str, elapsed: float, time: float, heap_size: int
+    ) -> None:
+        self._event_stats[event_type].record(elapsed)
+        self._num_events += 1
+
+        if heap_size > self._max_heap_size:
+            self._max_heap_size = heap_size
+
+        if self._num_events % self._heap_sample_interval == 0:
+            self._heap_size_samples.append(
+                (self._get_loop_time(), time, self._num_events, heap_size)
+            )
+
+    def on_metrics_hook(self, hook_name: str, elapsed: float) -> None:
+        self._metrics_hook_stats[hook_name].record(elapsed)
+
+    def _get_loop_time(self) -> float:
+        if self._loop_started_at is None:
+            return self._loop_time
+        return self._loop_time + perf_counter() - self._loop_started_at
+
+    def to_dict(self) -> dict:
+        loop_time = self._get_loop_time()
+        total_event_time = sum(stats.total_time for stats in self._event_stats.values())
+
+        return {
+            "num_events": self._num_events,
+            "loop_time": loop_time,
+            "events_per_second": self._num_events / loop_time if loop_time else 0.0,
+            # time spent outside handle_event, i.e. heap operations and tracing
+            "loop_overhead_time": loop_time - total_event_time,
+            "max_heap_size": self._max_heap_size,
+            "events": {
+                event_type: stats.to_dict()
+                for event_type, stats in sorted(
+                    self._event_stats.items(),
+                    key=lambda item: item[1].total_time,
+                    reverse=True,
+                )
+            },
+            "metrics_hooks": {
+                hook_name: stats.to_dict()
+                for hook_name, stats in sorted(
+                    self._metrics_hook_stats.items(),
+                    key=lambda item: item[1].total_time,
+                    reverse=True,
+                )
+            },
+            "heap_size_samples": [
+                {
+                    "wall_time": wall_time,
+                    "time": time,
+                    "num_events": num_events,
+                    "heap_size": heap_size,
+                }
+                for wall_time, time, num_events, heap_size in self._heap_size_samples
+            ],
+        }
+
+    def write(self, path: str) -> None:
+        profile = self.to_dict()
+
+        with open(path, "w") as f:
+            json.dump(profile, f, indent=4)
+
+        logger.info(
+            f"Processed {profile['num_events']} events in {profile['loop_time']:.2f}s"
+            f" ({profile['events_per_second']:.0f} events/s)"
+        )
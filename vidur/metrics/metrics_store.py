@@ -1,7 +1,9 @@
 import os
 from functools import reduce
-from typing import Dict, List
+from time import perf_counter
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import plotly_express as px
 import wandb
@@ -22,7 +24,11 @@ from vidur.metrics.constants import (
     TokenMetricsTimeDistribution,
 )
 from vidur.metrics.data_series import DataSeries
+from vidur.metrics.event_profiler import EventProfiler
+from vidur.metrics.metrics_table import METRICS_TABLE_FORMATS, write_metrics_table
 from vidur.metrics.series_average_meter import SeriesAverageMeter
+from vidur.metrics.steady_state_detector import SteadyStateDetector
+from vidur.types import TerminationReason
 from vidur.utils.mfu_calculator import MFUCalculator
 
 logger = init_logger(__name__)
@@ -30,9 +36,17 @@ logger = init_logger(__name__)
 
 def if_write_metrics(func):
     def wrapper(self, *args, **kwargs):
-        if self._config.write_metrics:
+        if not self._config.write_metrics:
+            return
+
+        if self._profiler is None:
             return func(self, *args, **kwargs)
 
+        start_time = perf_counter()
+        result = func(self, *args, **kwargs)
+        self._profiler.on_metrics_hook(func.__name__, perf_counter() - start_time)
+        return result
+
     return wrapper
 
 
@@ -46,13 +60,27 @@ UTILIZATION_STR = "Utilization (%)"
 OPERATION_STR = "Operation"
 TIME_STR_MS = "Time (ms)"
 
+SUMMARY_QUANTILES = [0.5, 0.9, 0.95, 0.99]
+
 
 class MetricsStore:
 
     def __init__(self, simulation_config: SimulationConfig) -> None:
         self._simulation_config = simulation_config
         self._config = self._simulation_config.metrics_config
+        assert (
+            self._config.output_format in METRICS_TABLE_FORMATS
+        ), f"Unknown metrics output format {self._config.output_format}"
         self._last_request_arrived_at = None
+        self._profiler: Optional[EventProfiler] = None
+
+        early_termination_config = self._simulation_config.early_termination_config
+        self._steady_state_detector: Optional[SteadyStateDetector] = None
+        if (
+            early_termination_config.enable_convergence_check
+            or early_termination_config.enable_overload_check
+        ):
+            self._steady_state_detector = SteadyStateDetector(early_termination_config)
 
         # copy config
         self._num_replicas = self._simulation_config.cluster_config.num_replicas
@@ -251,7 +279,52 @@ class MetricsStore:
             config=self._simulation_config.to_dict(),
         )
 
-    def _save_as_csv(
+    def _merge_dataseries(
+        self, dataseries_list: List[DataSeries], key_to_join: str
+    ) -> pd.DataFrame:
+        dfs = [dataseries._to_df() for dataseries in dataseries_list]
+        keys = [df[key_to_join].to_numpy() for df in dfs]
+        # the series collected per request or batch usually have the same keys,
+        # in the order of completion
+        if all(np.array_equal(df_keys, keys[0]) for df_keys in keys):
+            orders = [np.argsort(keys[0], kind="stable")] * len(keys)
+        else:
+            orders = [np.argsort(df_keys, kind="stable") for df_keys in keys]
+        sorted_keys = [df_keys[order] for df_keys, order in zip(keys, orders)]
+
+        # outer merges multiply the rows of repeated keys
+        if any(np.any(df_keys[1:] == df_keys[:-1]) for df_keys in sorted_keys):
+            return reduce(
+                lambda left, right: pd.merge(
+                    left, right, on=[key_to_join], how="outer"
+                ),
+                dfs,
+            )
+
+        if all(np.array_equal(df_keys, sorted_keys[0]) for df_keys in sorted_keys):
+            all_keys = sorted_keys[0]
+        else:
+            all_keys = np.concatenate(sorted_keys)
+            all_keys.sort()
+            all_keys = all_keys[np.concatenate(([True], all_keys[1:] != all_keys[:-1]))]
+
+        # in one pass, the values of every series are sorted by their keys and
+        # scattered to the rows of the keys, missing (nan) in the other series
+        columns = {key_to_join: all_keys}
+        for dataseries, df, df_keys, order in zip(
+            dataseries_list, dfs, sorted_keys, orders
+        ):
+            values = df[dataseries._y_name].to_numpy()[order]
+            if len(df_keys) == len(all_keys):
+                column = values
+            else:
+                column = np.full(len(all_keys), np.nan)
+                column[np.searchsorted(all_keys, df_keys)] = values
+            columns[dataseries._y_name] = column
+
+        return pd.DataFrame(columns, copy=False)
+
+    def _save_table(
         self,
         dataseries_list: List[DataSeries],
         key_to_join: str,
@@ -260,11 +333,8 @@ class MetricsStore:
     ):
         os.makedirs(base_path, exist_ok=True)
 
-        merged_df = reduce(
-            lambda left, right: pd.merge(left, right, on=[key_to_join], how="outer"),
-            [dataseries._to_df() for dataseries in dataseries_list],
-        )
-        merged_df.to_csv(f"{base_path}/{file_name}.csv", index=False)
+        merged_df = self._merge_dataseries(dataseries_list, key_to_join)
+        write_metrics_table(merged_df, base_path, file_name, self._config.output_format)
         if wandb.run and self._config.save_table_to_wandb:
             wand_table = wandb.Table(dataframe=merged_df)
             wandb.log({f"{file_name}_table": wand_table}, step=0)
@@ -341,7 +411,7 @@ class MetricsStore:
                 y_cumsum=False,
             )
         operations_dataseries_list = list(self._operation_metrics_per_batch.values())
-        self._save_as_csv(
+        self._save_table(
             dataseries_list=operations_dataseries_list,
             key_to_join=BATCH_ID_STR,
             base_path=self._config.output_dir,
@@ -359,7 +429,7 @@ class MetricsStore:
         cpu_operations_dataseries_list = list(
             self._cpu_operation_metrics_per_batch.values()
         )
-        self._save_as_csv(
+        self._save_table(
             dataseries_list=cpu_operations_dataseries_list,
             key_to_join=BATCH_ID_STR,
             base_path=self._config.output_dir,
@@ -374,7 +444,7 @@ class MetricsStore:
             self._request_metrics_time_distributions.values()
         ) + list(self._request_metrics_histogram.values())
 
-        self._save_as_csv(
+        self._save_table(
             dataseries_list=all_request_metrics,
             key_to_join=REQUEST_ID_STR,
             base_path=self._config.output_dir,
@@ -430,7 +500,7 @@ class MetricsStore:
             self._batch_metrics_count_distribution_per_batch.values()
         ) + list(self._batch_metrics_time_distribution_per_batch.values())
 
-        self._save_as_csv(
+        self._save_table(
             dataseries_list=all_batch_metrics,
             key_to_join=BATCH_ID_STR,
             base_path=self._config.output_dir,
@@ -473,6 +543,69 @@ class MetricsStore:
                     base_plot_path,
                 )
 
+    def set_profiler(self, profiler: EventProfiler) -> None:
+        self._profiler = profiler
+
+    @property
+    def termination_reason(self) -> Optional[TerminationReason]:
+        if self._steady_state_detector is None:
+            return None
+        return self._steady_state_detector.termination_reason
+
+    def get_request_metrics_df(self) -> pd.DataFrame:
+        all_request_metrics = list(
+            self._request_metrics_time_distributions.values()
+        ) + list(self._request_metrics_histogram.values())
+
+        return self._merge_dataseries(all_request_metrics, REQUEST_ID_STR)
+
+    def get_batch_metrics_df(self) -> pd.DataFrame:
+        all_batch_metrics = list(
+            self._batch_metrics_count_distribution_per_batch.values()
+        ) + list(self._batch_metrics_time_distribution_per_batch.values())
+
+        return self._merge_dataseries(all_batch_metrics, BATCH_ID_STR)
+
+    def get_summary(self) -> Dict[str, float]:
+        summary = {}
+
+        request_metrics_df = self.get_request_metrics_df()
+        for metric_name in self._request_metrics_time_distributions:
+            values = request_metrics_df[metric_name.value].dropna()
+            if len(values) == 0:
+                continue
+
+            summary[f"{metric_name.value}_mean"] = float(values.mean())
+            for quantile in SUMMARY_QUANTILES:
+                summary[f"{metric_name.value}_p{quantile * 100:g}"] = float(
+                    values.quantile(quantile)
+                )
+
+        for sketch in list(self._batch_metrics_time_distribution.values()) + list(
+            self._batch_metrics_count_distribution.values()
+        ):
+            summary.update(sketch.get_stats(SUMMARY_QUANTILES))
+
+        for replica_idx in range(self._num_replicas):
+            summary.update(
+                self._replica_memory_usage[replica_idx].get_stats(
+                    f"replica_{replica_idx + 1}_memory_usage"
+                )
+            )
+            for stage_idx in range(self._num_pipeline_stages):
+                summary.update(
+                    self._replica_busy_time[replica_idx][stage_idx].get_stats(
+                        f"replica_{replica_idx + 1}_stage_{stage_idx + 1}_busy_time_percent"
+                    )
+                )
+                summary.update(
+                    self._replica_mfu[replica_idx][stage_idx].get_stats(
+                        f"replica_{replica_idx + 1}_stage_{stage_idx + 1}_mfu"
+                    )
+                )
+
+        return summary
+
     @if_write_metrics
     def plot(self) -> None:
         dir_plot_path = f"{self._config.output_dir}/plots"
@@ -484,8 +617,15 @@ class MetricsStore:
         self._store_operation_metrics(dir_plot_path)
         self._store_utilization_metrics(dir_plot_path)
 
-    @if_write_metrics
     def on_request_arrival(self, time: float, request: Request) -> None:
+        # early termination does not depend on writing the metrics
+        if self._steady_state_detector:
+            self._steady_state_detector.on_request_arrival(time)
+
+        self._on_request_arrival(time, request)
+
+    @if_write_metrics
+    def _on_request_arrival(self, time: float, request: Request) -> None:
         if not self._config.store_request_metrics:
             return
 
@@ -511,7 +651,6 @@ class MetricsStore:
             ].put(request.id, request.arrived_at - self._last_request_arrived_at)
         self._last_request_arrived_at = request.arrived_at
 
-    @if_write_metrics
     def _on_request_end(self, time: float, request: Request) -> None:
         if not self._config.store_request_metrics:
             return
@@ -633,9 +772,20 @@ class MetricsStore:
         else:
             raise ValueError(f"Invalid metric name {metric_name}")
 
-    @if_write_metrics
     def on_batch_end(
         self, time: float, batch: Batch, replica_id: int, memory_usage_percent: int
+    ) -> None:
+        # early termination does not depend on writing the metrics, or on the
+        # batch index range whose metrics are written
+        if self._steady_state_detector:
+            for request in batch.completed_requests:
+                self._steady_state_detector.on_request_end(time, request)
+
+        self._on_batch_end(time, batch, replica_id, memory_usage_percent)
+
+    @if_write_metrics
+    def _on_batch_end(
+        self, time: float, batch: Batch, replica_id: int, memory_usage_percent: int
     ) -> None:
         if (
             self._config.min_batch_index and batch.id < self._config.min_batch_index
@@ -0,0 +1,53 @@
+import os
+from typing import List, Optional
+
+import pandas as pd
+
+# parquet and arrow (the arrow ipc file format) need pyarrow
+METRICS_TABLE_FORMATS = ["csv", "parquet", "arrow"]
+
+
+def get_metrics_table_file(base_path: str, file_name: str, output_format: str) -> str:
+    return f"{base_path}/{file_name}.{output_format}"
+
+
+def find_metrics_table_file(base_path: str, file_name: str) -> Optional[str]:
+    # in whichever format the simulation wrote it
+    for output_format in METRICS_TABLE_FORMATS:
+        file_path = get_metrics_table_file(base_path, file_name, output_format)
+        if os.path.exists(file_path):
+            return file_path
+
+
+def write_metrics_table(
+    df: pd.DataFrame, base_path: str, file_name: str, output_format: str
+) -> None:
+    file_path = get_metrics_table_file(base_path, file_name, output_format)
+
+    if output_format == "csv":
+        df.to_csv(file_path, index=False)
+    elif output_format == "parquet":
+        df.to_parquet(file_path, index=False)
+    else:
+        df.to_feather(file_path)
+
+
+def read_metrics_table_file(
+    file_path: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    # the columnar formats only read the given columns from disk
+    if file_path.endswith(".csv"):
+        return pd.read_csv(file_path, usecols=columns)
+    if file_path.endswith(".parquet"):
+        return pd.read_parquet(file_path, columns=columns)
+    return pd.read_feather(file_path, columns=columns)
+
+
+def read_metrics_table(
+    base_path: str, file_name: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    file_path = find_metrics_table_file(base_path, file_name)
+    if file_path is None:
+        raise FileNotFoundError(f"No {file_name} metrics table in {base_path}")
+
+    return read_metrics_table_file(file_path, columns)
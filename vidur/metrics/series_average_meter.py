@@ -1,4 +1,5 @@
 import json
+from typing import Dict
 
 import wandb
 
@@ -68,6 +69,16 @@ class SeriesAverageMeter:
         data_y = last_data_y + data_y_delta
         self.put(data_x, data_y)
 
+    def get_stats(self, name: str) -> Dict[str, float]:
+        if self._denom_sum == 0:
+            return {}
+
+        return {
+            f"{name}_min": self._min_y,
+            f"{name}_max": self._max_y,
+            f"{name}_weighted_mean": self._numer_sum / self._denom_sum,
+        }
+
     def print_stats(self, name: str, path: str) -> None:
         if self._denom_sum == 0:
             return
@@ -0,0 +1,196 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from vidur.config import EarlyTerminationConfig
+from vidur.entities import Request
+from vidur.logger import init_logger
+from vidur.types import TerminationReason
+
+logger = init_logger(__name__)
+
+TTFT_STR = "ttft"
+TBT_STR = "tbt"
+SCHEDULING_DELAY_STR = "scheduling_delay"
+
+
+class SteadyStateDetector:
+    """Detects when a simulation can be stopped before draining its requests.
+
+    Convergence: after every window of completed requests, the configured
+    percentile of TTFT, TBT and scheduling delay is computed over the requests
+    of the most recent windows, the run has converged once it changes by less
+    than the tolerance for a number of consecutive windows, without moving in
+    the same direction in all of them, while the number of outstanding
+    requests is not growing as for the overload check. A metric which keeps
+    growing changes by ever smaller fractions, so the relative tolerance alone
+    would eventually accept it.
+
+    Overload: the number of outstanding (arrived but not completed) requests
+    is sampled at a fixed simulated time interval, the system is overloaded
+    once it keeps growing for a number of consecutive intervals.
+    """
+
+    def __init__(self, config: EarlyTerminationConfig) -> None:
+        self._config = config
+
+        self._samples: Dict[str, List[float]] = {
+            TTFT_STR: [],
+            TBT_STR: [],
+            SCHEDULING_DELAY_STR: [],
+        }
+        # samples of the latest windows, the percentiles are computed over
+        self._windows: Dict[str, Deque[List[float]]] = {
+            metric_name: deque(maxlen=self._config.convergence_num_rolling_windows)
+            for metric_name in self._samples
+        }
+        self._last_quantiles: Optional[Dict[str, float]] = None
+        self._num_stable_windows = 0
+        # direction (-1, 0 or 1) of the last change of every metric and the
+        # number of consecutive windows it moved in that direction
+        self._trends: Dict[str, Tuple[int, int]] = {
+            metric_name: (0, 0) for metric_name in self._samples
+        }
+
+        self._num_arrived_requests = 0
+        self._num_completed_requests = 0
+        self._next_overload_check_at = self._config.overload_check_interval
+        self._last_num_outstanding_requests = 0
+        self._num_growing_intervals = 0
+
+        self._termination_reason: Optional[TerminationReason] = None
+
+    @property
+    def termination_reason(self) -> Optional[TerminationReason]:
+        return self._termination_reason
+
+    def on_request_arrival(self, time: float) -> None:
+        self._num_arrived_requests += 1
+        self._check_overload(time)
+
+    def on_request_end(self, time: float, request: Request) -> None:
+        self._num_completed_requests += 1
+        self._check_overload(time)
+
+        if (
+            not self._config.enable_convergence_check
+            or self._termination_reason is not None
+        ):
+            return
+
+        self._samples[TTFT_STR].append(
+            request.prefill_completed_at - request.arrived_at
+        )
+        self._samples[TBT_STR].append(
+            (request.completed_at - request.prefill_completed_at)
+            / request.num_decode_tokens
+        )
+        self._samples[SCHEDULING_DELAY_STR].append(request.scheduling_delay)
+
+        if len(self._samples[TTFT_STR]) == self._config.convergence_window_size:
+            self._on_window_end(time)
+
+    def _on_window_end(self, time: float) -> None:
+        for metric_name, values in self._samples.items():
+            self._windows[metric_name].append(values)
+        self._samples = {metric_name: [] for metric_name in self._samples}
+
+        quantiles = {
+            metric_name: np.quantile(
+                np.concatenate(windows), self._config.convergence_quantile
+            )
+            for metric_name, windows in self._windows.items()
+        }
+
+        if self._last_quantiles is not None:
+            for metric_name in quantiles:
+                self._update_trend(
+                    metric_name,
+                    self._last_quantiles[metric_name],
+                    quantiles[metric_name],
+                )
+
+        # a growing queue means the metrics are still growing with it
+        if (
+            self._last_quantiles is not None
+            and self._num_growing_intervals
+            < self._config.overload_num_growing_intervals
+            and all(
+                self._is_stable(
+                    self._last_quantiles[metric_name], quantiles[metric_name]
+                )
+                and not self._is_drifting(metric_name)
+                for metric_name in quantiles
+            )
+        ):
+            self._num_stable_windows += 1
+        else:
+            self._num_stable_windows = 0
+
+        self._last_quantiles = quantiles
+
+        if self._num_stable_windows >= self._config.convergence_num_stable_windows:
+            logger.info(
+                f"Metrics converged at {time}s after {self._num_completed_requests} completed requests: {quantiles}"
+            )
+            self._termination_reason = TerminationReason.CONVERGED
+
+    def _update_trend(self, metric_name: str, last_value: float, value: float) -> None:
+        change = value - last_value
+        direction = 0
+        if abs(change) > self._config.convergence_absolute_tolerance:
+            direction = 1 if change > 0 else -1
+
+        last_direction, num_windows = self._trends[metric_name]
+        if direction != 0 and direction == last_direction:
+            self._trends[metric_name] = (direction, num_windows + 1)
+        else:
+            self._trends[metric_name] = (direction, 1 if direction else 0)
+
+    def _is_drifting(self, metric_name: str) -> bool:
+        # noise moves the percentiles back and forth, a drift does not
+        _, num_windows = self._trends[metric_name]
+        return num_windows >= self._config.convergence_num_stable_windows
+
+    def _is_stable(self, last_value: float, value: float) -> bool:
+        change = abs(value - last_value)
+        if change <= self._config.convergence_absolute_tolerance:
+            return True
+        return (
+            change / max(abs(last_value), abs(value))
+            <= self._config.convergence_tolerance
+        )
+
+    def _check_overload(self, time: float) -> None:
+        # the number of outstanding requests is also tracked for the
+        # convergence check, even without the overload check
+        if not (
+            self._config.enable_overload_check or self._config.enable_convergence_check
+        ):
+            return
+
+        while time >= self._next_overload_check_at:
+            self._next_overload_check_at += self._config.overload_check_interval
+
+            num_outstanding_requests = (
+                self._num_arrived_requests - self._num_completed_requests
+            )
+            if num_outstanding_requests > self._last_num_outstanding_requests:
+                self._num_growing_intervals += 1
+            else:
+                self._num_growing_intervals = 0
+            self._last_num_outstanding_requests = num_outstanding_requests
+
+            if (
+                self._config.enable_overload_check
+                and self._num_growing_intervals
+                >= self._config.overload_num_growing_intervals
+                and num_outstanding_requests
+                >= self._config.overload_min_outstanding_requests
+            ):
+                logger.info(
+                    f"System overloaded at {time}s with {num_outstanding_requests} outstanding requests"
+                )
+                self._termination_reason = TerminationReason.OVERLOADED
+                return
@@ -0,0 +1,97 @@
+import gzip
+import json
+from abc import ABC, abstractmethod
+from typing import IO, List
+
+
+def _json_default(obj):
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class BaseTraceWriter(ABC):
+    """Buffers trace records and incrementally flushes them to disk.
+
+    Memory usage is bounded by `buffer_size` records and everything flushed so
+    far stays on disk even if the process dies before `close` is called.
+    """
+
+    def __init__(self, path: str, buffer_size: int, compress: bool) -> None:
+        self._path = f"{path}.gz" if compress else path
+        self._buffer_size = max(buffer_size, 1)
+        self._buffer: List[str] = []
+        self._num_records = 0
+        self._closed = False
+
+        if compress:
+            self._file: IO[str] = gzip.open(self._path, "wt")
+        else:
+            self._file = open(self._path, "w")
+
+        self._write_header()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def num_records(self) -> int:
+        return self._num_records
+
+    def write(self, record: dict) -> None:
+        self._buffer.append(json.dumps(record, default=_json_default))
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._serialize_buffer())
+            self._num_records += len(self._buffer)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._write_footer()
+        self._file.close()
+        self._closed = True
+
+    def _write_header(self) -> None:
+        pass
+
+    def _write_footer(self) -> None:
+        pass
+
+    @abstractmethod
+    def _serialize_buffer(self) -> str:
+        pass
+
+
+class JsonlTraceWriter(BaseTraceWriter):
+    """Writes one JSON record per line."""
+
+    def _serialize_buffer(self) -> str:
+        return "\n".join(self._buffer) + "\n"
+
+
+class ChromeTraceWriter(BaseTraceWriter):
+    """Writes a `{"traceEvents": [...]}` document with a streamed array.
+
+    The closing brackets are only written on `close`, the trace viewers accept
+    a truncated array so a partially written trace is still loadable.
+    """
+
+    def _write_header(self) -> None:
+        self._file.write('{"traceEvents": [\n')
+
+    def _serialize_buffer(self) -> str:
+        records = ",\n".join(self._buffer)
+        if self._num_records > 0:
+            return ",\n" + records
+        return records
+
+    def _write_footer(self) -> None:
+        self._file.write("\n]}\n")
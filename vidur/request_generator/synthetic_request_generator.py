@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List
 
 from vidur.config import SyntheticRequestGeneratorConfig
 from vidur.entities import Request
@@ -49,9 +49,7 @@ class SyntheticRequestGenerator(BaseRequestGenerator):
             num_decode_tokens=int(decode_tokens),
         )
 
-    def _generate_requests(self) -> List[Request]:
-        requests = []
-
+    def _iter_requests(self) -> Iterator[Request]:
         current_time = 0
 
         # first priority is duration
@@ -59,12 +57,12 @@ class SyntheticRequestGenerator(BaseRequestGenerator):
             while current_time < self.config.duration:
                 request = self._generate_next_request(current_time)
                 current_time = request.arrived_at
-                requests.append(request)
+                yield request
         elif self.config.num_requests is not None:
             for _ in range(self.config.num_requests):
                 request = self._generate_next_request(current_time)
                 current_time = request.arrived_at
-                requests.append(request)
+                yield request
         else:
             assert (
                 self.config.interval_generator_config.get_type()
@@ -76,11 +74,12 @@ class SyntheticRequestGenerator(BaseRequestGenerator):
                 if request is None:
                     break
                 current_time = request.arrived_at
-                requests.append(request)
+                yield request
 
-        return requests
+    def _generate_requests(self) -> List[Request]:
+        return list(self._iter_requests())
 
-    def generate_requests(self) -> List[Request]:
+    def _check_config(self) -> None:
         assert (
             self.config.duration
             or self.config.num_requests
@@ -88,6 +87,9 @@ class SyntheticRequestGenerator(BaseRequestGenerator):
             == RequestIntervalGeneratorType.TRACE
         )
 
+    def generate_requests(self) -> List[Request]:
+        self._check_config()
+
         set_seeds(self.config.seed)
 
         requests = self._generate_requests()
@@ -103,3 +105,18 @@ class SyntheticRequestGenerator(BaseRequestGenerator):
             ]
 
         return requests
+
+    def iter_requests(self) -> Iterator[Request]:
+        self._check_config()
+
+        set_seeds(self.config.seed)
+
+        for request in self._iter_requests():
+            # arrival times are non-decreasing, so the rest are past the duration too
+            if (
+                self.config.duration is not None
+                and request.arrived_at >= self.config.duration
+            ):
+                return
+
+            yield request
@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import Iterator, List
 
 import pandas as pd
 
@@ -77,16 +77,13 @@ class TraceReplayRequestGenerator(BaseRequestGenerator):
             f"Prompt/decode token ratio stats\n:{pd_ratio.describe(percentiles=[0.25, 0.5, 0.75, 0.9, 0.95, 0.99])}"
         )
 
-    def generate_requests(self) -> List[Request]:
-        requests = []
-
+    def iter_requests(self) -> Iterator[Request]:
         for _, row in self.trace_df.iterrows():
-            request = Request(
+            yield Request(
                 arrived_at=row["arrived_at"],
                 num_prefill_tokens=row["num_prefill_tokens"],
                 num_decode_tokens=row["num_decode_tokens"],
             )
 
-            requests.append(request)
-
-        return requests
+    def generate_requests(self) -> List[Request]:
+        return list(self.iter_requests())
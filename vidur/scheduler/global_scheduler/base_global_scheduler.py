@@ -1,9 +1,13 @@
+import math
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from vidur.config import SimulationConfig
 from vidur.entities import Replica, Request
-from vidur.execution_time_predictor import ExecutionTimePredictorRegistry
+from vidur.execution_time_predictor import (
+    BaseExecutionTimePredictor,
+    ExecutionTimePredictorRegistry,
+)
 from vidur.scheduler.replica_scheduler.replica_scheduler_registry import (
     ReplicaSchedulerRegistry,
 )
@@ -16,7 +20,7 @@ class BaseGlobalScheduler(ABC):
 
         self._num_replicas = len(self._replicas)
 
-        execution_time_predictor = ExecutionTimePredictorRegistry.get(
+        self._execution_time_predictor = ExecutionTimePredictorRegistry.get(
             config.execution_time_predictor_config.get_type(),
             predictor_config=config.execution_time_predictor_config,
             replica_config=config.cluster_config.replica_config,
@@ -31,18 +35,51 @@ class BaseGlobalScheduler(ABC):
                 request_generator_config=config.request_generator_config,
                 replica=replica,
                 num_stages=replica.num_pipeline_stages,
-                execution_time_predictor=execution_time_predictor,
+                execution_time_predictor=self._execution_time_predictor,
             )
             for replica_id, replica in replicas.items()
         }
         self._request_queue = []
 
+        global_scheduler_config = config.cluster_config.global_scheduler_config
+        self._coalesce_schedule_events = (
+            global_scheduler_config.coalesce_schedule_events
+        )
+        self._schedule_quantum = global_scheduler_config.schedule_quantum
+        self._pending_schedule_time = None
+
+    @property
+    def execution_time_predictor(self) -> BaseExecutionTimePredictor:
+        return self._execution_time_predictor
+
     def sort_requests(self) -> None:
         self._request_queue.sort(key=lambda request: request._arrived_at)
 
     def add_request(self, request: Request) -> None:
         self._request_queue.append(request)
 
+    def get_schedule_time(self, time: float) -> Optional[float]:
+        # returns the time at which a schedule event should be issued for requests
+        # added at the given time, or None if an already pending event covers them
+        if not self._coalesce_schedule_events:
+            return time
+
+        if (
+            self._pending_schedule_time is not None
+            and self._pending_schedule_time >= time
+        ):
+            return None
+
+        if self._schedule_quantum > 0:
+            schedule_time = max(
+                time, math.ceil(time / self._schedule_quantum) * self._schedule_quantum
+            )
+        else:
+            schedule_time = time
+
+        self._pending_schedule_time = schedule_time
+        return schedule_time
+
     def get_replica_scheduler(self, replica_id: int):
         return self._replica_schedulers[replica_id]
 
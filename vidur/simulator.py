@@ -1,40 +1,113 @@
-import atexit
 import heapq
 import json
-from typing import List
+import os
+import pickle
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional
 
-from vidur.config import SimulationConfig
-from vidur.entities import Cluster
+import pandas as pd
+
+from vidur.config import BaseRequestGeneratorConfig, SimulationConfig
+from vidur.entities import Cluster, Request
+from vidur.entities.base_entity import BaseEntity
 from vidur.events import BaseEvent, RequestArrivalEvent
 from vidur.logger import init_logger
-from vidur.metrics import MetricsStore
+from vidur.metrics import (
+    ChromeTraceWriter,
+    EventProfiler,
+    JsonlTraceWriter,
+    MetricsStore,
+)
 from vidur.request_generator import RequestGeneratorRegistry
 from vidur.scheduler import BaseGlobalScheduler, GlobalSchedulerRegistry
+from vidur.types import TerminationReason
+from vidur.utils.random import get_random_state, set_random_state, set_seeds
 
 logger = init_logger(__name__)
 
 
+def _get_entity_classes() -> List[type]:
+    classes = [BaseEvent]
+    pending = [BaseEntity]
+    while pending:
+        cls = pending.pop()
+        classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+def _get_id_counters() -> Dict[type, int]:
+    # ids are generated from class level counters, they have to be carried
+    # over for the entities created after a restore to get unique ids
+    return {
+        cls: cls.__dict__["_id_counter"]
+        for cls in _get_entity_classes()
+        if "_id_counter" in cls.__dict__
+    }
+
+
+def _set_id_counters(id_counters: Dict[type, int]) -> None:
+    for cls, id_counter in id_counters.items():
+        cls._id_counter = id_counter
+
+
+def _reset_id_counters() -> None:
+    BaseEvent._id_counter = 0
+    BaseEntity._id_counter = -1
+    for cls in _get_entity_classes():
+        if cls not in (BaseEvent, BaseEntity) and "_id_counter" in cls.__dict__:
+            delattr(cls, "_id_counter")
+
+
+@dataclass
+class SimulationResult:
+    request_metrics: pd.DataFrame
+    batch_metrics: pd.DataFrame
+    summary: Dict[str, float]
+    simulated_time: float
+    termination_reason: Optional[TerminationReason]
+
+
 class Simulator:
-    def __init__(self, config: SimulationConfig) -> None:
+    def __init__(self, config: SimulationConfig, write_traces: bool = True) -> None:
         self._config: SimulationConfig = config
 
         self._time = 0
         self._terminate = False
+        self._termination_reason: Optional[TerminationReason] = None
         self._time_limit = self._config.time_limit
         if not self._time_limit:
             self._time_limit = float("inf")
 
         self._event_queue = []
+        self._request_iterator: Optional[Iterator[Request]] = None
+
+        # replicas and stages are indexed by their ids in the metrics store, so
+        # every simulation in the process has to number its entities from 0
+        _reset_id_counters()
 
-        self._event_trace = []
-        self._event_chrome_trace = []
+        # the event traces are streamed to the output dir during the run
+        self._write_traces = write_traces
+        self._event_trace: Optional[JsonlTraceWriter] = None
+        self._event_chrome_trace: Optional[ChromeTraceWriter] = None
+        self._init_trace_writers()
 
         self._cluster = Cluster(
             self._config.cluster_config,
             self._config.metrics_config,
             self._config.request_generator_config,
+            write_traces,
         )
         self._metric_store = MetricsStore(self._config)
+
+        self._event_profiler: Optional[EventProfiler] = None
+        if self._config.metrics_config.enable_event_profiling:
+            self._event_profiler = EventProfiler(
+                self._config.metrics_config.event_profiling_heap_sample_interval
+            )
+            self._metric_store.set_profiler(self._event_profiler)
+
         self._request_generator = RequestGeneratorRegistry.get(
             self._config.request_generator_config.get_type(),
             self._config.request_generator_config,
@@ -46,7 +119,6 @@ class Simulator:
         )
 
         self._init_event_queue()
-        atexit.register(self._write_output)
 
     @property
     def scheduler(self) -> BaseGlobalScheduler:
@@ -56,42 +128,286 @@ class Simulator:
     def metric_store(self) -> MetricsStore:
         return self._metric_store
 
+    @property
+    def termination_reason(self) -> Optional[TerminationReason]:
+        return self._termination_reason
+
     def run(self) -> None:
+        if self._request_iterator:
+            logger.info(
+                f"Starting simulation with cluster: {self._cluster} and streaming request arrivals"
+            )
+        else:
+            logger.info(
+                f"Starting simulation with cluster: {self._cluster} and {len(self._event_queue)} requests"
+            )
+
+        self._process_events()
+
+        assert self._scheduler.is_empty() or self._terminate
+
+        if self._termination_reason is None:
+            self._termination_reason = TerminationReason.COMPLETED
+
         logger.info(
-            f"Starting simulation with cluster: {self._cluster} and {len(self._event_queue)} requests"
+            f"Simulation ended at: {self._time}s, reason: {self._termination_reason}"
+        )
+
+    def run_until(self, time: float) -> None:
+        """Processes all the events up to the given simulated time.
+
+        The simulation can be continued afterwards with `run`, or branched off
+        with `save_snapshot` / `fork_continuations`.
+        """
+        self._process_events(until=time)
+        logger.info(f"Simulation paused at: {self._time}s")
+
+    def save_snapshot(self, path: str) -> None:
+        if self._request_iterator:
+            raise ValueError(
+                "Streamed request arrivals cannot be pickled, use fork_continuations instead."
+            )
+
+        self._flush_trace_writers()
+
+        snapshot = {
+            "simulator": self,
+            "id_counters": _get_id_counters(),
+            "random_state": get_random_state(),
+        }
+        snapshot_bytes = pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(path, "wb") as f:
+            f.write(snapshot_bytes)
+
+        logger.info(f"Simulator snapshot at {self._time}s saved to {path}")
+
+    @classmethod
+    def load_snapshot(cls, path: str, output_dir: str) -> "Simulator":
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+
+        _set_id_counters(snapshot["id_counters"])
+        set_random_state(snapshot["random_state"])
+
+        simulator: Simulator = snapshot["simulator"]
+        simulator._set_output_dir(output_dir)
+        simulator._init_trace_writers()
+
+        logger.info(f"Simulator snapshot at {simulator._time}s loaded from {path}")
+
+        return simulator
+
+    def fork_continuations(
+        self,
+        setup_fns: List[Callable[["Simulator"], None]],
+        output_dirs: List[str],
+    ) -> List[int]:
+        """Runs one continuation of the current state per setup function.
+
+        Every continuation runs in a forked child process which applies its
+        setup function (e.g. `replace_request_arrivals` or changing scheduler
+        knobs), runs the simulation to the end and writes its output to the
+        corresponding output dir. Blocks until all the children exit and
+        returns their exit codes.
+        """
+        assert len(setup_fns) == len(output_dirs)
+
+        # make sure buffered trace records are not written by both processes
+        self._flush_trace_writers()
+        # the random module reseeds itself in forked children
+        random_state = get_random_state()
+
+        pids = []
+        for setup_fn, output_dir in zip(setup_fns, output_dirs):
+            pid = os.fork()
+            if pid == 0:
+                set_random_state(random_state)
+                self._run_continuation(setup_fn, output_dir)
+            pids.append(pid)
+
+        exit_codes = []
+        for pid in pids:
+            _, status = os.waitpid(pid, 0)
+            exit_codes.append(os.waitstatus_to_exitcode(status))
+
+        return exit_codes
+
+    def replace_request_arrivals(
+        self, request_generator_config: BaseRequestGeneratorConfig
+    ) -> None:
+        """Replaces the pending request arrivals with the ones of a new generator.
+
+        The new arrivals are shifted to start at the current simulated time.
+        """
+        self._event_queue = [
+            (priority_number, event)
+            for priority_number, event in self._event_queue
+            if not isinstance(event, RequestArrivalEvent)
+        ]
+        heapq.heapify(self._event_queue)
+        self._request_iterator = None
+
+        self._config.request_generator_config = request_generator_config
+        self._request_generator = RequestGeneratorRegistry.get(
+            request_generator_config.get_type(),
+            request_generator_config,
         )
 
-        while self._event_queue and not self._terminate:
+        requests = self._shift_requests(
+            self._request_generator.iter_requests(), self._time
+        )
+        if self._config.stream_request_arrivals:
+            self._request_iterator = requests
+            self._add_next_request_arrival_event()
+            return
+
+        for request in requests:
+            self._add_event(RequestArrivalEvent(request.arrived_at, request))
+
+    def _process_events(self, until: float = float("inf")) -> None:
+        if self._event_profiler:
+            self._event_profiler.on_loop_start()
+
+        while (
+            self._event_queue
+            and not self._terminate
+            and self._event_queue[0][0][0] <= until
+        ):
             _, event = heapq.heappop(self._event_queue)
             self._set_time(event._time)
-            new_events = event.handle_event(self._scheduler, self._metric_store)
+
+            if self._event_profiler:
+                start_time = perf_counter()
+                new_events = event.handle_event(self._scheduler, self._metric_store)
+                self._event_profiler.on_event(
+                    event.__class__.__name__,
+                    perf_counter() - start_time,
+                    self._time,
+                    len(self._event_queue),
+                )
+            else:
+                new_events = event.handle_event(self._scheduler, self._metric_store)
+
             self._add_events(new_events)
 
-            if self._config.metrics_config.write_json_trace:
-                self._event_trace.append(event.to_dict())
+            if self._request_iterator and isinstance(event, RequestArrivalEvent):
+                self._add_next_request_arrival_event()
+
+            if self._event_trace:
+                self._event_trace.write(event.to_dict())
 
-            if self._config.metrics_config.enable_chrome_trace:
+            if self._event_chrome_trace:
                 chrome_trace = event.to_chrome_trace()
                 if chrome_trace:
-                    self._event_chrome_trace.append(chrome_trace)
+                    self._event_chrome_trace.write(chrome_trace)
 
-        assert self._scheduler.is_empty() or self._terminate
+            if self._metric_store.termination_reason is not None:
+                self._terminate = True
+                self._termination_reason = self._metric_store.termination_reason
+
+        if self._event_profiler:
+            self._event_profiler.on_loop_end()
+
+    def _run_continuation(
+        self, setup_fn: Callable[["Simulator"], None], output_dir: str
+    ) -> None:
+        exit_code = 0
+        try:
+            # the parent's trace files are shared with this process, keep the
+            # old writers referenced so that they are never closed from here
+            self._parent_trace_writers = (self._event_trace, self._event_chrome_trace)
+            self._set_output_dir(output_dir)
+            self._init_trace_writers()
+            setup_fn(self)
+            self.run()
+            self.write_output()
+        except BaseException:
+            logger.exception(f"Continuation writing to {output_dir} failed")
+            exit_code = 1
+        finally:
+            # skip the atexit handlers inherited from the parent
+            os._exit(exit_code)
+
+    def _shift_requests(
+        self, requests: Iterator[Request], offset: float
+    ) -> Iterator[Request]:
+        for request in requests:
+            request._arrived_at += offset
+            yield request
+
+    def _set_output_dir(self, output_dir: str) -> None:
+        os.makedirs(output_dir, exist_ok=True)
+        # the metrics store reads the output dir from the shared config
+        self._config.metrics_config.output_dir = output_dir
+
+    def _flush_trace_writers(self) -> None:
+        if self._event_trace:
+            self._event_trace.flush()
+
+        if self._event_chrome_trace:
+            self._event_chrome_trace.flush()
+
+    def get_result(self) -> SimulationResult:
+        return SimulationResult(
+            request_metrics=self._metric_store.get_request_metrics_df(),
+            batch_metrics=self._metric_store.get_batch_metrics_df(),
+            summary=self._metric_store.get_summary(),
+            simulated_time=self._time,
+            termination_reason=self._termination_reason,
+        )
+
+    def close(self) -> None:
+        if self._event_trace:
+            self._event_trace.close()
 
-        logger.info(f"Simulation ended at: {self._time}s")
+        if self._event_chrome_trace:
+            self._event_chrome_trace.close()
 
-    def _write_output(self) -> None:
+    def write_output(self) -> None:
         logger.info("Writing output")
 
         self._metric_store.plot()
         logger.info("Metrics written")
 
-        if self._config.metrics_config.write_json_trace:
-            self._write_event_trace()
-            logger.info("Json event trace written")
+        self._write_termination_reason()
+        self._write_execution_time_cache_stats()
 
-        if self._config.metrics_config.enable_chrome_trace:
-            self._write_chrome_trace()
-            logger.info("Chrome event trace written")
+        if self._event_profiler:
+            self._event_profiler.write(
+                f"{self._config.metrics_config.output_dir}/event_profile.json"
+            )
+            logger.info("Event profile written")
+
+        self.close()
+
+        if self._event_trace:
+            logger.info(f"Json event trace written to {self._event_trace.path}")
+
+        if self._event_chrome_trace:
+            logger.info(
+                f"Chrome event trace written to {self._event_chrome_trace.path}"
+            )
+
+    def _write_termination_reason(self) -> None:
+        termination_reason = (
+            str(self._termination_reason) if self._termination_reason else None
+        )
+        with open(
+            f"{self._config.metrics_config.output_dir}/termination.json", "w"
+        ) as f:
+            json.dump({"termination_reason": termination_reason, "time": self._time}, f)
+
+    def _write_execution_time_cache_stats(self) -> None:
+        cache_stats = (
+            self._scheduler.execution_time_predictor.get_execution_time_cache_stats()
+        )
+        logger.info(
+            f"Execution time cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, hit rate {cache_stats['hit_rate']:.3f}"
+        )
+        with open(
+            f"{self._config.metrics_config.output_dir}/execution_time_cache.json", "w"
+        ) as f:
+            json.dump(cache_stats, f)
 
     def _add_event(self, event: BaseEvent) -> None:
         heapq.heappush(self._event_queue, (event._priority_number, event))
@@ -100,7 +416,25 @@ class Simulator:
         for event in events:
             self._add_event(event)
 
+    def _add_next_request_arrival_event(self) -> None:
+        request = next(self._request_iterator, None)
+        if request is None:
+            self._request_iterator = None
+            return
+
+        assert (
+            request.arrived_at >= self._time
+        ), f"Request {request.id} arrives at {request.arrived_at}s which is before the current time {self._time}s, streamed requests must be in arrival order"
+        self._add_event(RequestArrivalEvent(request.arrived_at, request))
+
     def _init_event_queue(self) -> None:
+        if self._config.stream_request_arrivals:
+            # only the next arrival is kept in the event queue, the following
+            # one is pulled from the generator when it is handled
+            self._request_iterator = self._request_generator.iter_requests()
+            self._add_next_request_arrival_event()
+            return
+
         requests = self._request_generator.generate()
 
         for request in requests:
@@ -113,20 +447,55 @@ class Simulator:
                 f"Time limit reached: {self._time_limit}s terminating the simulation."
             )
             self._terminate = True
+            self._termination_reason = TerminationReason.TIME_LIMIT
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # open trace files are not carried over, they are reopened on restore
+        state["_event_trace"] = None
+        state["_event_chrome_trace"] = None
+        state.pop("_parent_trace_writers", None)
+        return state
+
+    def _init_trace_writers(self) -> None:
+        if not self._write_traces:
+            return
+
+        metrics_config = self._config.metrics_config
+
+        if metrics_config.write_json_trace:
+            self._event_trace = JsonlTraceWriter(
+                f"{metrics_config.output_dir}/event_trace.jsonl",
+                metrics_config.trace_buffer_size,
+                metrics_config.compress_traces,
+            )
+
+        if metrics_config.enable_chrome_trace:
+            self._event_chrome_trace = ChromeTraceWriter(
+                f"{metrics_config.output_dir}/chrome_trace.json",
+                metrics_config.trace_buffer_size,
+                metrics_config.compress_traces,
+            )
+
 
-    def _write_event_trace(self) -> None:
-        trace_file = f"{self._config.metrics_config.output_dir}/event_trace.json"
-        def set_default( obj ):
-            if isinstance( obj, set ):
-                return list( obj )
-            raise TypeError
-        with open(trace_file, "w") as f:
-            json.dump(self._event_trace, f, default=set_default)
+def run_simulation(
+    config: SimulationConfig, write_output: bool = False
+) -> SimulationResult:
+    """Runs a simulation in-process and returns its metrics.
 
-    def _write_chrome_trace(self) -> None:
-        trace_file = f"{self._config.metrics_config.output_dir}/chrome_trace.json"
+    Nothing is written to the output dir unless `write_output` is set, in
+    which case the event traces enabled in the metrics config are streamed
+    to disk during the run as well.
+    """
+    set_seeds(config.seed)
 
-        chrome_trace = {"traceEvents": self._event_chrome_trace}
+    simulator = Simulator(config, write_traces=write_output)
+    try:
+        simulator.run()
+    finally:
+        if write_output:
+            simulator.write_output()
+        else:
+            simulator.close()
 
-        with open(trace_file, "w") as f:
-            json.dump(chrome_trace, f)
+    return simulator.get_result()
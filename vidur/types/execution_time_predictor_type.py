@@ -5,3 +5,6 @@ class ExecutionTimePredictorType(BaseIntEnum):
     DUMMY = 1
     RANDOM_FORREST = 2
     LINEAR_REGRESSION = 3
+    INTERPOLATION = 4
+    ROOFLINE = 5
+    HIST_GRADIENT_BOOSTING = 6
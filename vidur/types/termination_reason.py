@@ -0,0 +1,8 @@
+from vidur.types.base_int_enum import BaseIntEnum
+
+
+class TerminationReason(BaseIntEnum):
+    COMPLETED = 1
+    TIME_LIMIT = 2
+    CONVERGED = 3
+    OVERLOADED = 4
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List
 
 from vidur.types import BaseIntEnum
 
@@ -39,6 +39,10 @@ class BaseRegistry(ABC):
 
         return cls._registry[key]
 
+    @classmethod
+    def get_keys(cls) -> List[BaseIntEnum]:
+        return list(cls._registry.keys())
+
     @classmethod
     @abstractmethod
     def get_key_from_str(cls, key_str: str) -> BaseIntEnum:
@@ -20,20 +20,33 @@ class MFUCalculator:
         self._head_dimension = model_config.embedding_dim // model_config.num_q_heads
         self._device_flops = replica_config.device_config.fp16_tflops * 2**40
 
+    @staticmethod
+    def get_linear_flops(num_tokens: int, num_parameters: int) -> float:
+        return 2 * num_tokens * num_parameters
+
+    def get_attention_flops_per_layer(
+        self, num_q_tokens: int, num_kv_tokens: int
+    ) -> float:
+        return (
+            4  # for number of ops in attention
+            * self._num_heads_per_device
+            * self._head_dimension
+            * num_q_tokens
+            * num_kv_tokens
+        )
+
     def _get_mlp_flops(self, batch_stage: BatchStage) -> float:
         num_tokens = sum(batch_stage.num_tokens)
-        return 2 * num_tokens * self._num_params_per_device
+        return self.get_linear_flops(num_tokens, self._num_params_per_device)
 
     def _get_attention_flops(self, batch_stage: BatchStage) -> float:
         total_flops = 0
         for request, num_tokens in zip(batch_stage.requests, batch_stage.num_tokens):
-            total_flops += (
-                4  # for number of ops in attention
-                * self._num_layers_per_device
-                * self._num_heads_per_device
-                * self._head_dimension
-                * num_tokens  # q length
-                * (num_tokens + request.num_processed_tokens)  # kv length
+            total_flops += self._num_layers_per_device * (
+                self.get_attention_flops_per_layer(
+                    num_tokens,  # q length
+                    num_tokens + request.num_processed_tokens,  # kv length
+                )
             )
 
         return total_flops
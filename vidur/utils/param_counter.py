@@ -35,10 +35,9 @@ class ParamCounter:
             self._model_config.num_kv_heads / self._replica_config.tensor_parallel_size
         )
 
-    def get_num_parameters_per_layer(self) -> int:
-        num_parameters = 0
+    def get_num_attention_pre_proj_parameters(self) -> int:
         # weights for attention metrics Wq, Wk, Wv
-        num_parameters += (
+        return (
             self._model_config.embedding_dim
             * self._attention_head_dim
             * (
@@ -46,29 +45,39 @@ class ParamCounter:
                 + 2 * self._kv_heads_per_tensor_parallel_worker
             )
         )
+
+    def get_num_attention_post_proj_parameters(self) -> int:
         # weights for attention metrics Wo
-        num_parameters += (
+        return (
             self._model_config.embedding_dim
             * self._attention_head_dim
             * self._q_heads_per_tensor_parallel_worker
         )
-        # fc layer weights
-        if self._model_config.use_gated_mlp:
-            num_parameters += (
-                3
-                * self._model_config.embedding_dim
-                * self._model_config.mlp_hidden_dim
-                // self._replica_config.tensor_parallel_size
-            )
-        else:
-            num_parameters += (
-                2
-                * self._model_config.embedding_dim
-                * self._model_config.mlp_hidden_dim
-                // self._replica_config.tensor_parallel_size
-            )
 
-        return num_parameters
+    def get_num_mlp_up_proj_parameters(self) -> int:
+        # fc layer weights, the gated mlp has two up projections
+        num_up_projs = 2 if self._model_config.use_gated_mlp else 1
+        return (
+            num_up_projs
+            * self._model_config.embedding_dim
+            * self._model_config.mlp_hidden_dim
+            // self._replica_config.tensor_parallel_size
+        )
+
+    def get_num_mlp_down_proj_parameters(self) -> int:
+        return (
+            self._model_config.embedding_dim
+            * self._model_config.mlp_hidden_dim
+            // self._replica_config.tensor_parallel_size
+        )
+
+    def get_num_parameters_per_layer(self) -> int:
+        return (
+            self.get_num_attention_pre_proj_parameters()
+            + self.get_num_attention_post_proj_parameters()
+            + self.get_num_mlp_up_proj_parameters()
+            + self.get_num_mlp_down_proj_parameters()
+        )
 
     def get_num_parameters_per_device(self) -> int:
         num_parameters_per_layer = self.get_num_parameters_per_layer()